@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "SoftDeskSupport.settings")
 
 application = get_asgi_application()
+
+# Préchauffage avant la première requête (voir softdeskApp/startup.py)
+from softdeskApp.startup import warm_up_on_startup  # noqa: E402
+
+warm_up_on_startup()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -43,14 +44,70 @@ INSTALLED_APPS = [
 ]
 
 REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # Pagination sur demande (?page_size=), total peu coûteux (?count=)
+    "DEFAULT_PAGINATION_CLASS": "softdeskApp.pagination.CountingPagination",
+    "DEFAULT_RENDERER_CLASSES": [
+        "softdeskApp.renderers.FastJSONRenderer",  # orjson si installé, sinon json
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
 
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",  # Utilisation de JWT pour l'authentification
+        "softdeskApp.authentication.CachedJWTAuthentication",  # JWT, jetons vérifiés gardés en cache
     ],
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
 }
 
+# Listes en lecture (GET) sérialisées directement depuis values_list(),
+# JSON identique aux sérialiseurs DRF (voir softdeskApp/fast_serializers.py)
+FAST_LIST_SERIALIZERS = True
+# Diffusion par tranches des listes non paginées (sinon sur demande : ?stream=1)
+STREAM_LIST_RESPONSES = False
+STREAM_CHUNK_SIZE = 1000  # Lignes lues et encodées par tranche
+# Listes : aperçu des descriptions et commentaires (caractères), texte
+# complet sur le détail ou avec ?full=1 (0 : toujours le texte complet)
+LIST_TEXT_PREVIEW_LENGTH = 200
+# Expansion ?include= : objets liés maximum par parent, pour chaque niveau
+# (le nombre de niveaux est la profondeur maximale)
+INCLUDE_LIMITS = (50, 20)
+# Objets dépliés au plus par une liste avec ?include= (au-delà, ?page_size= requis)
+INCLUDE_MAX_PARENTS = 100
+# Pagination (voir softdeskApp/pagination.py)
+PAGINATION_MAX_PAGE_SIZE = 500  # Borne de ?page_size=
+PAGINATION_COUNT_MODE = "cached"  # Total par défaut : exact, cached, estimate ou none
+PAGINATION_COUNT_CACHE_SECONDS = 30  # Durée de vie d'un total en cache
+PAGINATION_COUNT_LIMIT = 10000  # Comptage borné du mode estimate
+# Nombre maximal de sous-requêtes par appel à /api/batch
+BATCH_MAX_REQUESTS = 20
+
+# Taille de page par défaut de GET /api/me/issues (pagination par curseur)
+MY_WORK_PAGE_SIZE = 50
+
+# Synchronisation différentielle (/api/projects/<id>/sync)
+SYNC_OVERLAP_SECONDS = 5  # Marge pour les transactions en cours à l'émission du jeton
+SYNC_TOMBSTONE_RETENTION_DAYS = 30  # Jeton plus ancien : synchronisation complète
+
+# Purge des projets et utilisateurs supprimés (commande purge_deleted)
+PURGE_BATCH_SIZE = 500  # Lignes supprimées par transaction
+PURGE_STALE_SECONDS = 600  # Tâche "running" inactive depuis plus longtemps : reprise
+PURGE_MAX_ATTEMPTS = 5  # Tâche "failed" relancée jusqu'à ce nombre d'échecs
+PURGE_RETRY_SECONDS = 300  # Délai avant de relancer une tâche "failed"
+
+# Verrouillage optimiste : exiger If-Match pour modifier un projet ou une issue
+# (sinon la version lue par la requête sert de condition)
+CONCURRENCY_REQUIRE_IF_MATCH = False
+
+# Archivage des issues terminées sans activité depuis ce nombre de jours
+# (commande archive_issues)
+ARCHIVE_AFTER_DAYS = 180
+
+# Compression des réponses : zstd et brotli si installés, gzip sinon
+COMPRESSION_ENABLED = True
+COMPRESSION_MIN_SIZE = 1024  # Octets, en dessous la réponse n'est pas compressée
+COMPRESSION_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+COMPRESSION_CACHE_BYTES = 32 * 1024 * 1024  # Octets compressés conservés par worker (cache local)
+COMPRESSION_CACHE_MAX_SIZE = 4 * 1024 * 1024  # Corps plus gros jamais mis en cache
+COMPRESSION_CACHE_ALIAS = None  # Alias de CACHES pour partager le cache entre workers
+
 # Pour définir la durée de validité des tokens
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(
@@ -64,8 +121,41 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Limitation de débit (voir softdeskApp/throttling.py)
+THROTTLE_ENABLED = True
+THROTTLE_BUCKETS = {  # Portée -> (jetons ajoutés par seconde, capacité du seau)
+    "user": (20, 200),
+    "anon": (5, 100),
+}
+THROTTLE_COSTS = {  # Nom de route -> jetons consommés par requête (1 par défaut)
+    "project-list": 5,
+    "project-contributors": 5,
+    "register": 20,  # Hachage du mot de passe
+    "token_obtain_pair": 10,  # Vérification du mot de passe
+}
+THROTTLE_CACHE_ALIAS = None  # Alias de CACHES pour partager les seaux entre workers
+# Délestage : requête refusée (503) après plus de LOAD_SHED_QUEUE_MS dans la file
+# d'attente du proxy (header X-Request-Start), 0 pour désactiver
+LOAD_SHED_QUEUE_MS = 1000
+LOAD_SHED_RETRY_AFTER = 1  # Secondes
+
+# Clés d'idempotence des créations (header Idempotency-Key, voir softdeskApp/idempotency.py)
+IDEMPOTENCY_KEY_TTL_SECONDS = 24 * 3600  # Durée pendant laquelle une réponse est rejouée
+
+# Préchauffage des workers au démarrage : routes, sérialiseurs, authentification,
+# connexions (voir softdeskApp/startup.py et la commande profile_startup)
+WARMUP_ON_STARTUP = True
+
+# Cache des jetons JWT vérifiés (voir softdeskApp/authentication.py)
+JWT_CACHE_ENABLED = True
+JWT_CACHE_ENTRIES = 10000  # Jetons gardés au plus (local au processus)
+JWT_REVOCATION_HOOKS = []  # Fonctions hook(jeton) -> bool appelées à chaque requête
 
 MIDDLEWARE = [
+    "softdeskApp.middleware.MetricsMiddleware",  # En premier : mesure la latence totale
+    "softdeskApp.middleware.CompressionMiddleware",  # Avant tout ce qui modifie le corps
+    "softdeskApp.middleware.LoadSheddingMiddleware",  # Délestage avant tout traitement
+    "softdeskApp.middleware.ThrottleMiddleware",  # Seaux à jetons, avant la vue
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -73,8 +163,19 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "softdeskApp.middleware.ReplicaRoutingMiddleware",  # Lectures sur les réplicas
 ]
 
+# Instrumentation par vue (exposée au format Prometheus sur /api/metrics)
+METRICS_ENABLED = True
+METRICS_QUERY_BUDGET = 50  # Nombre maximal de requêtes SQL avant alerte
+METRICS_LATENCY_BUDGET_MS = 1000  # Latence maximale avant alerte
+METRICS_RESPONSE_HEADERS = DEBUG  # Headers Server-Timing / X-Query-Count
+# Adresses autorisées sur /api/metrics (None pour autoriser tout le monde).
+# Comparées à REMOTE_ADDR : derrière un proxy, c'est l'adresse du proxy, et
+# tout client passant par lui serait autorisé.
+METRICS_ALLOWED_IPS = ["127.0.0.1", "::1"]
+
 ROOT_URLCONF = "SoftDeskSupport.urls"
 
 TEMPLATES = [
@@ -106,6 +207,30 @@ DATABASES = {
     }
 }
 
+# Réplicas en lecture : les requêtes GET/HEAD/OPTIONS lisent sur un réplica,
+# les écritures vont sur `default`.
+# En local, deux fichiers SQLite simulent primaire et réplica :
+#   SOFTDESK_REPLICA_DB=db_replica.sqlite3 python manage.py migrate --database=replica
+REPLICA_DATABASES = []
+if os.environ.get("SOFTDESK_REPLICA_DB"):
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / os.environ["SOFTDESK_REPLICA_DB"],
+        "TEST": {"MIRROR": "default"},  # Les tests lisent les données du primaire
+    }
+    REPLICA_DATABASES = ["replica"]
+
+DATABASE_ROUTERS = ["softdeskApp.db_routers.ReadReplicaRouter"]
+
+# Durée (secondes) pendant laquelle un client relit sur le primaire après une
+# écriture, pour voir immédiatement ce qu'il vient de créer.
+REPLICA_STICKY_SECONDS = 10
+# Alias de CACHES où sont notés les clients collés au primaire. Le cache par
+# défaut (mémoire locale) est propre à chaque worker : avec plusieurs workers,
+# utiliser un cache partagé (Redis, Memcached) pour que la lecture de ses
+# propres écritures tienne quel que soit le worker qui reçoit la requête.
+REPLICA_CACHE_ALIAS = "default"
+
 
 AUTH_USER_MODEL = "softdeskApp.User"
 
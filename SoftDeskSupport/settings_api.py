@@ -0,0 +1,87 @@
+"""
+Profil "API seule" : réglages de SoftDeskSupport/settings.py allégés pour
+une API JSON authentifiée par JWT.
+
+    DJANGO_SETTINGS_MODULE=SoftDeskSupport.settings_api gunicorn SoftDeskSupport.wsgi
+
+Les sessions, la protection CSRF, les messages et la protection contre le
+clickjacking ne servent qu'aux pages HTML et à l'authentification par
+cookie : ces middlewares et applications sont retirés. Restent la mesure,
+la compression, les headers de sécurité, `CommonMiddleware` (Content-Length,
+redirection avec slash final) et le routage vers les réplicas.
+
+Options (variables d'environnement) :
+- `SOFTDESK_API_BROWSABLE=1` : garde l'API navigable (rendu HTML de DRF) ;
+- `SOFTDESK_API_ADMIN=1` : active l'admin Django sur `/admin/`, avec les
+  sessions, les messages et les middlewares qu'il exige.
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import REST_FRAMEWORK, TEMPLATES
+
+API_BROWSABLE = os.environ.get("SOFTDESK_API_BROWSABLE") == "1"
+API_ADMIN = os.environ.get("SOFTDESK_API_ADMIN") == "1"
+
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "rest_framework",
+    "rest_framework_simplejwt",
+    "softdeskApp",
+]
+
+MIDDLEWARE = [
+    "softdeskApp.middleware.MetricsMiddleware",  # En premier : mesure la latence totale
+    "softdeskApp.middleware.CompressionMiddleware",  # Avant tout ce qui modifie le corps
+    "softdeskApp.middleware.LoadSheddingMiddleware",  # Délestage avant tout traitement
+    "softdeskApp.middleware.ThrottleMiddleware",  # Seaux à jetons, avant la vue
+    "django.middleware.security.SecurityMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "softdeskApp.middleware.ReplicaRoutingMiddleware",  # Lectures sur les réplicas
+]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_RENDERER_CLASSES": ["softdeskApp.renderers.FastJSONRenderer"],
+}
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.debug",
+                "django.template.context_processors.request",
+            ],
+        },
+    },
+]
+
+if API_BROWSABLE or API_ADMIN:
+    INSTALLED_APPS.append("django.contrib.staticfiles")  # Feuilles de style et scripts
+
+if API_BROWSABLE:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].append(
+        "rest_framework.renderers.BrowsableAPIRenderer"
+    )
+
+if API_ADMIN:
+    INSTALLED_APPS[:0] = [
+        "django.contrib.admin",
+        "django.contrib.sessions",
+        "django.contrib.messages",
+    ]
+    common = MIDDLEWARE.index("django.middleware.common.CommonMiddleware")
+    MIDDLEWARE[common:common + 1] = [
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "django.middleware.common.CommonMiddleware",
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+        "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    ]
+    TEMPLATES[0]["OPTIONS"]["context_processors"] += [
+        "django.contrib.auth.context_processors.auth",
+        "django.contrib.messages.context_processors.messages",
+    ]
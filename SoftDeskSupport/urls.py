@@ -1,4 +1,5 @@
 # SoftDeskSupport/urls.py
+from django.apps import apps
 from django.contrib import admin
 from django.urls import path, include
 
@@ -7,3 +8,6 @@ urlpatterns = [
         "api/", include("softdeskApp.urls")
     ),  # Assure-toi d'inclure 'softdeskApp.urls'
 ]
+
+if apps.is_installed("django.contrib.admin"):  # Profil API avec SOFTDESK_API_ADMIN=1
+    urlpatterns.append(path("admin/", admin.site.urls))
@@ -0,0 +1,195 @@
+"""
+Archivage des issues terminées et inactives.
+
+Les issues `Finished` sans modification (ni commentaire) depuis
+`ARCHIVE_AFTER_DAYS` jours représentent l'essentiel des tables `Issue` et
+`Comment`. L'archivage les déplace, avec leurs commentaires, dans
+`ArchivedIssue` (une ligne par issue, JSON compressé) :
+- les tables chaudes et leurs index rétrécissent ;
+- les routes existantes continuent de les servir (chemin plus lent) :
+  détail d'une issue et commentaires d'une issue. La liste des issues d'un
+  projet ne les inclut que sur demande (`?archived=1`), ni paginée ni
+  diffusée (400 avec `?page_size=` ou `?stream=1`) ;
+- `/sync` les signale comme supprimées (`Tombstone`) ;
+- les issues archivées sont en lecture seule.
+"""
+import time
+import zlib
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .fast_serializers import FastCommentSerializer, FastIssueSerializer
+from .models import ArchivedIssue, Comment, Issue, Project, Tombstone
+from .permissions import is_contributor
+from .purge import delete_by_pk
+from .renderers import FastJSONRenderer
+
+
+class Archiver:
+    """
+    Archive les issues éligibles par tranches de `batch_size`, une
+    transaction par tranche (la commande peut être interrompue et relancée).
+    """
+
+    def __init__(self, days=None, batch_size=500, progress=None):
+        if days is None:
+            days = getattr(settings, "ARCHIVE_AFTER_DAYS", 180)
+        self.days = days
+        self.batch_size = batch_size
+        self.progress = progress or (lambda message: None)
+        self.renderer = FastJSONRenderer()
+        self.issue_serializer = FastIssueSerializer()
+        self.comment_serializer = FastCommentSerializer()
+
+    def eligible(self, cutoff):
+        return (
+            Issue.objects.filter(
+                status=Issue.FINISHED,
+                updated_at__lt=cutoff,
+                project__deleted_at__isnull=True,
+            )
+            .exclude(comments__updated_at__gte=cutoff)
+            .order_by("id")
+        )
+
+    def run(self, limit=None):
+        """
+        Retourne le bilan : issues et commentaires archivés, octets avant et
+        après compression.
+        """
+        cutoff = timezone.now() - timedelta(days=self.days)
+        stats = {"issues": 0, "comments": 0, "raw_bytes": 0, "compressed_bytes": 0}
+        started = time.perf_counter()
+        while limit is None or stats["issues"] < limit:
+            size = self.batch_size
+            if limit is not None:
+                size = min(size, limit - stats["issues"])
+            ids = list(self.eligible(cutoff).values_list("pk", flat=True)[:size])
+            if not ids:
+                break
+            self.archive_batch(ids, cutoff, stats)
+            rate = stats["issues"] / (time.perf_counter() - started)
+            self.progress(f"Issues archivées : {stats['issues']} ({rate:,.0f}/s)")
+        return stats
+
+    def archive_batch(self, ids, cutoff, stats):
+        with transaction.atomic():
+            # Verrou puis nouvelle vérification : une issue modifiée entre-temps
+            # reste en place, un commentaire concurrent attend la fin de la tranche
+            ids = list(
+                self.eligible(cutoff)
+                .filter(pk__in=ids)
+                .select_for_update(of=("self",))
+                .values_list("pk", flat=True)
+            )
+            issue_rows = (
+                Issue.objects.filter(pk__in=ids)
+                .order_by("id")
+                .values_list(*self.issue_serializer.lookups, "updated_at")
+            )
+            comment_rows = list(
+                self.comment_serializer.values(
+                    Comment.objects.filter(issue_id__in=ids).order_by("id")
+                )
+            )
+            comments = defaultdict(list)
+            for row in comment_rows:
+                data = self.comment_serializer.to_representation(row)
+                comments[data["issue"]].append(data)
+
+            archives = []
+            for row in issue_rows:
+                issue = self.issue_serializer.to_representation(row)
+                issue_comments = comments[issue["id"]]
+                raw = self.renderer.render({"issue": issue, "comments": issue_comments})
+                payload = zlib.compress(raw, 9)
+                stats["raw_bytes"] += len(raw)
+                stats["compressed_bytes"] += len(payload)
+                archives.append(
+                    ArchivedIssue(
+                        id=issue["id"],
+                        project_id=issue["project"],
+                        author_id=issue["author"],
+                        title=issue["title"],
+                        status=issue["status"],
+                        comment_count=len(issue_comments),
+                        created_at=row[self.issue_serializer.lookups.index("created_at")],
+                        updated_at=row[-1],
+                        payload=payload,
+                    )
+                )
+            ArchivedIssue.objects.bulk_create(archives)
+            # Sortie des tables chaudes : signalée aux clients de `/sync` comme
+            # une suppression (les commentaires partent avec leur issue)
+            Tombstone.objects.bulk_create(
+                Tombstone(model=Tombstone.ISSUE, object_id=a.id, project_id=a.project_id)
+                for a in archives
+            )
+            # Commentaires supprimés par identifiant : jamais un commentaire non archivé
+            stats["comments"] += delete_by_pk(Comment, [row[0] for row in comment_rows])
+            stats["issues"] += delete_by_pk(Issue, ids)
+
+
+def find_archived_issue(request, issue_id, project_id=None):
+    """
+    Issue archivée visible par l'utilisateur de la requête, ou None.
+    """
+    queryset = ArchivedIssue.objects.filter(
+        pk=issue_id, project__deleted_at__isnull=True
+    )
+    if project_id is not None:
+        queryset = queryset.filter(project_id=project_id)
+    archived = queryset.first()
+    if archived is None or not is_contributor(request, archived.project_id):
+        return None
+    return archived
+
+
+def issue_representation(archived, include=None):
+    """
+    Représentation API d'une issue archivée (`"archived": true` en plus).
+    `include` : arbre `?include=` ; seuls les commentaires sont disponibles.
+    """
+    content = archived.load()
+    data = {**content["issue"], "archived": True}
+    if include and "comments" in include:
+        limit = getattr(settings, "INCLUDE_LIMITS", (50,))[0]
+        data["comments_has_more"] = len(content["comments"]) > limit
+        data["comments"] = content["comments"][:limit]
+    return data
+
+
+def with_preview(data, preview_fields, length):
+    """
+    Représentation d'archive au format des listes : champs texte remplacés
+    par leur aperçu (voir `TextPreviewMixin`).
+    """
+    if length is None:
+        return data
+    previewed = {}
+    for key, value in data.items():
+        if key in preview_fields:
+            previewed[f"{key}_preview"] = None if value is None else value[:length]
+            previewed[f"{key}_truncated"] = value is not None and len(value) > length
+        else:
+            previewed[key] = value
+    return previewed
+
+
+def project_issues(request, project_id, preview_length=None):
+    """
+    Issues archivées d'un projet (décompressées une par une).
+    """
+    if not Project.objects.alive().filter(pk=project_id).exists():
+        return []
+    if not is_contributor(request, int(project_id)):
+        return []
+    archives = ArchivedIssue.objects.filter(project_id=project_id).order_by("id")
+    return [
+        with_preview(issue_representation(archived), ("description",), preview_length)
+        for archived in archives.iterator()
+    ]
@@ -0,0 +1,78 @@
+"""
+Authentification JWT avec cache des jetons vérifiés.
+
+`JWTAuthentication` décode le jeton et vérifie sa signature HMAC à chaque
+requête, alors qu'un client renvoie le même jeton d'accès pendant toute sa
+durée de validité (`ACCESS_TOKEN_LIFETIME`). `CachedJWTAuthentication` :
+- garde le jeton validé dans un cache LRU borné (`JWT_CACHE_ENTRIES`), sûr
+  entre threads, indexé par l'empreinte SHA-256 du jeton brut (jamais le
+  jeton lui-même) ;
+- ne le garde que jusqu'à son expiration (claim `exp`) ;
+- appelle à chaque requête, cache ou non, les vérifications de révocation
+  (`JWT_REVOCATION_HOOKS` : fonctions `hook(jeton validé) -> bool`, vrai si
+  le jeton est révoqué) ;
+- relit toujours l'utilisateur : un compte supprimé ou désactivé est refusé
+  immédiatement.
+Le jeton validé est partagé entre les requêtes : il ne doit pas être modifié.
+"""
+import hashlib
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from .cache import LRUCache
+
+# Jetons validés : empreinte du jeton brut -> jeton (local au processus)
+token_cache = LRUCache(maxsize=getattr(settings, "JWT_CACHE_ENTRIES", 10000))
+
+
+def token_key(raw_token):
+    if isinstance(raw_token, str):
+        raw_token = raw_token.encode()
+    return hashlib.sha256(raw_token).digest()
+
+
+def forget_token(raw_token):
+    """
+    Retire un jeton du cache (il sera vérifié à nouveau à la prochaine requête).
+    """
+    token_cache.delete(token_key(raw_token))
+
+
+def forget_user(user_id):
+    """
+    Retire du cache tous les jetons d'un utilisateur.
+    """
+    claim = settings.SIMPLE_JWT.get("USER_ID_CLAIM", "user_id")
+    user_id = str(user_id)  # Claim en texte pour une clé UUID
+    token_cache.discard_if(lambda token: str(token.payload.get(claim)) == user_id)
+
+
+@lru_cache(maxsize=None)
+def revocation_hooks(paths):
+    return [import_string(path) for path in paths]
+
+
+def is_revoked(token):
+    hooks = revocation_hooks(tuple(getattr(settings, "JWT_REVOCATION_HOOKS", ())))
+    return any(hook(token) for hook in hooks)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_validated_token(self, raw_token):
+        if not getattr(settings, "JWT_CACHE_ENABLED", True):
+            token = super().get_validated_token(raw_token)
+        else:
+            key = token_key(raw_token)
+            token = token_cache.get(key)
+            if token is None:
+                token = super().get_validated_token(raw_token)
+                expires_at = token.payload.get("exp")
+                if expires_at is not None:  # Jamais de jeton sans expiration en cache
+                    token_cache.set(key, token, expires_at=expires_at)
+        if is_revoked(token):
+            raise InvalidToken("Ce jeton a été révoqué.")
+        return token
@@ -0,0 +1,155 @@
+"""
+Route `POST /api/batch` : plusieurs appels à l'API en une seule requête HTTP.
+
+    {"read_only": false,
+     "requests": [{"method": "GET", "path": "/api/projects"},
+                  {"method": "POST", "path": "/api/issues/4/comments",
+                   "body": {"content": "..."}}]}
+
+- L'authentification (JWT) est faite une seule fois, pour le lot.
+- Les objets lus et les contrôles d'appartenance aux projets sont partagés
+  entre sous-requêtes (voir softdeskApp/identity.py).
+- Toutes les sous-requêtes s'exécutent dans une même transaction. À la
+  première erreur (statut >= 400) d'un lot en écriture, la transaction est
+  annulée et les sous-requêtes suivantes ne sont pas exécutées (statut 424).
+- `read_only` n'accepte que des lectures (transaction en lecture seule
+  sous PostgreSQL).
+"""
+import json
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .identity import IdentityMap
+
+API_PREFIX = "/api/"
+# Métadonnées de la requête englobante reprises par les sous-requêtes
+INHERITED_META = ("REMOTE_ADDR", "SERVER_NAME", "SERVER_PORT", "wsgi.url_scheme")
+
+
+def build_request(parent, method, path, body, headers, identity):
+    """
+    Construit la requête Django d'une sous-requête, déjà authentifiée.
+    """
+    url = urlsplit(path)
+    content = b"" if body is None else json.dumps(body).encode()
+    request = HttpRequest()
+    request.method = method
+    request.path = request.path_info = url.path
+    request.GET = QueryDict(url.query)
+    request.META = {key: parent.META[key] for key in INHERITED_META if key in parent.META}
+    request.META.update(
+        {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": url.path,
+            "QUERY_STRING": url.query,
+            "HTTP_ACCEPT": "application/json",
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(content)),
+        }
+    )
+    for name, value in headers.items():
+        request.META["HTTP_" + name.upper().replace("-", "_")] = str(value)
+    request._stream = BytesIO(content)
+    request._read_started = False
+    # Utilisateur déjà authentifié par la requête englobante (voir DRF, ForcedAuthentication)
+    request._force_auth_user = parent.user
+    request._force_auth_token = parent.auth
+    request.identity_map = identity
+    return request
+
+
+def parse_sub_requests(data):
+    entries = data.get("requests")
+    if not isinstance(entries, list) or not entries:
+        raise ValidationError({"requests": "Une liste de sous-requêtes est requise."})
+    limit = getattr(settings, "BATCH_MAX_REQUESTS", 20)
+    if len(entries) > limit:
+        raise ValidationError({"requests": f"{limit} sous-requêtes au maximum."})
+    read_only = bool(data.get("read_only", False))
+    parsed = []
+    for entry in entries:
+        if not isinstance(entry, dict) or not isinstance(entry.get("path"), str):
+            raise ValidationError({"requests": "Chaque sous-requête doit avoir un `path`."})
+        method = str(entry.get("method", "GET")).upper()
+        if read_only and method not in permissions.SAFE_METHODS:
+            raise ValidationError(
+                {"requests": f"Lot en lecture seule : méthode {method} refusée."}
+            )
+        headers = entry.get("headers") or {}
+        if not isinstance(headers, dict):
+            raise ValidationError({"requests": "`headers` doit être un objet."})
+        parsed.append((method, entry["path"], entry.get("body"), headers))
+    return read_only, parsed
+
+
+def execute(request, method, path, body, headers, identity):
+    """
+    Exécute une sous-requête et retourne (statut, headers, corps).
+    """
+    try:
+        if not path.startswith(API_PREFIX):
+            raise Resolver404()
+        match = resolve(urlsplit(path).path)
+    except Resolver404:
+        return status.HTTP_404_NOT_FOUND, {}, {"detail": "Not found."}
+    if match.func is batch_view:
+        return status.HTTP_400_BAD_REQUEST, {}, {"detail": "Lots imbriqués interdits."}
+
+    sub_request = build_request(request, method, path, body, headers, identity)
+    sub_request.resolver_match = match
+    response = match.func(sub_request, *match.args, **match.kwargs)
+
+    dropped = ["Content-Type", "Content-Length", "Vary", "Allow"]
+    if hasattr(response, "data"):
+        content = response.data
+    else:  # Réponse Django (liste diffusée, par exemple)
+        raw = b"".join(response) if response.streaming else response.content
+        if not raw:
+            content = None
+        elif response.get("Content-Type", "").startswith("application/json"):
+            content = json.loads(raw)
+        else:  # Texte (métriques Prometheus, par exemple) : type conservé
+            content = raw.decode(response.charset, errors="replace")
+            dropped.remove("Content-Type")
+    response_headers = {
+        name: value for name, value in response.items() if name not in dropped
+    }
+    return response.status_code, response_headers, content
+
+
+@api_view(["POST"])
+def batch_view(request):
+    """
+    Exécute un lot de sous-requêtes (voir la documentation du module).
+    """
+    read_only, sub_requests = parse_sub_requests(request.data)
+    identity = IdentityMap()
+    responses = []
+    committed = True
+    with transaction.atomic():
+        if read_only and connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION READ ONLY")
+        for method, path, body, headers in sub_requests:
+            if not committed:
+                responses.append(
+                    {"status": status.HTTP_424_FAILED_DEPENDENCY, "headers": {}, "body": None}
+                )
+                continue
+            code, response_headers, content = execute(
+                request, method, path, body, headers, identity
+            )
+            responses.append({"status": code, "headers": response_headers, "body": content})
+            if code >= 400 and not read_only:
+                committed = False
+                transaction.set_rollback(True)
+    return Response({"committed": committed, "responses": responses})
@@ -0,0 +1,94 @@
+"""
+Benchmarks de l'API SoftDesk, lancés avec `python manage.py benchmark <suite>`.
+
+Chaque suite est un module exposant :
+- `add_arguments(parser)` : options propres à la suite ;
+- `run(options)` : exécute le benchmark et retourne un dictionnaire
+  sérialisable en JSON.
+"""
+import os
+import statistics
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from importlib import import_module
+
+from django.conf import settings
+from django.db import connection
+
+# Nom de la suite -> module
+SUITES = {
+    "api": "softdeskApp.benchmarks.api",
+    "serializers": "softdeskApp.benchmarks.serializers",
+    "renderer": "softdeskApp.benchmarks.renderer",
+    "board": "softdeskApp.benchmarks.board",
+    "auth": "softdeskApp.benchmarks.auth",
+    "profiles": "softdeskApp.benchmarks.profiles",
+}
+
+
+def load_suite(name):
+    """
+    Importe le module d'une suite de benchmarks.
+    """
+    return import_module(SUITES[name])
+
+
+def percentiles(samples):
+    """
+    Résumé d'une série de mesures : moyenne, p50, p95, p99 et maximum.
+    """
+    if not samples:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    if len(samples) == 1:
+        value = float(samples[0])
+        return {"mean": value, "p50": value, "p95": value, "p99": value, "max": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "mean": statistics.fmean(samples),
+        "p50": cuts[49],
+        "p95": cuts[94],
+        "p99": cuts[98],
+        "max": float(max(samples)),
+    }
+
+
+def git_revision():
+    """
+    Retourne le commit courant (pour comparer les résultats entre commits).
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@contextmanager
+def benchmark_database():
+    """
+    Crée une base de test jetable pour la durée du benchmark.
+    - SQLite : un fichier temporaire (partageable entre threads, contrairement
+      à la base de test en mémoire).
+    - Autres moteurs : la base de test habituelle (`test_<nom>`).
+    """
+    test_settings = connection.settings_dict.setdefault("TEST", {})
+    previous_name = test_settings.get("NAME")
+    temp_dir = None
+    if connection.vendor == "sqlite":
+        temp_dir = tempfile.TemporaryDirectory(prefix="softdesk-bench-")
+        test_settings["NAME"] = os.path.join(temp_dir.name, "bench.sqlite3")
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings["NAME"] = previous_name
+        if temp_dir is not None:
+            temp_dir.cleanup()
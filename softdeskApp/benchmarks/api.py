@@ -0,0 +1,363 @@
+"""
+Benchmark de charge de l'API REST.
+- Crée un jeu de données de taille configurable dans une base jetable
+  (`softdeskApp.seeding`).
+- Authentifie des clients virtuels via `token/`.
+- Exécute un mélange de lectures et d'écritures sur projets, issues et
+  commentaires, avec le client de test Django ou un vrai serveur HTTP local.
+- Retourne débit, latences p50/p95/p99 et nombre de requêtes SQL par opération.
+"""
+import http.client
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.test import Client
+from django.test.utils import override_settings
+
+from softdeskApp.benchmarks import benchmark_database, percentiles
+from softdeskApp.models import Contributor, Issue, User
+from softdeskApp.seeding import DatasetGenerator
+
+PASSWORD = "Bench-Passw0rd!"
+
+# Mélange d'opérations : nom -> poids relatif
+OPERATIONS = {
+    "project_list": 15,
+    "project_retrieve": 10,
+    "project_contributors": 5,
+    "issue_list": 20,
+    "issue_retrieve": 15,
+    "comment_list": 20,
+    "issue_create": 5,
+    "comment_create": 10,
+}
+WRITE_OPERATIONS = {"issue_create", "comment_create"}
+
+
+def add_arguments(parser):
+    parser.add_argument("--users", type=int, default=10, help="Utilisateurs créés.")
+    parser.add_argument("--projects", type=int, default=20, help="Projets créés.")
+    parser.add_argument(
+        "--contributors", type=int, default=5, help="Taille moyenne d'une équipe."
+    )
+    parser.add_argument(
+        "--issues", type=int, default=20, help="Issues par projet (en moyenne)."
+    )
+    parser.add_argument(
+        "--comments", type=int, default=5, help="Commentaires par issue (en moyenne)."
+    )
+    parser.add_argument(
+        "--requests", type=int, default=500, help="Requêtes mesurées."
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=20, help="Requêtes de chauffe non mesurées."
+    )
+    parser.add_argument(
+        "--clients", type=int, default=4, help="Clients virtuels authentifiés."
+    )
+    parser.add_argument(
+        "--read-only", action="store_true", help="N'exécuter que des lectures."
+    )
+    parser.add_argument(
+        "--server",
+        action="store_true",
+        help="Passer par un serveur HTTP local au lieu du client de test.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Threads clients en mode --server.",
+    )
+
+
+def load_workload_targets(usernames):
+    """
+    Pour chaque utilisateur, les projets auxquels il contribue et leurs issues.
+    """
+    user_list = User.objects.filter(username__in=usernames).only("id", "username")
+    issues_by_project = defaultdict(list)
+    for issue_id, project_id in Issue.objects.values_list("id", "project_id"):
+        issues_by_project[project_id].append(issue_id)
+    projects_by_user = defaultdict(list)
+    for user_id, project_id in Contributor.objects.values_list("user_id", "project_id"):
+        if issues_by_project[project_id]:
+            projects_by_user[user_id].append(project_id)
+    return {
+        user.username: [
+            (project_id, issues_by_project[project_id])
+            for project_id in projects_by_user[user.pk]
+        ]
+        for user in user_list
+        if projects_by_user[user.pk]
+    }
+
+
+def build_request(operation, rng, targets):
+    """
+    Retourne (méthode, chemin, corps JSON) pour une opération du mélange.
+    """
+    project_id, issue_ids = rng.choice(targets)
+    issue_id = rng.choice(issue_ids)
+    if operation == "project_list":
+        return "GET", "/api/projects", None
+    if operation == "project_retrieve":
+        return "GET", f"/api/projects/{project_id}", None
+    if operation == "project_contributors":
+        return "GET", f"/api/projects/{project_id}/contributors", None
+    if operation == "issue_list":
+        return "GET", f"/api/projects/{project_id}/issues", None
+    if operation == "issue_retrieve":
+        return "GET", f"/api/projects/{project_id}/issues/{issue_id}", None
+    if operation == "comment_list":
+        return "GET", f"/api/issues/{issue_id}/comments", None
+    if operation == "issue_create":
+        body = {"title": f"Issue {rng.random():.8f}", "description": "Benchmark"}
+        return "POST", f"/api/projects/{project_id}/issues", body
+    if operation == "comment_create":
+        return "POST", f"/api/issues/{issue_id}/comments", {"content": "Benchmark"}
+    raise ValueError(f"Opération inconnue : {operation}")
+
+
+class TestClientTransport:
+    """
+    Exécute les requêtes en mémoire avec le client de test Django.
+    """
+
+    def __init__(self):
+        self.client = Client()
+
+    def request(self, method, path, body=None, token=None, headers=None):
+        extra = {"HTTP_AUTHORIZATION": f"Bearer {token}"} if token else {}
+        for name, value in (headers or {}).items():
+            extra["HTTP_" + name.upper().replace("-", "_")] = value
+        data = json.dumps(body) if body is not None else None
+        if method == "GET":
+            response = self.client.get(path, **extra)
+        else:
+            response = self.client.generic(
+                method, path, data or "", content_type="application/json", **extra
+            )
+        return response.status_code, response.headers, response.content
+
+    def close(self):
+        pass
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class HTTPTransport:
+    """
+    Exécute les requêtes sur un serveur HTTP local (une connexion par thread).
+    """
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.local = threading.local()
+
+    def connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = http.client.HTTPConnection(self.host, self.port)
+        return conn
+
+    def request(self, method, path, body=None, token=None, headers=None):
+        headers = {"Content-Type": "application/json", **(headers or {})}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        data = json.dumps(body).encode() if body is not None else None
+        conn = self.connection()
+        try:
+            conn.request(method, path, body=data, headers=headers)
+            response = conn.getresponse()
+            content = response.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            self.local.conn = None
+            raise
+        if response.getheader("Connection", "").lower() == "close":
+            conn.close()
+            self.local.conn = None
+        return response.status, dict(response.getheaders()), content
+
+    def close(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is not None:
+            conn.close()
+
+
+def start_server():
+    """
+    Démarre un serveur WSGI multi-thread sur un port libre.
+    """
+    server = ThreadedWSGIServer(("127.0.0.1", 0), QuietRequestHandler)
+    server.set_app(get_wsgi_application())
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, thread
+
+
+def authenticate(transport, usernames):
+    """
+    Obtient un jeton d'accès par client virtuel via `token/`.
+    """
+    tokens = {}
+    for username in usernames:
+        status, _, content = transport.request(
+            "POST", "/api/token/", {"username": username, "password": PASSWORD}
+        )
+        if status != 200:
+            raise RuntimeError(f"Authentification impossible pour {username} ({status})")
+        tokens[username] = json.loads(content)["access"]
+    return tokens
+
+
+def build_schedule(options, targets, tokens, rng):
+    """
+    Génère la suite (déterministe) des requêtes à exécuter.
+    """
+    operations = [
+        name
+        for name in OPERATIONS
+        if not (options["read_only"] and name in WRITE_OPERATIONS)
+    ]
+    weights = [OPERATIONS[name] for name in operations]
+    usernames = sorted(tokens)
+    schedule = []
+    for _ in range(options["warmup"] + options["requests"]):
+        username = rng.choice(usernames)
+        operation = rng.choices(operations, weights)[0]
+        method, path, body = build_request(operation, rng, targets[username])
+        schedule.append((operation, method, path, body, tokens[username]))
+    return schedule
+
+
+def execute(transport, schedule, results, errors):
+    """
+    Exécute une tranche du planning ; chaque thread a ses propres listes.
+    """
+    for operation, method, path, body, token in schedule:
+        start = time.perf_counter()
+        try:
+            status, headers, _ = transport.request(method, path, body, token)
+        except (http.client.HTTPException, OSError):
+            errors[operation] += 1
+            continue
+        elapsed = time.perf_counter() - start
+        if status >= 400:
+            errors[operation] += 1
+        queries = int(headers.get("X-Query-Count", 0))
+        results.append((operation, elapsed, queries))
+    transport.close()
+
+
+def summarize(results, errors, duration):
+    by_operation = defaultdict(list)
+    for operation, elapsed, queries in results:
+        by_operation[operation].append((elapsed, queries))
+
+    def describe(samples, error_count):
+        latencies = [elapsed * 1000 for elapsed, _ in samples]
+        queries = [count for _, count in samples]
+        return {
+            "count": len(samples),
+            "errors": error_count,
+            "latency_ms": percentiles(latencies),
+            "queries": percentiles(queries),
+        }
+
+    total = describe([(e, q) for _, e, q in results], sum(errors.values()))
+    total["duration_s"] = duration
+    total["throughput_rps"] = len(results) / duration if duration else 0.0
+    return {
+        "totals": total,
+        "operations": {
+            operation: describe(samples, errors[operation])
+            for operation, samples in sorted(by_operation.items())
+        },
+    }
+
+
+def run(options):
+    rng = random.Random(options["seed"])
+    config = {
+        key: options[key]
+        for key in (
+            "users", "projects", "contributors", "issues", "comments", "requests",
+            "warmup", "clients", "read_only", "server", "concurrency", "seed",
+        )
+    }
+    with benchmark_database(), override_settings(
+        METRICS_RESPONSE_HEADERS=True,
+        ALLOWED_HOSTS=["*"],
+        DEBUG=False,
+        THROTTLE_ENABLED=False,  # Mesure l'API, pas le limiteur
+        LOAD_SHED_QUEUE_MS=0,
+    ):
+        issues = options["projects"] * options["issues"]
+        usernames = DatasetGenerator(
+            seed=options["seed"], prefix="bench", password=PASSWORD
+        ).run(
+            users=options["users"],
+            projects=options["projects"],
+            issues=issues,
+            comments=issues * options["comments"],
+            contributors=options["contributors"],
+        )
+        targets = load_workload_targets(usernames)
+        usernames = sorted(targets)[: options["clients"]]
+
+        server = None
+        if options["server"]:
+            server, _ = start_server()
+            transport = HTTPTransport(*server.server_address[:2])
+            concurrency = max(1, options["concurrency"])
+        else:
+            transport = TestClientTransport()
+            concurrency = 1
+
+        try:
+            tokens = authenticate(transport, usernames)
+            schedule = build_schedule(options, targets, tokens, rng)
+            warmup, measured = schedule[: options["warmup"]], schedule[options["warmup"]:]
+            execute(transport, warmup, [], defaultdict(int))
+
+            slices = [
+                (measured[i::concurrency], [], defaultdict(int))
+                for i in range(concurrency)
+            ]
+            start = time.perf_counter()
+            if concurrency == 1:
+                execute(transport, *slices[0])
+            else:
+                threads = [
+                    threading.Thread(target=execute, args=(transport, *chunk))
+                    for chunk in slices
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            duration = time.perf_counter() - start
+            results, errors = [], defaultdict(int)
+            for _, chunk_results, chunk_errors in slices:
+                results.extend(chunk_results)
+                for operation, count in chunk_errors.items():
+                    errors[operation] += count
+        finally:
+            transport.close()
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+
+    return {"config": config, **summarize(results, errors, duration)}
@@ -0,0 +1,69 @@
+"""
+Micro-benchmark de l'authentification JWT : temps CPU par requête
+(`time.process_time`) pour des requêtes portant un jeton parmi `--tokens`.
+- uncached : `JWTAuthentication` (décodage et vérification HMAC à chaque fois) ;
+- cached : `CachedJWTAuthentication` (voir softdeskApp/authentication.py).
+Pour chaque chemin : validation du jeton seule (`token`) et authentification
+complète, lecture de l'utilisateur comprise (`authenticate`).
+"""
+import time
+from random import Random
+
+from django.test import RequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from softdeskApp.authentication import CachedJWTAuthentication, token_cache
+from softdeskApp.benchmarks import benchmark_database, percentiles
+from softdeskApp.models import User
+
+PATHS = {"uncached": JWTAuthentication, "cached": CachedJWTAuthentication}
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--requests", type=int, default=20000, help="Requêtes authentifiées par chemin."
+    )
+    parser.add_argument("--tokens", type=int, default=100, help="Jetons distincts.")
+
+
+def build_requests(options, rng):
+    users = User.objects.bulk_create(
+        User(username=f"auth{i}", age=30) for i in range(options["tokens"])
+    )
+    headers = [f"Bearer {AccessToken.for_user(user)}" for user in users]
+    factory = RequestFactory()
+    return [
+        factory.get("/api/projects", HTTP_AUTHORIZATION=rng.choice(headers))
+        for _ in range(options["requests"])
+    ]
+
+
+def measure(authentication, requests, full):
+    samples = []
+    for request in requests:
+        start = time.process_time_ns()
+        if full:
+            authentication.authenticate(request)
+        else:
+            header = authentication.get_header(request)
+            authentication.get_validated_token(authentication.get_raw_token(header))
+        samples.append((time.process_time_ns() - start) / 1000)
+    return {"cpu_us": percentiles(samples), "total_cpu_s": sum(samples) / 1e6}
+
+
+def run(options):
+    rng = Random(options["seed"])
+    results = {}
+    with benchmark_database():
+        requests = build_requests(options, rng)
+        for name, authentication_class in PATHS.items():
+            authentication = authentication_class()
+            results[name] = {}
+            for step, full in (("token", False), ("authenticate", True)):
+                token_cache.clear()
+                results[name][step] = measure(authentication, requests, full)
+    return {
+        "config": {key: options[key] for key in ("requests", "tokens", "seed")},
+        "paths": results,
+    }
@@ -0,0 +1,161 @@
+"""
+Benchmark des changements de statut sur un tableau très sollicité : un
+projet, quelques dizaines d'issues, des clients qui déplacent les issues
+d'une colonne à l'autre.
+- patch : `PATCH .../issues/<id>` avec `{"status": ...}` (chargement de
+  l'issue, `IssueSerializer`, écriture des champs validés) ;
+- transition : `POST .../issues/<id>/status` (un seul UPDATE, sans lecture
+  préalable de l'issue).
+Comme un vrai client, chaque requête envoie `If-Match` avec la version lue
+dans l'`ETag` de la réponse précédente sur la même issue ; après un conflit,
+la requête suivante sur cette issue part sans `If-Match`.
+Retourne, pour chaque chemin, débit, latences, requêtes SQL par changement
+et nombre de conflits (412/409).
+"""
+import threading
+import time
+from collections import defaultdict
+from random import Random
+
+from django.contrib.auth.hashers import make_password
+from django.test.utils import override_settings
+
+from softdeskApp.benchmarks import benchmark_database, percentiles
+from softdeskApp.benchmarks.api import (
+    HTTPTransport,
+    TestClientTransport,
+    authenticate,
+    start_server,
+)
+from softdeskApp.concurrency import etag
+from softdeskApp.models import Contributor, Issue, Project, User
+
+PASSWORD = "Bench-Passw0rd!"
+STATUSES = [status for status, _ in Issue.STATUS_CHOICES]
+
+
+def add_arguments(parser):
+    parser.add_argument("--issues", type=int, default=30, help="Issues du tableau.")
+    parser.add_argument(
+        "--requests", type=int, default=1000, help="Changements de statut par chemin."
+    )
+    parser.add_argument(
+        "--server",
+        action="store_true",
+        help="Passer par un serveur HTTP local au lieu du client de test.",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="Threads clients en mode --server."
+    )
+
+
+def create_board(issues):
+    """
+    Crée le tableau : un auteur, un projet, `issues` issues.
+    """
+    owner = User.objects.create(username="board", password=make_password(PASSWORD), age=30)
+    project = Project.objects.create(
+        name="Tableau", description="Benchmark", type=Project.BACKEND, author=owner
+    )
+    Contributor.objects.create(user=owner, project=project, role=Contributor.AUTHOR)
+    Issue.objects.bulk_create(
+        Issue(title=f"Issue {i}", project=project, author=owner) for i in range(issues)
+    )
+    return project, list(project.issues.values_list("id", flat=True))
+
+
+def build_schedule(path, project, issue_ids, count, rng):
+    base = f"/api/projects/{project.pk}/issues"
+    schedule = []
+    for _ in range(count):
+        issue_id = rng.choice(issue_ids)
+        body = {"status": rng.choice(STATUSES)}
+        if path == "patch":
+            schedule.append(("PATCH", f"{base}/{issue_id}", body, issue_id))
+        else:
+            schedule.append(("POST", f"{base}/{issue_id}/status", body, issue_id))
+    return schedule
+
+
+def execute(transport, token, versions, schedule, samples, errors):
+    """
+    Rejoue `schedule` ; `versions` (issue -> dernier ETag connu) est partagé
+    entre threads et entre chemins.
+    """
+    for method, url, body, issue_id in schedule:
+        tag = versions.pop(issue_id, None)
+        headers = {"If-Match": tag} if tag else None
+        start = time.perf_counter()
+        status, response_headers, _ = transport.request(method, url, body, token, headers)
+        elapsed = time.perf_counter() - start
+        if status >= 400:
+            errors[status] += 1
+            continue
+        versions[issue_id] = response_headers.get("ETag")
+        samples.append((elapsed, int(response_headers.get("X-Query-Count", 0))))
+    transport.close()
+
+
+def measure(transport, token, versions, schedule, concurrency):
+    slices = [(schedule[i::concurrency], [], defaultdict(int)) for i in range(concurrency)]
+    start = time.perf_counter()
+    threads = [
+        threading.Thread(target=execute, args=(transport, token, versions, *chunk))
+        for chunk in slices
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - start
+    samples = [sample for _, chunk, _ in slices for sample in chunk]
+    errors = defaultdict(int)
+    for _, _, chunk_errors in slices:
+        for status, count in chunk_errors.items():
+            errors[status] += count
+    return {
+        "count": len(samples),
+        "errors": dict(errors),
+        "duration_s": duration,
+        "throughput_rps": len(samples) / duration if duration else 0.0,
+        "latency_ms": percentiles([elapsed * 1000 for elapsed, _ in samples]),
+        "queries": percentiles([queries for _, queries in samples]),
+    }
+
+
+def run(options):
+    rng = Random(options["seed"])
+    config = {
+        key: options[key] for key in ("issues", "requests", "server", "concurrency", "seed")
+    }
+    results = {}
+    with benchmark_database(), override_settings(
+        METRICS_RESPONSE_HEADERS=True,
+        ALLOWED_HOSTS=["*"],
+        DEBUG=False,
+        THROTTLE_ENABLED=False,  # Mesure l'API, pas le limiteur
+        LOAD_SHED_QUEUE_MS=0,
+    ):
+        project, issue_ids = create_board(options["issues"])
+        server = None
+        if options["server"]:
+            server, _ = start_server()
+            transport = HTTPTransport(*server.server_address[:2])
+            concurrency = max(1, options["concurrency"])
+        else:
+            transport = TestClientTransport()
+            concurrency = 1
+        try:
+            token = authenticate(transport, ["board"])["board"]
+            versions = {issue_id: etag(1) for issue_id in issue_ids}
+            for path in ("patch", "transition"):
+                schedule = build_schedule(
+                    path, project, issue_ids, options["requests"], rng
+                )
+                results[path] = measure(transport, token, versions, schedule, concurrency)
+        finally:
+            transport.close()
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+    return {"config": config, "paths": results}
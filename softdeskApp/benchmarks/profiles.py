@@ -0,0 +1,110 @@
+"""
+Benchmark des profils de réglages : SoftDeskSupport.settings (défaut) contre
+SoftDeskSupport.settings_api (API seule, voir ce module).
+- requests : latence par requête (`GET /api/projects` authentifié, client de
+  test) avec la pile de middlewares de chaque profil ;
+- startup : temps d'import de `SoftDeskSupport.wsgi` (configuration de
+  Django, applications, middlewares), mesuré dans un nouveau processus
+  Python pour chaque essai.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.test import Client
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from softdeskApp.benchmarks import benchmark_database, percentiles
+from softdeskApp.models import Contributor, Project, User
+
+PROFILES = {"default": "SoftDeskSupport.settings", "api": "SoftDeskSupport.settings_api"}
+
+STARTUP_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from SoftDeskSupport.wsgi import application  # Configure Django, charge les middlewares
+print(json.dumps({"import_s": time.perf_counter() - start}))
+"""
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--requests", type=int, default=2000, help="Requêtes mesurées par profil."
+    )
+    parser.add_argument(
+        "--startups", type=int, default=5, help="Démarrages mesurés par profil."
+    )
+
+
+def create_data():
+    owner = User.objects.create(username="profile", password=make_password("x"), age=30)
+    for i in range(5):
+        project = Project.objects.create(
+            name=f"Projet {i}", description="Benchmark", type=Project.BACKEND, author=owner
+        )
+        Contributor.objects.create(user=owner, project=project, role=Contributor.AUTHOR)
+    return owner
+
+
+def measure_requests(module, owner, count):
+    with override_settings(
+        MIDDLEWARE=import_module(module).MIDDLEWARE,
+        THROTTLE_ENABLED=False,  # La chauffe viderait le seau
+        LOAD_SHED_QUEUE_MS=0,
+    ):
+        client = Client(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(owner)}")
+        for _ in range(min(count, 50)):  # Chauffe
+            client.get("/api/projects")
+        samples = []
+        for _ in range(count):
+            start = time.perf_counter()
+            response = client.get("/api/projects")
+            samples.append((time.perf_counter() - start) * 1e6)
+            assert response.status_code == 200, response.status_code
+    return {"latency_us": percentiles(samples)}
+
+
+def measure_startup(module, count):
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": module}
+    imports, processes = [], []
+    for _ in range(count):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        processes.append(time.perf_counter() - start)
+        imports.append(json.loads(output.strip().splitlines()[-1])["import_s"])
+    return {
+        "import_ms": statistics.median(imports) * 1000,
+        "process_ms": statistics.median(processes) * 1000,
+    }
+
+
+def run(options):
+    results = {}
+    with benchmark_database(), override_settings(ALLOWED_HOSTS=["*"], DEBUG=False):
+        owner = create_data()
+        for name, module in PROFILES.items():
+            results[name] = {
+                "middleware": len(import_module(module).MIDDLEWARE),
+                "installed_apps": len(import_module(module).INSTALLED_APPS),
+                "requests": measure_requests(module, owner, options["requests"]),
+            }
+    for name, module in PROFILES.items():
+        results[name]["startup"] = measure_startup(module, options["startups"])
+    return {
+        "config": {key: options[key] for key in ("requests", "startups", "seed")},
+        "profiles": results,
+    }
@@ -0,0 +1,106 @@
+"""
+Benchmark du rendu d'une grande liste d'issues (100 000 par défaut).
+Pour chaque chemin : temps de sérialisation, temps de rendu JSON et pic
+mémoire (tracemalloc, mesuré dans une passe séparée pour ne pas fausser les
+temps).
+- drf : `IssueSerializer` + `JSONRenderer` (json de la bibliothèque standard)
+- fast_stdlib : sérialiseur rapide + `JSONRenderer`
+- fast_orjson : sérialiseur rapide + `FastJSONRenderer`
+- fast_stream : sérialiseur rapide + `FastJSONRenderer.stream` par tranches
+"""
+import time
+import tracemalloc
+
+from rest_framework.renderers import JSONRenderer
+
+from softdeskApp.benchmarks import benchmark_database
+from softdeskApp.fast_serializers import FastIssueSerializer
+from softdeskApp.models import Issue
+from softdeskApp.renderers import FastJSONRenderer, orjson
+from softdeskApp.seeding import DatasetGenerator
+from softdeskApp.serializers import IssueSerializer
+
+
+def add_arguments(parser):
+    parser.add_argument("--issues", type=int, default=100000, help="Issues rendues.")
+    parser.add_argument(
+        "--chunk-size", type=int, default=1000, help="Lignes par tranche en streaming."
+    )
+
+
+def issue_queryset():
+    return Issue.objects.select_related("assignee", "project", "author").order_by("id")
+
+
+def drf(options):
+    start = time.perf_counter()
+    data = IssueSerializer(issue_queryset(), many=True).data
+    serialized = time.perf_counter()
+    body = JSONRenderer().render(data)
+    return serialized - start, time.perf_counter() - serialized, len(body)
+
+
+def fast(renderer_class):
+    def path(options):
+        serializer = FastIssueSerializer()
+        start = time.perf_counter()
+        data = serializer.serialize(serializer.values(issue_queryset()))
+        serialized = time.perf_counter()
+        body = renderer_class().render(data)
+        return serialized - start, time.perf_counter() - serialized, len(body)
+
+    return path
+
+
+def fast_stream(options):
+    serializer = FastIssueSerializer()
+    renderer = FastJSONRenderer()
+    start = time.perf_counter()
+    size = 0
+    chunks = serializer.serialize_chunks(
+        serializer.values(issue_queryset()), options["chunk_size"]
+    )
+    for part in renderer.stream(chunks):
+        size += len(part)  # Envoyé au client puis libéré
+    # Sérialisation et rendu sont entrelacés : tout est compté en rendu
+    return 0.0, time.perf_counter() - start, size
+
+
+PATHS = {
+    "drf": drf,
+    "fast_stdlib": fast(JSONRenderer),
+    "fast_orjson": fast(FastJSONRenderer),
+    "fast_stream": fast_stream,
+}
+
+
+def measure(path, options):
+    serialize_s, render_s, size = path(options)
+    tracemalloc.start()
+    path(options)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "serialization_s": serialize_s,
+        "render_s": render_s,
+        "total_s": serialize_s + render_s,
+        "peak_memory_mb": peak / 2**20,
+        "bytes": size,
+    }
+
+
+def run(options):
+    with benchmark_database():
+        DatasetGenerator(seed=options["seed"]).run(
+            users=1000, projects=500, issues=options["issues"], comments=0
+        )
+        results = {name: measure(path, options) for name, path in PATHS.items()}
+    return {
+        "config": {
+            "issues": options["issues"],
+            "chunk_size": options["chunk_size"],
+            "seed": options["seed"],
+            "orjson": orjson is not None,
+        },
+        "results": results,
+    }
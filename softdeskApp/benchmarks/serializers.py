@@ -0,0 +1,119 @@
+"""
+Micro-benchmark des sérialiseurs de liste : sérialiseurs DRF contre
+sérialiseurs rapides (`softdeskApp.fast_serializers`), en lignes par seconde.
+- "serialize" : sérialisation seule, lignes déjà chargées en mémoire.
+- "end_to_end" : requête SQL + sérialisation.
+"""
+import time
+
+from django.db.models import Prefetch
+from rest_framework.renderers import JSONRenderer
+
+from softdeskApp.benchmarks import benchmark_database
+from softdeskApp.fast_serializers import (
+    FastCommentSerializer,
+    FastIssueSerializer,
+    FastProjectSerializer,
+)
+from softdeskApp.models import Comment, Contributor, Issue, Project
+from softdeskApp.seeding import DatasetGenerator
+from softdeskApp.serializers import (
+    CommentSerializer,
+    IssueSerializer,
+    ProjectSerializer,
+)
+
+
+def add_arguments(parser):
+    parser.add_argument("--projects", type=int, default=2000, help="Projets créés.")
+    parser.add_argument("--issues", type=int, default=20000, help="Issues créées.")
+    parser.add_argument(
+        "--comments", type=int, default=20000, help="Commentaires créés."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Répétitions (meilleur temps retenu)."
+    )
+
+
+def best_time(function, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def compare(queryset, serializer_class, fast_serializer, repeat):
+    """
+    Mesure les deux chemins sur le même queryset et vérifie l'égalité du JSON.
+    """
+    instances = list(queryset)
+    rows = list(fast_serializer.values(queryset))
+    count = len(rows)
+
+    drf_serialize, drf_data = best_time(
+        lambda: serializer_class(instances, many=True).data, repeat
+    )
+    fast_serialize, fast_data = best_time(lambda: fast_serializer.serialize(rows), repeat)
+    drf_total, _ = best_time(
+        lambda: serializer_class(list(queryset.all()), many=True).data, repeat
+    )
+    fast_total, _ = best_time(
+        lambda: fast_serializer.serialize(fast_serializer.values(queryset.all())), repeat
+    )
+
+    renderer = JSONRenderer()
+    return {
+        "rows": count,
+        "identical_json": renderer.render(drf_data) == renderer.render(fast_data),
+        "serialize_rows_per_s": {
+            "drf": count / drf_serialize,
+            "fast": count / fast_serialize,
+            "speedup": drf_serialize / fast_serialize,
+        },
+        "end_to_end_rows_per_s": {
+            "drf": count / drf_total,
+            "fast": count / fast_total,
+            "speedup": drf_total / fast_total,
+        },
+    }
+
+
+def run(options):
+    with benchmark_database():
+        DatasetGenerator(seed=options["seed"]).run(
+            users=max(10, options["projects"] // 2),
+            projects=options["projects"],
+            issues=options["issues"],
+            comments=options["comments"],
+        )
+        repeat = options["repeat"]
+        results = {
+            "issues": compare(
+                Issue.objects.select_related("assignee", "project", "author").order_by("id"),
+                IssueSerializer,
+                FastIssueSerializer(),
+                repeat,
+            ),
+            "comments": compare(
+                Comment.objects.select_related("author", "issue").order_by("id"),
+                CommentSerializer,
+                FastCommentSerializer(),
+                repeat,
+            ),
+            "projects": compare(
+                Project.objects.select_related("author").prefetch_related(
+                    Prefetch("contributor_set", queryset=Contributor.objects.order_by("id"))
+                ),
+                ProjectSerializer,
+                FastProjectSerializer(),
+                repeat,
+            ),
+        }
+    config = {
+        key: options[key] for key in ("projects", "issues", "comments", "repeat", "seed")
+    }
+    return {"config": config, "results": results}
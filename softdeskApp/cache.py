@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Cache LRU en mémoire du processus, borné et sûr entre threads.
+    - `maxsize` : nombre maximal d'entrées (les moins récemment utilisées
+      sont évincées en premier), None pour ne pas les compter.
+    - `maxbytes` : taille totale maximale des valeurs (`len(valeur)`, pour
+      des octets), None pour ne pas la borner. Une valeur plus grande que
+      la borne n'est pas conservée.
+    - Chaque entrée peut avoir une date d'expiration (`expires_at`, horloge
+      `time.time()`), vérifiée à la lecture.
+    """
+
+    def __init__(self, maxsize=1024, maxbytes=None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self._data = OrderedDict()  # clé -> (valeur, expiration ou None)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                self._remove(key)
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, expires_at=None):
+        with self._lock:
+            self._remove(key)
+            if self.maxbytes is not None:
+                if len(value) > self.maxbytes:
+                    return
+                self._bytes += len(value)
+            self._data[key] = (value, expires_at)
+            while self.maxsize is not None and len(self._data) > self.maxsize:
+                self._remove(next(iter(self._data)))
+            while self.maxbytes is not None and self._bytes > self.maxbytes:
+                self._remove(next(iter(self._data)))
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key):
+        # Appelé verrou tenu
+        entry = self._data.pop(key, _MISSING)
+        if entry is not _MISSING and self.maxbytes is not None:
+            self._bytes -= len(entry[0])
+
+    def discard_if(self, predicate):
+        """
+        Supprime les entrées dont la valeur vérifie `predicate(valeur)`.
+        """
+        with self._lock:
+            for key in [k for k, (v, _) in self._data.items() if predicate(v)]:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def nbytes(self):
+        """
+        Taille totale des valeurs conservées (si `maxbytes` est indiqué).
+        """
+        return self._bytes
@@ -0,0 +1,134 @@
+"""
+Encodages de compression des réponses HTTP.
+- gzip (bibliothèque standard) toujours disponible ; brotli (`br`) et
+  zstandard (`zstd`) si les paquets `brotli` / `zstandard` sont installés.
+- `negotiate` choisit l'encodage à partir du header Accept-Encoding
+  (valeurs q), en préférant à qualité égale zstd, puis br, puis gzip.
+"""
+import zlib
+
+try:
+    import brotli
+except ImportError:  # Dépendance optionnelle
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # Dépendance optionnelle
+    zstandard = None
+
+DEFAULT_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+
+
+class GzipCodec:
+    name = "gzip"
+
+    def __init__(self, level):
+        self.level = level
+
+    def _compressobj(self):
+        # wbits=31 : en-tête et somme de contrôle gzip
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        compressor = self._compressobj()
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self, chunks):
+        compressor = self._compressobj()
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+class BrotliCodec:
+    name = "br"
+
+    def __init__(self, level):
+        self.level = level
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.level)
+
+    def stream(self, chunks):
+        compressor = brotli.Compressor(quality=self.level)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+
+
+class ZstdCodec:
+    name = "zstd"
+
+    def __init__(self, level):
+        self.level = level
+
+    def compress(self, data):
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def stream(self, chunks):
+        compressor = zstandard.ZstdCompressor(level=self.level).compressobj()
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(
+                zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            )
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+def available_codecs(levels=None):
+    """
+    Encodages disponibles, par ordre de préférence du serveur.
+    """
+    levels = {**DEFAULT_LEVELS, **(levels or {})}
+    codecs = []
+    if zstandard is not None:
+        codecs.append(ZstdCodec(levels["zstd"]))
+    if brotli is not None:
+        codecs.append(BrotliCodec(levels["br"]))
+    codecs.append(GzipCodec(levels["gzip"]))
+    return codecs
+
+
+def parse_accept_encoding(header):
+    """
+    "gzip;q=0.8, br" -> {"gzip": 0.8, "br": 1.0}
+    Espaces tolérés autour de `;` et `=` ("gzip ; q = 0.8", RFC 9110).
+    """
+    qualities = {}
+    for part in header.split(","):
+        name, *params = part.split(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value.strip())
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality
+    return qualities
+
+
+def negotiate(header, codecs):
+    """
+    Retourne le codec à utiliser, ou None (réponse non compressée).
+    """
+    if not header:
+        return None
+    qualities = parse_accept_encoding(header)
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for codec in codecs:  # Ordre de préférence : le premier gagne à égalité
+        quality = qualities.get(codec.name, wildcard)
+        if quality > best_quality:
+            best, best_quality = codec, quality
+    return best
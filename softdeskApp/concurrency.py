@@ -0,0 +1,134 @@
+"""
+Verrouillage optimiste des projets et des issues.
+
+Chaque projet et chaque issue porte une `version`, renvoyée dans le corps
+et dans le header `ETag` (`"<version>"`). Une modification (PUT, PATCH) :
+- vérifie le header `If-Match` s'il est présent (412 si la version ne
+  correspond pas) ;
+- est écrite par un seul `UPDATE ... SET ..., version = version + 1
+  WHERE id = ... AND version = N`, sans verrou : si une autre écriture est
+  passée entre la lecture et l'écriture, aucune ligne n'est modifiée et la
+  requête échoue (412 avec `If-Match`, 409 sans) au lieu d'écraser
+  silencieusement la modification concurrente.
+"""
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .identity import identity_map
+
+ANY_VERSION = "*"
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "La ressource a été modifiée depuis la version indiquée (If-Match)."
+    default_code = "precondition_failed"
+
+
+class PreconditionRequired(APIException):
+    status_code = status.HTTP_428_PRECONDITION_REQUIRED
+    default_detail = "Le header If-Match est requis pour modifier cette ressource."
+    default_code = "precondition_required"
+
+
+class Conflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "La ressource a été modifiée pendant la requête, rechargez-la."
+    default_code = "conflict"
+
+
+def etag(version):
+    return f'"{version}"'
+
+
+def parse_if_match(header):
+    """
+    Versions acceptées par `If-Match` : None si le header est absent,
+    ANY_VERSION pour `*`, sinon l'ensemble des versions citées.
+    - Le préfixe `W/` est ignoré : `CompressionMiddleware` affaiblit l'ETag
+      d'une réponse compressée, mais la version désignée reste la même.
+    """
+    if header is None:
+        return None
+    versions = set()
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return ANY_VERSION
+        tag = tag.removeprefix("W/").strip('"')
+        if tag.isdigit():
+            versions.add(int(tag))
+    return versions
+
+
+def if_match_versions(request):
+    """
+    `parse_if_match` appliqué à la requête ; 428 si le header est absent alors
+    que `CONCURRENCY_REQUIRE_IF_MATCH` est activé.
+    """
+    versions = parse_if_match(request.headers.get("If-Match"))
+    if versions is None and getattr(settings, "CONCURRENCY_REQUIRE_IF_MATCH", False):
+        raise PreconditionRequired()
+    return versions
+
+
+def check_if_match(request, instance):
+    """
+    Vérifie `If-Match` sur la version lue. Retourne True si le header est présent.
+    """
+    versions = if_match_versions(request)
+    if versions is None:
+        return False
+    if versions != ANY_VERSION and instance.version not in versions:
+        raise PreconditionFailed()
+    return True
+
+
+def save_if_unchanged(instance, values):
+    """
+    Écrit `values` par un seul UPDATE conditionné à la version de `instance`,
+    puis met l'instance à jour en mémoire. Retourne False si la ligne a été
+    modifiée (ou supprimée) depuis sa lecture.
+    """
+    now = timezone.now()
+    updated = (
+        type(instance)
+        ._base_manager.filter(pk=instance.pk, version=instance.version)
+        .update(**values, version=F("version") + 1, updated_at=now)
+    )
+    if not updated:
+        return False
+    for name, value in values.items():
+        setattr(instance, name, value)
+    instance.version += 1
+    instance.updated_at = now
+    return True
+
+
+class OptimisticConcurrencyMixin:
+    """
+    Mixin de ViewSet pour les modèles versionnés : header `ETag` sur les
+    réponses, modifications conditionnelles (voir le docstring du module).
+    """
+
+    def perform_update(self, serializer):
+        instance = serializer.instance
+        conditional = check_if_match(self.request, instance)
+        if not save_if_unchanged(instance, serializer.validated_data):
+            raise PreconditionFailed() if conditional else Conflict()
+        identity_map(self.request).discard(type(instance), instance.pk)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        data = getattr(response, "data", None)
+        if (
+            response.status_code == status.HTTP_200_OK
+            and isinstance(data, dict)
+            and "version" in data
+            and not data.get("archived")
+        ):
+            response["ETag"] = etag(data["version"])
+        return response
@@ -0,0 +1,105 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# État du routage pour la requête en cours (propre à chaque thread / tâche).
+# - "read_from_replica" : la requête courante peut lire sur un réplica.
+# - "pinned" : une écriture a eu lieu, on relit sur le primaire jusqu'à la fin.
+_routing_state = ContextVar("softdesk_routing_state", default=None)
+
+
+class RoutingState:
+    """
+    État du routage des bases de données pour une requête HTTP.
+    """
+
+    __slots__ = ("read_from_replica", "pinned")
+
+    def __init__(self, read_from_replica=False):
+        self.read_from_replica = read_from_replica
+        self.pinned = False
+
+
+def get_replica_aliases():
+    """
+    Retourne la liste des alias de réplicas configurés (vide si aucun).
+    """
+    return [
+        alias
+        for alias in getattr(settings, "REPLICA_DATABASES", [])
+        if alias in settings.DATABASES
+    ]
+
+
+def begin_request(read_from_replica):
+    """
+    Initialise l'état du routage pour la requête courante et retourne le jeton
+    à passer à `end_request`.
+    """
+    return _routing_state.set(RoutingState(read_from_replica))
+
+
+def end_request(token):
+    """
+    Restaure l'état du routage à la fin de la requête.
+    """
+    _routing_state.reset(token)
+
+
+def current_state():
+    """
+    Retourne l'état du routage de la requête courante (ou None hors requête).
+    """
+    return _routing_state.get()
+
+
+class ReadReplicaRouter:
+    """
+    Routeur de bases de données primaire / réplicas.
+    - Les écritures vont toujours sur le primaire (`default`).
+    - Les lectures d'une requête sûre (GET, HEAD, OPTIONS) vont sur un réplica.
+    - Après une écriture, les lectures restent sur le primaire (lecture de ses
+      propres écritures) : pour le reste de la requête et, via
+      `ReplicaRoutingMiddleware`, pendant `REPLICA_STICKY_SECONDS`.
+    - Hors requête HTTP (commandes, shell), tout passe par le primaire.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _routing_state.get()
+        if state is None or not state.read_from_replica or state.pinned:
+            return None
+        replicas = get_replica_aliases()
+        if not replicas:
+            return None
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            state.pinned = True  # Lire ses propres écritures
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primaire et réplicas contiennent les mêmes données
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Permet `migrate --database=replica` pour les réplicas SQLite locaux
+        return True
+
+
+def pin_key(identity):
+    """
+    Clé de cache marquant un client comme "collé" au primaire.
+    """
+    return f"softdesk:replica-pin:{identity}"
+
+
+def pin_until(identity, cache):
+    """
+    Colle le client au primaire pour `REPLICA_STICKY_SECONDS` secondes.
+    """
+    seconds = getattr(settings, "REPLICA_STICKY_SECONDS", 10)
+    if seconds > 0:
+        cache.set(pin_key(identity), True, seconds)
@@ -0,0 +1,234 @@
+"""
+Expansion des relations avec `?include=` (ex. `/issues/12?include=comments,project`,
+`/projects/3?include=issues.comments`).
+- Les objets liés sont chargés par des prefetch groupés (une requête par
+  relation et par niveau, quel que soit le nombre d'objets).
+- `INCLUDE_LIMITS` fixe le nombre maximal d'objets par parent à chaque niveau
+  (sa longueur est la profondeur maximale) ; au-delà, `<relation>_has_more`
+  vaut true et la suite se lit sur la route dédiée.
+- `INCLUDE_MAX_PARENTS` borne le nombre d'objets dépliés par une liste :
+  au-delà, la liste doit être paginée (`?page_size=` au plus égal à la borne),
+  sinon une seule requête renverrait parents × 50 × 20 lignes.
+"""
+from django.conf import settings
+from django.db.models import Prefetch
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .models import Comment, Contributor, Issue, Project
+from .serializers import CommentSerializer, IssueSerializer, ProjectSerializer
+
+DEFAULT_LIMITS = (50, 20)
+DEFAULT_MAX_PARENTS = 100
+
+
+class Expansion:
+    """
+    Relation dépliable : `many` pour une relation inverse (liste),
+    sinon clé étrangère dont l'identifiant est remplacé par l'objet.
+    - `prefetches` : relations de l'objet lié nécessaires à son sérialiseur.
+      Elles sont ajoutées à part, car Django ne relance pas le prefetch
+      d'une clé étrangère déjà chargée par `select_related`.
+    """
+
+    def __init__(self, model, serializer_class, many, queryset, prefetches=None):
+        self.model = model
+        self.serializer_class = serializer_class
+        self.many = many
+        self.queryset = queryset
+        self.prefetches = prefetches or (lambda: [])
+
+
+def issue_queryset():
+    return Issue.objects.select_related("assignee", "project", "author").order_by("id")
+
+
+def comment_queryset():
+    return Comment.objects.select_related("author", "issue").order_by("id")
+
+
+def project_queryset():
+    return Project.objects.select_related("author")
+
+
+def project_prefetches():
+    return [
+        Prefetch("author"),
+        Prefetch("contributor_set", queryset=Contributor.objects.order_by("id")),
+    ]
+
+
+# Relations dépliables par modèle
+EXPANSIONS = {
+    Project: {
+        "issues": Expansion(Issue, IssueSerializer, True, issue_queryset),
+    },
+    Issue: {
+        "comments": Expansion(Comment, CommentSerializer, True, comment_queryset),
+        "project": Expansion(
+            Project, ProjectSerializer, False, project_queryset, project_prefetches
+        ),
+    },
+}
+
+
+def get_limits():
+    return tuple(getattr(settings, "INCLUDE_LIMITS", DEFAULT_LIMITS))
+
+
+def get_max_parents():
+    return getattr(settings, "INCLUDE_MAX_PARENTS", DEFAULT_MAX_PARENTS)
+
+
+def parse_include(value, model):
+    """
+    "issues.comments,issues" -> {"issues": {"comments": {}}}
+    Lève ValidationError pour une relation inconnue ou trop profonde.
+    """
+    max_depth = len(get_limits())
+    tree = {}
+    for path in filter(None, (part.strip() for part in value.split(","))):
+        names = path.split(".")
+        if len(names) > max_depth:
+            raise ValidationError(
+                {"include": f"Profondeur maximale : {max_depth} niveau(x) ({path})."}
+            )
+        current_model, node = model, tree
+        for name in names:
+            expansion = EXPANSIONS.get(current_model, {}).get(name)
+            if expansion is None:
+                raise ValidationError({"include": f"Relation inconnue : {path}."})
+            node = node.setdefault(name, {})
+            current_model = expansion.model
+    return tree
+
+
+def included_attr(name):
+    """
+    Attribut recevant les objets préchargés d'une relation multiple.
+    """
+    return f"included_{name}"
+
+
+def build_prefetches(model, tree, limits=None, prefix=""):
+    """
+    Prefetch correspondant à l'arbre d'expansion. Les relations multiples
+    sont tronquées par parent à la limite du niveau (+1 pour savoir s'il
+    en reste).
+    """
+    limits = get_limits() if limits is None else limits
+    prefetches = []
+    for name, subtree in tree.items():
+        expansion = EXPANSIONS[model][name]
+        if expansion.many:
+            # Django n'accepte un queryset tronqué qu'avec `to_attr`
+            prefetch = Prefetch(
+                prefix + name,
+                queryset=expansion.queryset()[: limits[0] + 1],
+                to_attr=included_attr(name),
+            )
+            path = prefix + included_attr(name)
+        else:
+            prefetch = Prefetch(prefix + name, queryset=expansion.queryset())
+            path = prefix + name
+        prefetches.append(prefetch)
+        for related in expansion.prefetches():
+            related.add_prefix(path)
+            prefetches.append(related)
+        prefetches += build_prefetches(expansion.model, subtree, limits[1:], path + "__")
+    return prefetches
+
+
+def expand(instance, data, tree, context, limits=None):
+    """
+    Ajoute à `data` (sortie du sérialiseur de `instance`) les relations
+    demandées, à partir des objets préchargés.
+    """
+    limits = get_limits() if limits is None else limits
+    for name, subtree in tree.items():
+        expansion = EXPANSIONS[type(instance)][name]
+        if expansion.many:
+            related = getattr(instance, included_attr(name))
+            data[f"{name}_has_more"] = len(related) > limits[0]
+            data[name] = [
+                expand_one(expansion, obj, subtree, context, limits)
+                for obj in related[: limits[0]]
+            ]
+        else:
+            obj = getattr(instance, name)
+            data[name] = (
+                None if obj is None else expand_one(expansion, obj, subtree, context, limits)
+            )
+    return data
+
+
+def expand_one(expansion, obj, tree, context, limits):
+    data = expansion.serializer_class(obj, context=context).data
+    return expand(obj, data, tree, context, limits[1:])
+
+
+class IncludeMixin:
+    """
+    Mixin de ViewSet ajoutant `?include=` aux lectures (liste et détail).
+    Les listes avec expansion passent par le sérialiseur DRF.
+    """
+
+    def get_include_tree(self):
+        if not hasattr(self, "_include_tree"):
+            value = ""
+            if self.request.method in permissions.SAFE_METHODS:
+                value = self.request.query_params.get("include", "")
+            self._include_tree = parse_include(value, self.queryset.model)
+        return self._include_tree
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        tree = self.get_include_tree()
+        if tree:
+            queryset = queryset.prefetch_related(
+                *build_prefetches(self.queryset.model, tree)
+            )
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        tree = self.get_include_tree()
+        if not tree:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        max_parents = get_max_parents()
+        paginator = self.paginator
+        page_size = paginator.get_page_size(request) if paginator is not None else None
+        if page_size and page_size > max_parents:
+            raise ValidationError(
+                {"page_size": f"Au plus {max_parents} avec ?include=."}
+            )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            instances = page
+        else:
+            # Un objet de plus que la borne : les listes plus longues sont refusées
+            instances = list(queryset[: max_parents + 1])
+            if len(instances) > max_parents:
+                raise ValidationError(
+                    {
+                        "include": f"Au plus {max_parents} objets dépliés sans "
+                        "pagination : utiliser ?page_size=."
+                    }
+                )
+        context = self.get_serializer_context()
+        data = [
+            expand(instance, self.get_serializer(instance).data, tree, context)
+            for instance in instances
+        ]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        data = self.get_serializer(instance).data
+        tree = self.get_include_tree()
+        if tree:
+            data = expand(instance, data, tree, self.get_serializer_context())
+        return Response(data)
@@ -0,0 +1,297 @@
+"""
+Sérialiseurs rapides en lecture seule pour les listes.
+
+Les sérialiseurs DRF parcourent les champs un par un sur des instances de
+modèles. Ici, les lignes viennent directement de `values_list()` et chaque
+champ de sortie est associé une fois pour toutes (à la construction du
+sérialiseur) à un indice de colonne et à une conversion. Le JSON produit est
+identique octet pour octet à celui des sérialiseurs de `serializers.py`.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models.functions import Coalesce, Length, Substr
+from django.db.models.lookups import GreaterThan
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import permissions
+from rest_framework.response import Response
+
+from .models import Contributor
+from .renderers import FastJSONRenderer
+
+# Marqueur : la clé est omise si la valeur est nulle (comportement de DRF
+# pour un champ en lecture seule dont la source traverse une relation nulle).
+OMIT_IF_NULL = "omit_if_null"
+
+
+def datetime_converter():
+    """
+    Conversion des dates identique à `serializers.DateTimeField` (ISO 8601, `Z`).
+    """
+    tz = timezone.get_current_timezone() if settings.USE_TZ else None
+
+    def convert(value):
+        if not value:
+            return None
+        if tz is not None and timezone.is_aware(value):
+            value = value.astimezone(tz)
+        value = value.isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return convert
+
+
+class FastListSerializer:
+    """
+    Sérialiseur en lecture seule à partir de tuples `values_list()`.
+    - `fields` : (clé de sortie, chemin ORM, conversion) dans l'ordre de sortie.
+      La conversion vaut None (valeur brute), "datetime" ou OMIT_IF_NULL.
+    - `preview_fields` : champs texte remplacés par un aperçu si `preview`.
+    """
+
+    fields = ()
+    preview_fields = ()
+
+    def __init__(self, preview=False):
+        if preview:
+            # Champs texte remplacés par leur aperçu annoté (voir `TextPreviewMixin`)
+            self.fields = tuple(
+                entry
+                for key, lookup, conversion in self.fields
+                for entry in (
+                    [
+                        (f"{key}_preview", f"{lookup}_preview", None),
+                        (f"{key}_truncated", f"{lookup}_truncated", None),
+                    ]
+                    if key in self.preview_fields
+                    else [(key, lookup, conversion)]
+                )
+            )
+        self.lookups = [lookup for _, lookup, _ in self.fields]
+        convert_datetime = datetime_converter()
+        # Accesseurs précompilés : (clé, indice de colonne, conversion, omission)
+        self.accessors = tuple(
+            (
+                key,
+                index,
+                convert_datetime if conversion == "datetime" else None,
+                conversion == OMIT_IF_NULL,
+            )
+            for index, (key, _, conversion) in enumerate(self.fields)
+        )
+
+    def values(self, queryset):
+        """
+        Transforme le queryset de la vue en queryset de tuples.
+        """
+        return queryset.prefetch_related(None).values_list(*self.lookups)
+
+    def to_representation(self, row):
+        data = {}
+        for key, index, convert, omit_if_null in self.accessors:
+            value = row[index]
+            if value is None and omit_if_null:
+                continue
+            data[key] = value if convert is None else convert(value)
+        return data
+
+    def serialize(self, rows):
+        to_representation = self.to_representation
+        return [to_representation(row) for row in rows]
+
+    def serialize_chunks(self, rows, chunk_size):
+        """
+        Sérialise un queryset tranche par tranche (curseur côté serveur).
+        """
+        chunk = []
+        for row in rows.iterator(chunk_size=chunk_size):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield self.serialize(chunk)
+                chunk = []
+        if chunk:
+            yield self.serialize(chunk)
+
+
+class FastIssueSerializer(FastListSerializer):
+    """
+    Équivalent en lecture seule de `IssueSerializer`.
+    """
+
+    preview_fields = ("description",)
+    fields = (
+        ("id", "id", None),
+        ("title", "title", None),
+        ("description", "description", None),
+        ("priority", "priority", None),
+        ("tag", "tag", None),
+        ("status", "status", None),
+        ("assignee", "assignee_id", None),
+        ("assignee_username", "assignee__username", OMIT_IF_NULL),
+        ("project", "project_id", None),
+        ("project_name", "project__name", None),
+        ("author", "author_id", None),
+        ("author_username", "author__username", None),
+        ("created_at", "created_at", "datetime"),
+        ("version", "version", None),
+    )
+
+
+class FastCommentSerializer(FastListSerializer):
+    """
+    Équivalent en lecture seule de `CommentSerializer`.
+    """
+
+    preview_fields = ("content",)
+    fields = (
+        ("id", "id", None),
+        ("content", "content", None),
+        ("issue", "issue_id", None),
+        ("issue_title", "issue__title", None),
+        ("author", "author_id", None),
+        ("author_username", "author__username", None),
+        ("created_at", "created_at", "datetime"),
+    )
+
+
+class FastContributorSerializer(FastListSerializer):
+    """
+    Équivalent en lecture seule de `ContributorSerializer`.
+    """
+
+    fields = (
+        ("id", "id", None),
+        ("user", "user_id", None),
+        ("project", "project_id", None),
+        ("role", "role", None),
+    )
+
+
+class FastProjectSerializer(FastListSerializer):
+    """
+    Équivalent en lecture seule de `ProjectSerializer` (contributeurs inclus,
+    chargés en une seule requête pour toute la page).
+    """
+
+    preview_fields = ("description",)
+    fields = (
+        ("id", "id", None),
+        ("name", "name", None),
+        ("description", "description", None),
+        ("type", "type", None),
+        ("author", "author__username", None),
+        ("contributors", "id", None),  # Remplacé par la liste des contributeurs
+        ("created_at", "created_at", "datetime"),
+        ("version", "version", None),
+    )
+
+    def serialize(self, rows):
+        rows = list(rows)
+        contributors = defaultdict(list)
+        if rows:
+            memberships = (
+                Contributor.objects.filter(project_id__in=[row[0] for row in rows])
+                .order_by("id")
+                .values_list("id", "user_id", "project_id", "role")
+            )
+            for pk, user_id, project_id, role in memberships:
+                contributors[project_id].append(
+                    {"id": pk, "user": user_id, "project": project_id, "role": role}
+                )
+        data = super().serialize(rows)
+        for item in data:
+            item["contributors"] = contributors[item["contributors"]]
+        return data
+
+
+def preview_annotations(fields, length):
+    """
+    Annotations SQL des aperçus : `<champ>_preview` (premiers caractères) et
+    `<champ>_truncated` (texte plus long que l'aperçu).
+    """
+    annotations = {}
+    for name in fields:
+        annotations[f"{name}_preview"] = Substr(name, 1, length)
+        annotations[f"{name}_truncated"] = GreaterThan(Coalesce(Length(name), 0), length)
+    return annotations
+
+
+class FastListMixin:
+    """
+    Mixin de ViewSet : les listes en lecture (GET, HEAD) passent par
+    `fast_serializer_class` au lieu du sérialiseur DRF.
+    - Les champs texte longs y sont remplacés par un aperçu de
+      `LIST_TEXT_PREVIEW_LENGTH` caractères (texte complet avec `?full=1`).
+    - Désactivable globalement avec `FAST_LIST_SERIALIZERS = False`.
+    - Les listes non paginées rendues en JSON sont diffusées par tranches
+      avec `?stream=1` (ou toujours si `STREAM_LIST_RESPONSES` est activé).
+    """
+
+    fast_serializer_class = None
+
+    def get_preview_length(self):
+        """
+        Longueur des aperçus de texte de la liste, ou None pour le texte
+        complet (détail, `?full=1`, ou `LIST_TEXT_PREVIEW_LENGTH` à 0).
+        """
+        if getattr(self, "action", None) != "list":
+            return None
+        if self.request.query_params.get("full") in ("1", "true"):
+            return None
+        return getattr(settings, "LIST_TEXT_PREVIEW_LENGTH", 200) or None
+
+    def filter_queryset(self, queryset):
+        """
+        Aperçus calculés en SQL ; les colonnes de texte complet ne sont pas lues.
+        """
+        queryset = super().filter_queryset(queryset)
+        length = self.get_preview_length()
+        preview_fields = self.get_serializer_class().preview_fields
+        if length is None or not preview_fields:
+            return queryset
+        return queryset.annotate(**preview_annotations(preview_fields, length)).defer(
+            *preview_fields
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.get_preview_length() is not None:
+            context["text_preview"] = self.queryset.model
+        return context
+
+    def get_fast_serializer(self):
+        if (
+            self.fast_serializer_class is None
+            or self.request.method not in permissions.SAFE_METHODS
+            or not getattr(settings, "FAST_LIST_SERIALIZERS", True)
+        ):
+            return None
+        return self.fast_serializer_class(preview=self.get_preview_length() is not None)
+
+    def list(self, request, *args, **kwargs):
+        fast_serializer = self.get_fast_serializer()
+        if fast_serializer is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = fast_serializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast_serializer.serialize(page))
+        if self.should_stream(request):
+            renderer = request.accepted_renderer
+            chunk_size = getattr(settings, "STREAM_CHUNK_SIZE", 1000)
+            return StreamingHttpResponse(
+                renderer.stream(fast_serializer.serialize_chunks(rows, chunk_size)),
+                content_type=renderer.media_type,
+            )
+        return Response(fast_serializer.serialize(rows))
+
+    def should_stream(self, request):
+        if not isinstance(getattr(request, "accepted_renderer", None), FastJSONRenderer):
+            return False
+        if getattr(settings, "STREAM_LIST_RESPONSES", False):
+            return True
+        return request.query_params.get("stream") in ("1", "true")
@@ -0,0 +1,118 @@
+"""
+Clés d'idempotence pour les créations (POST).
+
+Un client mobile qui n'a pas reçu la réponse renvoie sa requête : sans
+protection, la nouvelle tentative repasse la validation et les vérifications
+d'appartenance, puis crée un doublon. Avec un header `Idempotency-Key`
+(valeur choisie par le client, un UUID par exemple) :
+- la première requête s'exécute normalement ; sa réponse (succès
+  uniquement) est enregistrée avec l'empreinte de la requête, dans la même
+  transaction que la création, pour `IDEMPOTENCY_KEY_TTL_SECONDS` ;
+- une nouvelle tentative avec la même clé rejoue la réponse enregistrée
+  (header `Idempotent-Replayed: true`) en une seule lecture par index, sans
+  validation ni écriture ;
+- la même clé avec une autre requête (corps, chemin) est refusée (422) ;
+- deux tentatives simultanées : la seconde échoue (409) et sa création est
+  annulée, le client réessaie et reçoit la réponse de la première.
+Les clés expirées sont supprimées par tranches (`purge_expired_keys`, appelé
+par la commande `purge_deleted`).
+"""
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from .concurrency import Conflict
+from .models import IdempotencyKey
+
+MAX_KEY_LENGTH = IdempotencyKey._meta.get_field("key").max_length
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "Cette clé d'idempotence a déjà servi pour une autre requête."
+    default_code = "idempotency_key_reused"
+
+
+def fingerprint(request):
+    """
+    Empreinte de la requête : méthode, chemin et corps (JSON canonique).
+    """
+    data = request.data
+    if hasattr(data, "lists"):  # QueryDict (formulaire)
+        data = dict(data.lists())
+    body = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    content = f"{request.method}\n{request.path}\n{body}"
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class IdempotencyMixin:
+    """
+    Prise en charge de `Idempotency-Key` par l'action `create` d'un ViewSet.
+    """
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get("Idempotency-Key")
+        if not key:
+            return super().create(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            raise ValidationError(
+                {"Idempotency-Key": f"{MAX_KEY_LENGTH} caractères au maximum."}
+            )
+
+        digest = fingerprint(request)
+        stored = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+        if stored is not None and stored.expires_at <= timezone.now():
+            stored.delete()  # Expirée mais pas encore purgée : la clé est libre
+            stored = None
+        if stored is not None:
+            if stored.fingerprint != digest:
+                raise IdempotencyKeyReused()
+            return Response(
+                stored.response,
+                status=stored.status_code,
+                headers={"Idempotent-Replayed": "true"},
+            )
+
+        with transaction.atomic():
+            response = super().create(request, *args, **kwargs)
+            if status.is_success(response.status_code):
+                ttl = getattr(settings, "IDEMPOTENCY_KEY_TTL_SECONDS", 86400)
+                body = json.dumps(response.data, cls=JSONEncoder)  # Comme le rendu JSON
+                try:
+                    with transaction.atomic():
+                        IdempotencyKey.objects.create(
+                            user=request.user,
+                            key=key,
+                            fingerprint=digest,
+                            status_code=response.status_code,
+                            response=json.loads(body),
+                            expires_at=timezone.now() + timedelta(seconds=ttl),
+                        )
+                except IntegrityError:
+                    raise Conflict(
+                        "Une requête avec cette clé d'idempotence est déjà en cours."
+                    )
+        return response
+
+
+def purge_expired_keys(batch_size=None):
+    """
+    Supprime les clés expirées par tranches (index sur `expires_at`).
+    Retourne le nombre de clés supprimées.
+    """
+    batch_size = batch_size or getattr(settings, "PURGE_BATCH_SIZE", 500)
+    expired = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).order_by()
+    total = 0
+    while True:
+        ids = list(expired.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return total
+        total += IdempotencyKey.objects.filter(pk__in=ids).delete()[0]
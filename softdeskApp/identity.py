@@ -0,0 +1,111 @@
+"""
+Carte d'identité des objets chargés pendant une requête.
+
+Une création lisait plusieurs fois les mêmes lignes : l'issue (ou le
+projet) cible, puis l'appartenance de l'utilisateur au projet, dans le
+sérialiseur, la permission et la vue. Ici, chaque ligne est lue au plus
+une fois par requête :
+- `load_project` et `load_issue` lisent l'objet (projet non supprimé) et,
+  dans la même requête SQL (`EXISTS`), l'appartenance de l'utilisateur au
+  projet ;
+- `is_member` mémorise les appartenances (utilisateur, projet) ;
+- les sous-requêtes d'un même lot (`/api/batch`) partagent la carte ;
+- une écriture retire les objets concernés (`discard`, `forget_memberships`).
+"""
+from django.db.models import Exists, OuterRef
+
+from .models import Contributor, Issue, Project
+
+
+class IdentityMap:
+    def __init__(self):
+        self.objects = {}  # (modèle, clé primaire) -> instance, ou None si absente
+        self.memberships = {}  # (projet, utilisateur) -> bool
+
+    def get(self, model, pk, load):
+        """
+        Objet `pk` de `model`, lu par `load()` au premier appel seulement.
+        """
+        key = (model, int(pk))
+        if key not in self.objects:
+            self.objects[key] = load()
+        return self.objects[key]
+
+    def discard(self, model, pk):
+        self.objects.pop((model, int(pk)), None)
+
+    def forget_memberships(self, project_id):
+        for key in [key for key in self.memberships if key[0] == project_id]:
+            del self.memberships[key]
+
+    def clear(self):
+        self.objects.clear()
+        self.memberships.clear()
+
+
+def identity_map(request):
+    """
+    Carte de la requête (créée au premier appel, portée par la requête Django).
+    """
+    http_request = getattr(request, "_request", request)
+    identity = getattr(http_request, "identity_map", None)
+    if identity is None:
+        identity = http_request.identity_map = IdentityMap()
+    return identity
+
+
+def member_of(user, project_ref):
+    return Exists(Contributor.objects.filter(user=user, project=OuterRef(project_ref)))
+
+
+def is_member(request, project_id, user_id=None):
+    """
+    L'utilisateur `user_id` (par défaut celui de la requête) contribue-t-il au projet ?
+    """
+    key = (int(project_id), request.user.pk if user_id is None else user_id)
+    memberships = identity_map(request).memberships
+    if key not in memberships:
+        memberships[key] = Contributor.objects.filter(
+            user_id=key[1], project_id=key[0]
+        ).exists()
+    return memberships[key]
+
+
+def load_project(request, project_id):
+    """
+    Projet non supprimé, ou None ; l'appartenance de l'utilisateur est lue en même temps.
+    """
+    identity = identity_map(request)
+
+    def load():
+        project = (
+            Project.objects.alive()
+            .filter(pk=project_id)
+            .annotate(is_member=member_of(request.user, "pk"))
+            .first()
+        )
+        if project is not None:
+            identity.memberships[(project.pk, request.user.pk)] = project.is_member
+        return project
+
+    return identity.get(Project, project_id, load)
+
+
+def load_issue(request, issue_id):
+    """
+    Issue d'un projet non supprimé, ou None ; l'appartenance de l'utilisateur
+    au projet est lue en même temps.
+    """
+    identity = identity_map(request)
+
+    def load():
+        issue = (
+            Issue.objects.filter(pk=issue_id, project__deleted_at__isnull=True)
+            .annotate(is_member=member_of(request.user, "project_id"))
+            .first()
+        )
+        if issue is not None:
+            identity.memberships[(issue.project_id, request.user.pk)] = issue.is_member
+        return issue
+
+    return identity.get(Issue, issue_id, load)
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from softdeskApp.archive import Archiver
+
+
+class Command(BaseCommand):
+    """
+    Archive les issues terminées sans activité depuis `ARCHIVE_AFTER_DAYS`
+    jours (issue et commentaires compressés dans `ArchivedIssue`).
+
+    Exemple (cron, chaque nuit) : python manage.py archive_issues --limit 50000
+    """
+
+    help = "Archive les issues terminées et inactives avec leurs commentaires."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Inactivité minimale en jours (défaut : ARCHIVE_AFTER_DAYS).",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Issues archivées par transaction."
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Nombre maximal d'issues archivées (défaut : toutes).",
+        )
+
+    def handle(self, *args, **options):
+        archiver = Archiver(
+            days=options["days"],
+            batch_size=options["batch_size"],
+            progress=self.stdout.write,
+        )
+        stats = archiver.run(limit=options["limit"])
+        ratio = stats["compressed_bytes"] / stats["raw_bytes"] if stats["raw_bytes"] else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{stats['issues']} issue(s) et {stats['comments']} commentaire(s) archivés "
+                f"({stats['raw_bytes']} octets -> {stats['compressed_bytes']}, "
+                f"ratio {ratio:.2f})."
+            )
+        )
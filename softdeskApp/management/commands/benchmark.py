@@ -0,0 +1,49 @@
+import json
+import platform
+from datetime import datetime, timezone
+
+import django
+from django.core.management.base import BaseCommand
+
+from softdeskApp.benchmarks import SUITES, git_revision, load_suite
+
+
+class Command(BaseCommand):
+    """
+    Lance une suite de benchmarks et écrit le résultat en JSON, pour comparer
+    les performances d'un commit à l'autre.
+
+    Exemple : python manage.py benchmark api --requests 1000 --output bench.json
+    """
+
+    help = "Lance une suite de benchmarks de l'API et écrit le résultat en JSON."
+
+    def add_arguments(self, parser):
+        subparsers = parser.add_subparsers(dest="suite", required=True)
+        for name in SUITES:
+            subparser = subparsers.add_parser(name)
+            subparser.add_argument(
+                "--seed", type=int, default=42, help="Graine pseudo-aléatoire."
+            )
+            subparser.add_argument(
+                "--output", help="Fichier JSON de sortie (sortie standard par défaut)."
+            )
+            load_suite(name).add_arguments(subparser)
+
+    def handle(self, *args, **options):
+        suite = options["suite"]
+        result = {
+            "suite": suite,
+            "revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            **load_suite(suite).run(options),
+        }
+        payload = json.dumps(result, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                output.write(payload + "\n")
+            self.stderr.write(f"Résultats écrits dans {options['output']}")
+        else:
+            self.stdout.write(payload)
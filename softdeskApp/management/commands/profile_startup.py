@@ -0,0 +1,175 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Exécuté dans un nouveau processus Python (`-X importtime`) : démarrage de
+# Django, préchauffage éventuel, première requête puis requêtes suivantes.
+# La requête (inscription refusée, mot de passe vide) traverse middlewares,
+# routage, authentification, sérialiseur et base sans rien écrire.
+PROBE_SCRIPT = """
+import io, json, sys, time, uuid
+
+def phase(name):
+    print(f"-- phase {name}", file=sys.stderr, flush=True)
+
+phase("boot")
+start = time.perf_counter()
+import django
+django.setup(set_prefix=False)
+from django.core.handlers.wsgi import WSGIHandler
+handler = WSGIHandler()
+result = {"boot_s": time.perf_counter() - start, "warmup_s": {}}
+
+if WARM:
+    phase("warmup")
+    from softdeskApp.startup import warm_up
+    result["warmup_s"] = warm_up()
+
+from django.conf import settings
+host = next(
+    (h for h in settings.ALLOWED_HOSTS if "*" not in h and not h.startswith(".")),
+    "localhost",
+)
+
+def request():
+    body = json.dumps({"username": f"probe-{uuid.uuid4().hex}", "password": ""}).encode()
+    environ = {
+        "REQUEST_METHOD": "POST", "PATH_INFO": "/api/register/", "QUERY_STRING": "",
+        "SERVER_NAME": host, "SERVER_PORT": "80", "HTTP_HOST": host,
+        "CONTENT_TYPE": "application/json", "CONTENT_LENGTH": str(len(body)),
+        "wsgi.input": io.BytesIO(body), "wsgi.url_scheme": "http",
+        "wsgi.errors": sys.stderr, "wsgi.multithread": False,
+        "wsgi.multiprocess": True, "wsgi.run_once": False,
+    }
+    statuses = []
+    start = time.perf_counter()
+    start_response = lambda status, headers, exc_info=None: statuses.append(status)
+    response = handler(environ, start_response)
+    b"".join(response)
+    response.close()
+    return time.perf_counter() - start, statuses[0]
+
+phase("first_request")
+result["first_request_s"], result["status"] = request()
+phase("steady")
+result["steady_s"] = [request()[0] for _ in range(REQUESTS)]
+print(json.dumps(result))
+"""
+
+
+def parse_imports(stderr):
+    """
+    Lignes de `-X importtime`, par phase : [(module, self µs, cumulé µs)].
+    """
+    phases = defaultdict(list)
+    current = "boot"
+    for line in stderr.splitlines():
+        if line.startswith("-- phase "):
+            current = line[len("-- phase ") :]
+        elif line.startswith("import time:") and "|" in line:
+            own, cumulative, name = line[len("import time:") :].split("|")
+            if own.strip().isdigit():
+                phases[current].append((name.strip(), int(own), int(cumulative)))
+    return phases
+
+
+def summarize_imports(imports, top):
+    packages = defaultdict(int)
+    for name, own, _ in imports:
+        packages[name.split(".")[0]] += own
+    slowest = sorted(imports, key=lambda entry: entry[1], reverse=True)[:top]
+    return {
+        "modules": len(imports),
+        "total_ms": sum(own for _, own, _ in imports) / 1000,
+        "packages_ms": {
+            name: own / 1000
+            for name, own in sorted(packages.items(), key=lambda item: -item[1])[:top]
+        },
+        "slowest_ms": [
+            {"module": name, "self": own / 1000, "cumulative": cumulative / 1000}
+            for name, own, cumulative in slowest
+        ],
+    }
+
+
+class Command(BaseCommand):
+    """
+    Mesure le démarrage d'un worker dans de nouveaux processus Python :
+    imports par module et par phase (démarrage, préchauffage, première
+    requête), durée du démarrage, de la première requête et des suivantes,
+    sans puis avec le préchauffage de softdeskApp/startup.py.
+
+    Exemple : python manage.py profile_startup --runs 5 --output startup.json
+    """
+
+    help = "Mesure le temps de démarrage et de première requête d'un worker."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=3, help="Processus par variante.")
+        parser.add_argument(
+            "--requests", type=int, default=20, help="Requêtes après la première."
+        )
+        parser.add_argument(
+            "--top", type=int, default=15, help="Modules les plus lents listés."
+        )
+        parser.add_argument(
+            "--output", help="Fichier JSON de sortie (sortie standard par défaut)."
+        )
+
+    def probe(self, warm, requests):
+        script = PROBE_SCRIPT.replace("WARM", repr(warm)).replace("REQUESTS", str(requests))
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", script],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode:
+            raise CommandError(process.stderr.strip().splitlines()[-1])
+        return json.loads(process.stdout.strip().splitlines()[-1]), parse_imports(
+            process.stderr
+        )
+
+    def variant(self, warm, options):
+        runs = [
+            self.probe(warm, options["requests"]) for _ in range(max(1, options["runs"]))
+        ]
+        median = lambda values: statistics.median(values) * 1000  # noqa: E731
+        results = [result for result, _ in runs]
+        steps = results[0]["warmup_s"].keys()
+        return {
+            "status": results[0]["status"],
+            "boot_ms": median([r["boot_s"] for r in results]),
+            "warmup_ms": {
+                step: median([r["warmup_s"][step] for r in results]) for step in steps
+            },
+            "first_request_ms": median([r["first_request_s"] for r in results]),
+            "steady_request_ms": median([s for r in results for s in r["steady_s"]]),
+            "imports": {
+                phase: summarize_imports(imports, options["top"])
+                for phase, imports in runs[0][1].items()
+            },
+        }
+
+    def handle(self, *args, **options):
+        result = {
+            "settings": settings.SETTINGS_MODULE,
+            "runs": options["runs"],
+            "cold": self.variant(False, options),
+            "warm": self.variant(True, options),
+        }
+        payload = json.dumps(result, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                output.write(payload + "\n")
+            self.stderr.write(f"Résultats écrits dans {options['output']}")
+        else:
+            self.stdout.write(payload)
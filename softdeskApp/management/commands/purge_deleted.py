@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+
+from softdeskApp.idempotency import purge_expired_keys
+from softdeskApp.purge import Purger, claim_next_job, purge_expired_tombstones
+
+
+class Command(BaseCommand):
+    """
+    Purge les projets et utilisateurs supprimés (tâches `PurgeJob`), par
+    tranches bornées, puis les traces de suppression et les clés
+    d'idempotence expirées.
+
+    Exemple (cron, toutes les minutes) : python manage.py purge_deleted --max-jobs 5
+    """
+
+    help = "Exécute les purges en attente des projets et utilisateurs supprimés."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=None, help="Lignes supprimées par transaction."
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Pause entre deux tranches (secondes).",
+        )
+        parser.add_argument(
+            "--max-jobs",
+            type=int,
+            default=0,
+            help="Nombre maximal de tâches traitées (0 : toutes).",
+        )
+
+    def handle(self, *args, **options):
+        purger = Purger(
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+            progress=self.stdout.write,
+        )
+        done = 0
+        while not options["max_jobs"] or done < options["max_jobs"]:
+            job = claim_next_job()
+            if job is None:
+                break
+            try:
+                purger.run(job)
+            except Exception as exc:  # Tâche relancée plus tard (PURGE_MAX_ATTEMPTS)
+                self.stderr.write(f"{job} : échec ({exc!r})")
+            else:
+                done += 1
+        tombstones = purge_expired_tombstones(options["batch_size"])
+        keys = purge_expired_keys(options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{done} purge(s) terminée(s), {tombstones} trace(s) expirée(s) et "
+                f"{keys} clé(s) d'idempotence expirée(s) supprimée(s)."
+            )
+        )
@@ -0,0 +1,191 @@
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+# Bornes des histogrammes (format Prometheus : chaque seau compte les
+# observations inférieures ou égales à sa borne).
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+
+
+class Histogram:
+    """
+    Histogramme en mémoire, étiqueté et sûr entre threads.
+    - `observe` coûte une recherche dichotomique et un incrément sous verrou.
+    - Les seaux sont cumulés seulement à l'export.
+    """
+
+    def __init__(self, name, documentation, buckets, labelnames):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labelnames = tuple(labelnames)
+        self._series = {}  # labels -> [compteurs par seau..., +Inf, somme]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def samples(self):
+        """
+        Retourne les séries (labels, seaux cumulés, total, somme) figées.
+        """
+        with self._lock:
+            snapshot = [(labels, list(series)) for labels, series in self._series.items()]
+        for labels, series in sorted(snapshot):
+            cumulative = []
+            running = 0
+            for count in series[:-1]:
+                running += count
+                cumulative.append(running)
+            yield labels, cumulative, running, series[-1]
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+class Counter:
+    """
+    Compteur étiqueté en mémoire, sûr entre threads.
+    """
+
+    def __init__(self, name, documentation, labelnames):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return sorted(self._values.items())
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+REQUEST_LATENCY = Histogram(
+    "softdesk_request_duration_seconds",
+    "Durée totale de traitement de la requête.",
+    LATENCY_BUCKETS,
+    ("view", "method"),
+)
+DB_QUERIES = Histogram(
+    "softdesk_db_queries",
+    "Nombre de requêtes SQL par requête HTTP.",
+    QUERY_COUNT_BUCKETS,
+    ("view", "method"),
+)
+DB_LATENCY = Histogram(
+    "softdesk_db_duration_seconds",
+    "Temps passé en base de données par requête HTTP.",
+    LATENCY_BUCKETS,
+    ("view", "method"),
+)
+SERIALIZATION_LATENCY = Histogram(
+    "softdesk_serialization_duration_seconds",
+    "Temps de rendu de la réponse (sérialisation JSON).",
+    LATENCY_BUCKETS,
+    ("view", "method"),
+)
+REQUESTS = Counter(
+    "softdesk_requests_total",
+    "Nombre de requêtes HTTP traitées.",
+    ("view", "method", "status"),
+)
+OVER_BUDGET = Counter(
+    "softdesk_requests_over_budget_total",
+    "Requêtes ayant dépassé le budget de requêtes SQL ou de latence.",
+    ("view", "budget"),
+)
+
+REGISTRY = [
+    REQUEST_LATENCY,
+    DB_QUERIES,
+    DB_LATENCY,
+    SERIALIZATION_LATENCY,
+    REQUESTS,
+    OVER_BUDGET,
+]
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_number(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def render_prometheus(registry=REGISTRY):
+    """
+    Exporte les métriques au format texte Prometheus (version 0.0.4).
+    """
+    lines = []
+    for metric in registry:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        if isinstance(metric, Histogram):
+            lines.append(f"# TYPE {metric.name} histogram")
+            for labels, cumulative, total, value_sum in metric.samples():
+                for bound, count in zip(metric.buckets, cumulative):
+                    label_str = _format_labels(
+                        metric.labelnames, labels, [("le", _format_number(float(bound)))]
+                    )
+                    lines.append(f"{metric.name}_bucket{label_str} {count}")
+                label_str = _format_labels(metric.labelnames, labels, [("le", "+Inf")])
+                lines.append(f"{metric.name}_bucket{label_str} {total}")
+                label_str = _format_labels(metric.labelnames, labels)
+                lines.append(f"{metric.name}_sum{label_str} {_format_number(value_sum)}")
+                lines.append(f"{metric.name}_count{label_str} {total}")
+        else:
+            lines.append(f"# TYPE {metric.name} counter")
+            for labels, value in metric.samples():
+                label_str = _format_labels(metric.labelnames, labels)
+                lines.append(f"{metric.name}{label_str} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics(registry=REGISTRY):
+    """
+    Remet toutes les métriques à zéro (tests, benchmarks).
+    """
+    for metric in registry:
+        metric.reset()
+
+
+def metrics_view(request):
+    """
+    Expose les métriques au format Prometheus.
+    - Accès limité aux adresses de `METRICS_ALLOWED_IPS` (None = toutes).
+    """
+    allowed = getattr(settings, "METRICS_ALLOWED_IPS", ("127.0.0.1", "::1"))
+    if allowed is not None and request.META.get("REMOTE_ADDR") not in allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(
+        render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
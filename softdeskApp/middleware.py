@@ -0,0 +1,300 @@
+import hashlib
+import logging
+from contextlib import ExitStack
+from math import ceil
+from time import perf_counter, time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.cache import caches
+from django.db import connections
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+
+from softdeskApp import compression, db_routers, metrics, throttling
+from softdeskApp.cache import LRUCache
+
+logger = logging.getLogger("softdeskApp.metrics")
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def client_identity(request):
+    """
+    Identifie le client sans accès à la base : empreinte du header
+    Authorization (JWT), ou adresse IP à défaut.
+    """
+    auth = request.META.get("HTTP_AUTHORIZATION")
+    if auth:
+        return hashlib.blake2b(auth.encode(), digest_size=16).hexdigest()
+    return request.META.get("REMOTE_ADDR", "")
+
+
+class ThrottleMiddleware:
+    """
+    Limitation de débit par seaux à jetons (voir softdeskApp/throttling.py).
+    - Décidée dans `process_view` : la route est résolue (coût connu), mais
+      ni l'authentification DRF ni la vue n'ont encore lu la base.
+    - `THROTTLE_ENABLED` est relu à chaque requête.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not getattr(settings, "THROTTLE_ENABLED", True):
+            return None
+        allowed, wait = throttling.take(request, request.resolver_match)
+        if allowed:
+            return None
+        response = JsonResponse(
+            {"detail": f"Trop de requêtes, réessayez dans {ceil(wait)} s."}, status=429
+        )
+        response.headers["Retry-After"] = str(ceil(wait))
+        return response
+
+
+class LoadSheddingMiddleware:
+    """
+    Délestage : une requête restée plus de `LOAD_SHED_QUEUE_MS` dans la file
+    d'attente du proxy (header `X-Request-Start`, ajouté par nginx ou
+    l'hébergeur) est refusée aussitôt (503 avec `Retry-After`). Le client
+    aura abandonné ou réessayé : la traiter ne ferait qu'allonger la file.
+    - Décision en O(1), avant toute lecture en base.
+    - Sans header, la requête n'est jamais délestée.
+    """
+
+    def __init__(self, get_response):
+        threshold = getattr(settings, "LOAD_SHED_QUEUE_MS", 1000)
+        if not threshold:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.threshold = threshold / 1000
+        self.retry_after = getattr(settings, "LOAD_SHED_RETRY_AFTER", 1)
+
+    def __call__(self, request):
+        queued = throttling.queue_time(request.META.get("HTTP_X_REQUEST_START"), time())
+        if queued is not None and queued > self.threshold:
+            response = JsonResponse(
+                {"detail": "Serveur surchargé, réessayez plus tard."}, status=503
+            )
+            response.headers["Retry-After"] = str(self.retry_after)
+            return response
+        return self.get_response(request)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Middleware activant le routage des lectures vers les réplicas.
+    - Les requêtes sûres lisent sur un réplica, sauf si le client a écrit
+      récemment (fenêtre `REPLICA_STICKY_SECONDS`).
+    - Une requête qui a écrit colle le client au primaire pour cette fenêtre,
+      dans le cache `REPLICA_CACHE_ALIAS`.
+    - Désactivé automatiquement si aucun réplica n'est configuré.
+    """
+
+    def __init__(self, get_response):
+        if not db_routers.get_replica_aliases():
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.cache = caches[getattr(settings, "REPLICA_CACHE_ALIAS", "default")]
+
+    def __call__(self, request):
+        identity = client_identity(request)
+        read_from_replica = (
+            request.method in SAFE_METHODS
+            and self.cache.get(db_routers.pin_key(identity)) is None
+        )
+        token = db_routers.begin_request(read_from_replica)
+        try:
+            response = self.get_response(request)
+            if db_routers.current_state().pinned:
+                db_routers.pin_until(identity, self.cache)
+        finally:
+            db_routers.end_request(token)
+        return response
+
+
+class QueryCollector:
+    """
+    Wrapper d'exécution SQL comptant les requêtes et le temps passé en base.
+    """
+
+    __slots__ = ("count", "duration", "render_start", "render_duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.render_start = None
+        self.render_duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += perf_counter() - start
+            self.count += 1
+
+    def render_finished(self, response):
+        # Callback post-rendu : fin de la sérialisation JSON
+        self.render_duration = perf_counter() - self.render_start
+
+
+class MetricsMiddleware:
+    """
+    Middleware d'instrumentation par vue (nom de route de `softdeskApp/urls.py`).
+    - Mesure le nombre de requêtes SQL, le temps en base, le temps de rendu
+      (sérialisation) et la latence totale dans des histogrammes en mémoire.
+    - Journalise les requêtes dépassant `METRICS_QUERY_BUDGET` ou
+      `METRICS_LATENCY_BUDGET_MS`.
+    - Ajoute les headers `Server-Timing` et `X-Query-Count` si
+      `METRICS_RESPONSE_HEADERS` est activé.
+    - Désactivé complètement si `METRICS_ENABLED` est faux.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", True):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.query_budget = getattr(settings, "METRICS_QUERY_BUDGET", 50)
+        self.latency_budget = getattr(settings, "METRICS_LATENCY_BUDGET_MS", 1000) / 1000
+        self.response_headers = getattr(settings, "METRICS_RESPONSE_HEADERS", False)
+
+    def __call__(self, request):
+        collector = QueryCollector()
+        request._metrics_collector = collector
+        start = perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(collector))
+            response = self.get_response(request)
+        total = perf_counter() - start
+
+        match = request.resolver_match
+        view = match.view_name if match is not None else "unmatched"
+        method = request.method
+        metrics.REQUEST_LATENCY.observe(total, view, method)
+        metrics.DB_QUERIES.observe(collector.count, view, method)
+        metrics.DB_LATENCY.observe(collector.duration, view, method)
+        metrics.SERIALIZATION_LATENCY.observe(collector.render_duration, view, method)
+        metrics.REQUESTS.inc(view, method, str(response.status_code))
+
+        if collector.count > self.query_budget:
+            metrics.OVER_BUDGET.inc(view, "queries")
+            logger.warning(
+                "%s %s (%s) : %d requêtes SQL (budget %d)",
+                method, request.path, view, collector.count, self.query_budget,
+            )
+        if total > self.latency_budget:
+            metrics.OVER_BUDGET.inc(view, "latency")
+            logger.warning(
+                "%s %s (%s) : %.1f ms (budget %.1f ms, base %.1f ms)",
+                method, request.path, view, total * 1000,
+                self.latency_budget * 1000, collector.duration * 1000,
+            )
+
+        if self.response_headers:
+            response["Server-Timing"] = (
+                f"db;dur={collector.duration * 1000:.2f}, "
+                f"render;dur={collector.render_duration * 1000:.2f}, "
+                f"total;dur={total * 1000:.2f}"
+            )
+            response["X-Query-Count"] = str(collector.count)
+        return response
+
+    def process_template_response(self, request, response):
+        # Appelé juste avant `response.render()` (réponses DRF)
+        collector = request._metrics_collector
+        collector.render_start = perf_counter()
+        response.add_post_render_callback(collector.render_finished)
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Compression des réponses (zstd, br ou gzip selon Accept-Encoding).
+    - Seuls les corps d'au moins `COMPRESSION_MIN_SIZE` octets et de type
+      `COMPRESSION_CONTENT_TYPES` sont compressés ; les réponses diffusées
+      (`?stream=1`) sont compressées au fil de l'eau.
+    - Les corps compressés sont conservés par empreinte du contenu : une
+      réponse identique (liste servie depuis un cache de réponses, par
+      exemple) n'est pas recompressée. Cache local au processus par défaut
+      (au plus `COMPRESSION_CACHE_BYTES` octets compressés), ou cache Django
+      partagé avec `COMPRESSION_CACHE_ALIAS`.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "COMPRESSION_ENABLED", True):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.codecs = compression.available_codecs(
+            getattr(settings, "COMPRESSION_LEVELS", None)
+        )
+        self.min_size = getattr(settings, "COMPRESSION_MIN_SIZE", 1024)
+        self.content_types = tuple(
+            getattr(
+                settings,
+                "COMPRESSION_CONTENT_TYPES",
+                ("application/json", "text/", "application/javascript"),
+            )
+        )
+        self.cache_max_size = getattr(settings, "COMPRESSION_CACHE_MAX_SIZE", 4 * 2**20)
+        alias = getattr(settings, "COMPRESSION_CACHE_ALIAS", None)
+        if alias is not None:
+            self.cache = caches[alias]
+        else:
+            # Borné en octets : le nombre d'entrées ne borne pas la mémoire
+            self.cache = LRUCache(
+                maxsize=None,
+                maxbytes=getattr(settings, "COMPRESSION_CACHE_BYTES", 32 * 2**20),
+            )
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.is_compressible(response):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        codec = compression.negotiate(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""), self.codecs
+        )
+        if codec is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = codec.stream(response.streaming_content)
+            del response.headers["Content-Length"]
+        else:
+            response.content = self.compress(codec, response.content)
+            response.headers["Content-Length"] = str(len(response.content))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            # Le corps diffère de celui qui a produit l'ETag (RFC 9110)
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = codec.name
+        return response
+
+    def is_compressible(self, response):
+        if response.has_header("Content-Encoding"):
+            return False
+        if "no-transform" in response.get("Cache-Control", ""):
+            return False
+        if not response.streaming and len(response.content) < self.min_size:
+            return False
+        return response.get("Content-Type", "").startswith(self.content_types)
+
+    def compress(self, codec, content):
+        if len(content) > self.cache_max_size:
+            return codec.compress(content)
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        key = f"compressed:{codec.name}:{digest}"
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = codec.compress(content)
+            self.cache.set(key, compressed)
+        return compressed
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.20 on 2026-10-19 06:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("softdeskApp", "0016_archived_issue"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="issue",
+            name="version",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="version",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.20 on 2026-10-19 06:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("softdeskApp", "0018_idempotency_key"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=["assignee", "status", "created_at"],
+                name="softdeskApp_assigne_ba1a0f_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=["author", "status", "created_at"],
+                name="softdeskApp_author__4f99f0_idx",
+            ),
+        ),
+    ]
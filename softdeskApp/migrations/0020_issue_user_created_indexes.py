@@ -0,0 +1,21 @@
+# Generated by Django 4.2.20 on 2026-10-19 06:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('softdeskApp', '0019_issue_user_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['assignee', 'created_at'], name='softdeskApp_assigne_0f4e24_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['author', 'created_at'], name='softdeskApp_author__a96000_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-19 06:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('softdeskApp', '0020_issue_user_created_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='purgejob',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
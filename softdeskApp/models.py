@@ -1,4 +1,6 @@
+import json
 import uuid
+import zlib
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
@@ -25,6 +27,9 @@ class User(AbstractUser):
     created_at = models.DateTimeField(
         auto_now_add=True, editable=False
     )  # Date de création
+    deleted_at = models.DateTimeField(
+        null=True, blank=True, editable=False
+    )  # Suppression demandée (compte désactivé, données purgées en arrière-plan)
 
     # Éviter les conflits avec les groupes et permissions par défaut
     groups = models.ManyToManyField(
@@ -46,6 +51,14 @@ class User(AbstractUser):
 
 
 # 2. PROJECT MODEL
+class ProjectQuerySet(models.QuerySet):
+    def alive(self):
+        """
+        Projets non supprimés (les projets supprimés attendent leur purge).
+        """
+        return self.filter(deleted_at__isnull=True)
+
+
 class Project(models.Model):
     """
     Modèle pour les projets.
@@ -75,6 +88,15 @@ class Project(models.Model):
         User, through="Contributor", related_name="projects"
     )  # Contributeurs du projet
     created_at = models.DateTimeField(auto_now_add=True)  # Date de création
+    updated_at = models.DateTimeField(auto_now=True)  # Date de dernière modification
+    version = models.PositiveIntegerField(
+        default=1, editable=False
+    )  # Incrémentée à chaque modification (verrouillage optimiste)
+    deleted_at = models.DateTimeField(
+        null=True, blank=True, db_index=True
+    )  # Suppression demandée, en attente de purge
+
+    objects = ProjectQuerySet.as_manager()
 
     class Meta:
         ordering = ["-created_at"]  # Tri par date de création décroissante
@@ -105,6 +127,8 @@ class Contributor(models.Model):
     role = models.CharField(
         max_length=20, choices=ROLE_CHOICES, default=CONTRIBUTOR
     )  # Rôle du contributeur
+    created_at = models.DateTimeField(auto_now_add=True)  # Date d'ajout au projet
+    updated_at = models.DateTimeField(auto_now=True)  # Date de dernière modification
 
     class Meta:
         constraints = [
@@ -112,6 +136,9 @@ class Contributor(models.Model):
                 fields=["user", "project"], name="unique_contributor"
             )  # Contrainte d'unicité
         ]
+        indexes = [
+            models.Index(fields=["project", "updated_at"]),  # Synchronisation par projet
+        ]
 
     def __str__(self):
         """
@@ -169,6 +196,21 @@ class Issue(models.Model):
     )  # Projet associé
     author = models.ForeignKey(User, on_delete=models.CASCADE)  # Auteur de l'issue
     created_at = models.DateTimeField(auto_now_add=True)  # Date de création
+    updated_at = models.DateTimeField(auto_now=True)  # Date de dernière modification
+    version = models.PositiveIntegerField(
+        default=1, editable=False
+    )  # Incrémentée à chaque modification (verrouillage optimiste)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["project", "updated_at"]),  # Synchronisation par projet
+            # Issues d'un utilisateur, tous projets confondus (GET /api/me/issues)
+            # sans filtre de statut, puis avec `?status=`
+            models.Index(fields=["assignee", "created_at"]),
+            models.Index(fields=["author", "created_at"]),
+            models.Index(fields=["assignee", "status", "created_at"]),
+            models.Index(fields=["author", "status", "created_at"]),
+        ]
 
     def __str__(self):
         """
@@ -190,9 +232,173 @@ class Comment(models.Model):
     )  # Issue associée
     author = models.ForeignKey(User, on_delete=models.CASCADE)  # Auteur du commentaire
     created_at = models.DateTimeField(auto_now_add=True)  # Date de création
+    updated_at = models.DateTimeField(
+        auto_now=True, db_index=True
+    )  # Date de dernière modification
 
     def __str__(self):
         """
         Représentation en chaîne de caractères du commentaire.
         """
         return f"Comment by {self.author} on {self.issue}"
+
+
+# 6. TOMBSTONE MODEL
+class Tombstone(models.Model):
+    """
+    Trace d'une suppression, lue par la synchronisation différentielle.
+    - Seul l'objet supprimé explicitement est tracé : les objets supprimés
+      en cascade (issues d'un projet, commentaires d'une issue) sont retirés
+      par le client avec leur parent.
+    - `project_id` n'est pas une clé étrangère : le projet peut avoir disparu.
+    """
+
+    PROJECT = "project"
+    CONTRIBUTOR = "contributor"
+    ISSUE = "issue"
+    COMMENT = "comment"
+    MODEL_CHOICES = [
+        (PROJECT, "Project"),
+        (CONTRIBUTOR, "Contributor"),
+        (ISSUE, "Issue"),
+        (COMMENT, "Comment"),
+    ]
+
+    model = models.CharField(max_length=20, choices=MODEL_CHOICES)  # Type d'objet
+    object_id = models.BigIntegerField()  # Identifiant de l'objet supprimé
+    project_id = models.BigIntegerField()  # Projet de l'objet supprimé
+    deleted_at = models.DateTimeField(auto_now_add=True)  # Date de suppression
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["project_id", "deleted_at"]),
+            models.Index(fields=["deleted_at"]),  # Purge des traces expirées
+        ]
+
+    def __str__(self):
+        """
+        Représentation en chaîne de caractères de la trace.
+        """
+        return f"{self.model} {self.object_id} supprimé le {self.deleted_at}"
+
+
+# 7. PURGE JOB MODEL
+class PurgeJob(models.Model):
+    """
+    Purge en arrière-plan d'un projet ou d'un utilisateur supprimé
+    (voir softdeskApp/purge.py et la commande `purge_deleted`).
+    - `progress` : lignes supprimées par table, mis à jour après chaque tranche.
+    - `updated_at` sert de signe de vie : une tâche `running` inactive trop
+      longtemps (processus interrompu) est reprise.
+    - `attempts` compte les échecs : une tâche `failed` est relancée après
+      `PURGE_RETRY_SECONDS`, tant qu'elle a échoué moins de
+      `PURGE_MAX_ATTEMPTS` fois.
+    """
+
+    PROJECT = "project"
+    USER = "user"
+    KIND_CHOICES = [(PROJECT, "Project"), (USER, "User")]
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)  # Type d'objet purgé
+    object_id = models.CharField(max_length=36)  # Identifiant (entier ou UUID)
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=PENDING
+    )  # État de la tâche
+    progress = models.JSONField(default=dict)  # Lignes supprimées par table
+    error = models.TextField(blank=True)  # Dernière erreur
+    attempts = models.PositiveIntegerField(default=0)  # Nombre d'échecs
+    created_at = models.DateTimeField(auto_now_add=True)  # Date de la demande
+    updated_at = models.DateTimeField(auto_now=True)  # Dernière progression
+    finished_at = models.DateTimeField(null=True, blank=True)  # Fin de la purge
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        """
+        Représentation en chaîne de caractères de la tâche.
+        """
+        return f"Purge {self.kind} {self.object_id} ({self.status})"
+
+
+# 8. ARCHIVED ISSUE MODEL
+class ArchivedIssue(models.Model):
+    """
+    Issue terminée et inactive, déplacée hors des tables `Issue` / `Comment`
+    (voir softdeskApp/archive.py et la commande `archive_issues`).
+    - `payload` : représentation JSON de l'issue et de ses commentaires,
+      compressée avec zlib, identique à la sortie de l'API.
+    - Titre, statut et dates restent en clair pour filtrer sans décompresser.
+    """
+
+    id = models.BigIntegerField(primary_key=True)  # Identifiant d'origine de l'issue
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="archived_issues"
+    )  # Projet associé
+    author = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="+"
+    )  # Auteur de l'issue
+    title = models.CharField(max_length=255)  # Titre de l'issue
+    status = models.CharField(max_length=15)  # Statut au moment de l'archivage
+    comment_count = models.PositiveIntegerField(default=0)  # Commentaires archivés
+    created_at = models.DateTimeField()  # Date de création de l'issue
+    updated_at = models.DateTimeField()  # Dernière modification avant archivage
+    archived_at = models.DateTimeField(auto_now_add=True)  # Date d'archivage
+    payload = models.BinaryField()  # {"issue": ..., "comments": [...]} compressé
+
+    def __str__(self):
+        """
+        Représentation en chaîne de caractères de l'issue archivée.
+        """
+        return f"{self.title} (archivée)"
+
+    def load(self):
+        """
+        Retourne {"issue": {...}, "comments": [...]} décompressé.
+        """
+        return json.loads(zlib.decompress(self.payload))
+
+
+# 9. IDEMPOTENCY KEY MODEL
+class IdempotencyKey(models.Model):
+    """
+    Réponse d'une création rejouée aux nouvelles tentatives portant le même
+    header `Idempotency-Key` (voir softdeskApp/idempotency.py).
+    - La clé est propre à chaque utilisateur.
+    - `fingerprint` : empreinte de la requête d'origine (méthode, chemin,
+      corps) ; la même clé avec une autre requête est refusée.
+    - `expires_at` est indexé : les clés expirées sont supprimées par
+      tranches (commande `purge_deleted`).
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="+"
+    )  # Auteur de la requête
+    key = models.CharField(max_length=255)  # Valeur du header Idempotency-Key
+    fingerprint = models.CharField(max_length=64)  # SHA-256 de la requête
+    status_code = models.PositiveSmallIntegerField()  # Statut de la réponse
+    response = models.JSONField()  # Corps de la réponse
+    created_at = models.DateTimeField(auto_now_add=True)  # Date de la requête
+    expires_at = models.DateTimeField(db_index=True)  # Fin de validité
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="unique_idempotency_key")
+        ]
+
+    def __str__(self):
+        """
+        Représentation en chaîne de caractères de la clé.
+        """
+        return f"{self.key} ({self.status_code})"
@@ -0,0 +1,139 @@
+"""
+Issues d'un utilisateur, tous projets confondus : `GET /api/me/issues`.
+
+Sans cet endpoint, un client liste ses projets puis les issues de chacun.
+Ici, une page coûte au plus deux lectures, une par rôle (issues assignées,
+issues créées), chacune bornée à la taille de page :
+- chaque lecture suit son index, déjà trié par date de création :
+  (assignee_id, created_at) ou (author_id, created_at), et
+  (assignee_id, status, created_at) ou (author_id, status, created_at) avec
+  `?status=`. Aucune issue d'un autre utilisateur n'est parcourue, et la
+  lecture s'arrête à la taille de page sans trier les autres issues ;
+- les deux lectures sont fusionnées par date de création décroissante (une
+  issue créée par l'utilisateur et qui lui est assignée n'apparaît qu'une
+  fois) ;
+- pagination par curseur (`created_at`, `id`) signé, sans OFFSET : la page
+  suivante reprend où la précédente s'est arrêtée, même si des issues sont
+  créées entre-temps ;
+- seuls les projets non supprimés dont l'utilisateur est encore
+  contributeur sont retenus (EXISTS sur l'index unique des contributeurs).
+
+Paramètres : `?role=assigned|authored` (défaut : les deux), `?status=`,
+`?page_size=`, `?cursor=` et `?full=1` (texte complet des descriptions).
+"""
+import heapq
+from datetime import datetime
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q
+from rest_framework.decorators import api_view
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .fast_serializers import FastIssueSerializer, preview_annotations
+from .identity import member_of
+from .models import Issue
+
+CURSOR_SALT = "softdeskApp.my_work"
+ROLES = {"assigned": "assignee", "authored": "author"}
+
+
+def make_cursor(created_at, issue_id):
+    return signing.dumps({"c": created_at.isoformat(), "i": issue_id}, salt=CURSOR_SALT)
+
+
+def read_cursor(cursor):
+    """
+    (created_at, id) de la dernière issue de la page précédente, ou None.
+    """
+    if not cursor:
+        return None
+    try:
+        payload = signing.loads(cursor, salt=CURSOR_SALT)
+        return datetime.fromisoformat(payload["c"]), int(payload["i"])
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        raise ValidationError({"cursor": "Curseur invalide."})
+
+
+def parse_params(request):
+    params = request.query_params
+    role = params.get("role")
+    if role is not None and role not in ROLES:
+        raise ValidationError({"role": f"Valeurs possibles : {', '.join(ROLES)}."})
+    status = params.get("status")
+    if status is not None and status not in dict(Issue.STATUS_CHOICES):
+        choices = ", ".join(choice for choice, _ in Issue.STATUS_CHOICES)
+        raise ValidationError({"status": f"Valeurs possibles : {choices}."})
+    default = getattr(settings, "MY_WORK_PAGE_SIZE", 50)
+    try:
+        page_size = int(params.get("page_size", default))
+        if page_size < 1:
+            raise ValueError
+    except ValueError:
+        raise ValidationError({"page_size": "Entier strictement positif attendu."})
+    page_size = min(page_size, getattr(settings, "PAGINATION_MAX_PAGE_SIZE", 500))
+    return role, status, page_size
+
+
+def branch(serializer, user, field, status, after, limit, preview_length):
+    """
+    Lignes des issues dont `field` est l'utilisateur, les plus récentes
+    d'abord, au plus `limit`.
+    """
+    queryset = Issue.objects.filter(
+        member_of(user, "project_id"),
+        **{field: user},
+        project__deleted_at__isnull=True,
+    )
+    if status is not None:
+        queryset = queryset.filter(status=status)
+    if after is not None:
+        created_at, issue_id = after
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=issue_id)
+        )
+    if preview_length is not None:
+        queryset = queryset.annotate(
+            **preview_annotations(FastIssueSerializer.preview_fields, preview_length)
+        )
+    return serializer.values(queryset.order_by("-created_at", "-id"))[:limit]
+
+
+@api_view(["GET"])
+def my_issues_view(request):
+    """
+    Issues assignées à l'utilisateur ou créées par lui (voir le module).
+    """
+    role, status, page_size = parse_params(request)
+    after = read_cursor(request.query_params.get("cursor"))
+    preview_length = None
+    if request.query_params.get("full") not in ("1", "true"):
+        preview_length = getattr(settings, "LIST_TEXT_PREVIEW_LENGTH", 200) or None
+    serializer = FastIssueSerializer(preview=preview_length is not None)
+    created_at = serializer.lookups.index("created_at")
+
+    fields = [ROLES[role]] if role else ROLES.values()
+    branches = [
+        branch(
+            serializer, request.user, field, status, after, page_size + 1, preview_length
+        )
+        for field in fields
+    ]
+    rows, seen = [], set()
+    key = lambda row: (row[created_at], row[0])  # noqa: E731
+    for row in heapq.merge(*branches, key=key, reverse=True):
+        if row[0] not in seen:  # Issue créée par l'utilisateur et assignée à lui
+            seen.add(row[0])
+            rows.append(row)
+            if len(rows) > page_size:
+                break
+
+    next_link = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        cursor = make_cursor(last[created_at], last[0])
+        next_link = replace_query_param(request.build_absolute_uri(), "cursor", cursor)
+    return Response({"next": next_link, "results": serializer.serialize(rows)})
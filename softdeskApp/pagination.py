@@ -0,0 +1,162 @@
+"""
+Pagination sur demande avec un total peu coûteux.
+
+`PageNumberPagination` calcule le total par un `COUNT(*)` sur le queryset
+complet de la vue (jointures et `.distinct()` compris), à chaque page : autant
+que la page elle-même. `CountingPagination` :
+- n'est activée que si le client la demande (`?page_size=`), ou pour toutes
+  les listes si `REST_FRAMEWORK["PAGE_SIZE"]` est défini ;
+- lit une ligne de plus que la page pour savoir s'il existe une page
+  suivante, sans dépendre du total ;
+- calcule le total selon `?count=` (défaut : `PAGINATION_COUNT_MODE`) :
+  - `exact` : `COUNT(*)` sur le queryset de la vue ;
+  - `cached` : total gardé `PAGINATION_COUNT_CACHE_SECONDS` secondes. Une
+    vue peut fournir un comptage plus simple (`get_count_source()`, par
+    exemple les issues d'un projet, sans jointure ni `.distinct()`) ;
+  - `estimate` : comptage borné à `PAGINATION_COUNT_LIMIT` lignes, au-delà
+    le total renvoyé est la borne et `count_exact` vaut false ;
+  - `none` : pas de total.
+"""
+import math
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import LRUCache
+
+COUNT_MODES = ("exact", "cached", "estimate", "none")
+
+# Totaux des listes : clé -> nombre de lignes (local au processus)
+count_cache = LRUCache(maxsize=4096)
+
+
+def invalidate_count(key):
+    """
+    Oublie un total mis en cache (à appeler après une création ou une suppression).
+    """
+    count_cache.delete(key)
+
+
+class CountingPagination(PageNumberPagination):
+    page_size_query_param = "page_size"
+    count_query_param = "count"
+
+    @property
+    def max_page_size(self):
+        return getattr(settings, "PAGINATION_MAX_PAGE_SIZE", 500)
+
+    def get_count_mode(self, request):
+        mode = request.query_params.get(
+            self.count_query_param, getattr(settings, "PAGINATION_COUNT_MODE", "cached")
+        )
+        if mode not in COUNT_MODES:
+            raise ValidationError(
+                {self.count_query_param: f"Valeurs possibles : {', '.join(COUNT_MODES)}."}
+            )
+        return mode
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.request = request
+        self.count_mode = self.get_count_mode(request)
+        self.count, self.count_exact = None, True
+        if self.count_mode != "none":
+            self.count = self.get_count(queryset, view)
+        return self.get_page(queryset, page_size)
+
+    def paginate_list(self, rows, request):
+        """
+        Pagine une liste déjà en mémoire (commentaires archivés) : total exact,
+        sans requête.
+        """
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.request = request
+        self.count_mode = self.get_count_mode(request)
+        self.count = None if self.count_mode == "none" else len(rows)
+        self.count_exact = True
+        return self.get_page(rows, page_size)
+
+    def get_page(self, rows, page_size):
+        number = self.request.query_params.get(self.page_query_param, 1)
+        if number in self.last_page_strings and self.count is not None:
+            number = max(1, math.ceil(self.count / page_size))
+        try:
+            number = int(number)
+            if number < 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_page_message.format(page_number=number, message=""))
+
+        offset = (number - 1) * page_size
+        rows = list(rows[offset : offset + page_size + 1])
+        if number > 1 and not rows:
+            raise NotFound(self.invalid_page_message.format(page_number=number, message=""))
+        self.number = number
+        self.has_next = len(rows) > page_size
+        return rows[:page_size]
+
+    def get_count(self, queryset, view):
+        if self.count_mode == "exact":
+            return queryset.count()
+        if self.count_mode == "estimate":
+            limit = getattr(settings, "PAGINATION_COUNT_LIMIT", 10000)
+            count = queryset[: limit + 1].count()
+            if count > limit:
+                self.count_exact = False
+                return limit
+            return count
+        source = getattr(view, "get_count_source", lambda: None)()
+        if source is None:
+            try:
+                key, counted = ("query", str(queryset.query)), queryset
+            except EmptyResultSet:
+                return 0
+        else:
+            key, counted = source
+        count = count_cache.get(key)
+        if count is None:
+            count = counted.count()
+            ttl = getattr(settings, "PAGINATION_COUNT_CACHE_SECONDS", 30)
+            count_cache.set(key, count, expires_at=time.time() + ttl)
+        return count
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.number + 1)
+
+    def get_previous_link(self):
+        if self.number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.number - 1)
+
+    def get_paginated_response(self, data):
+        content = OrderedDict()
+        if self.count is not None:
+            content["count"] = self.count
+            if not self.count_exact:
+                content["count_exact"] = False
+        content["next"] = self.get_next_link()
+        content["previous"] = self.get_previous_link()
+        content["results"] = data
+        return Response(content)
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema["required"] = ["results"]
+        schema["properties"]["count_exact"] = {"type": "boolean"}
+        return schema
@@ -1,5 +1,26 @@
 from rest_framework import permissions
-from .models import Contributor
+from .identity import is_member
+from .models import Issue, Comment
+
+
+def get_project_id(obj):
+    """
+    Retourne l'identifiant du projet auquel appartient l'objet
+    (projet, issue ou commentaire) sans requête supplémentaire.
+    """
+    if isinstance(obj, Comment):
+        return obj.issue.project_id
+    if isinstance(obj, Issue):
+        return obj.project_id
+    return obj.pk
+
+
+def is_contributor(request, project_id):
+    """
+    Vérifie que l'utilisateur de la requête contribue au projet (résultat
+    mémorisé pour la requête, voir softdeskApp/identity.py).
+    """
+    return is_member(request, project_id)
 
 
 class IsAuthorOrContributorOrReadOnly(permissions.BasePermission):
@@ -13,7 +34,7 @@ class IsAuthorOrContributorOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         # Autoriser les méthodes sécurisées (GET, HEAD, OPTIONS) pour les contributeurs
         if request.method in permissions.SAFE_METHODS:
-            return Contributor.objects.filter(user=request.user, project=obj).exists()
+            return is_contributor(request, get_project_id(obj))
 
         # Vérifier si l'utilisateur est l'auteur du projet pour les méthodes non sécurisées (POST, PUT, PATCH, DELETE)
-        return obj.author == request.user
+        return obj.author_id == request.user.pk
@@ -0,0 +1,290 @@
+"""
+Suppression logique et purge en arrière-plan.
+
+Supprimer un gros projet (ou un utilisateur très actif) avec l'ORM charge
+en mémoire tous les objets liés avant de les effacer, dans la requête HTTP.
+Ici :
+- la suppression est logique et immédiate (`deleted_at`, compte désactivé) ;
+- une `PurgeJob` efface ensuite les lignes par tranches bornées, chacune
+  dans sa propre transaction, avec des DELETE SQL par clé primaire ;
+- un utilisateur purgé est aussi retiré des archives des issues des autres
+  (commentaires, assignation), pour qu'aucune trace ne survive à la purge ;
+- la commande `purge_deleted` exécute les tâches en attente (cron, timer
+  systemd...) et peut reprendre une tâche interrompue.
+"""
+import time
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import sync
+from .models import (
+    ArchivedIssue,
+    Comment,
+    Contributor,
+    Issue,
+    Project,
+    PurgeJob,
+    Tombstone,
+    User,
+)
+from .renderers import FastJSONRenderer
+
+
+def delete_by_pk(model, ids):
+    """
+    DELETE SQL direct par clé primaire, sans collecte des objets liés par
+    l'ORM (les lignes dépendantes doivent déjà avoir été supprimées).
+    Retourne le nombre de lignes supprimées.
+    """
+    if not ids:
+        return 0
+    table = connection.ops.quote_name(model._meta.db_table)
+    pk = connection.ops.quote_name(model._meta.pk.column)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {table} WHERE {pk} IN ({', '.join(['%s'] * len(ids))})", ids
+        )
+        return cursor.rowcount
+
+
+def soft_delete_project(project):
+    """
+    Masque le projet (et donc ses issues et commentaires) et planifie sa purge.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        sync.record_deletion(project)
+        Project.objects.filter(pk=project.pk).update(deleted_at=now, updated_at=now)
+        job = PurgeJob.objects.create(kind=PurgeJob.PROJECT, object_id=str(project.pk))
+    return job
+
+
+def soft_delete_user(user):
+    """
+    Désactive le compte (JWT refusés), masque ses projets et planifie la purge.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        projects = list(Project.objects.alive().filter(author=user))
+        Tombstone.objects.bulk_create(
+            Tombstone(model=Tombstone.PROJECT, object_id=p.pk, project_id=p.pk)
+            for p in projects
+        )
+        Project.objects.filter(pk__in=[p.pk for p in projects]).update(
+            deleted_at=now, updated_at=now
+        )
+        User.objects.filter(pk=user.pk).update(is_active=False, deleted_at=now)
+        job = PurgeJob.objects.create(kind=PurgeJob.USER, object_id=str(user.pk))
+    return job
+
+
+class Purger:
+    """
+    Exécute une `PurgeJob` par tranches de `batch_size` lignes.
+    - `pause` : attente entre deux tranches (seconde), pour laisser la base
+      respirer en production.
+    - `progress(message)` reçoit l'avancement.
+    """
+
+    def __init__(self, batch_size=None, pause=0.0, progress=None):
+        self.batch_size = batch_size or getattr(settings, "PURGE_BATCH_SIZE", 500)
+        self.pause = pause
+        self.progress = progress or (lambda message: None)
+
+    def run(self, job):
+        try:
+            if job.kind == PurgeJob.PROJECT:
+                self.purge_project(job, int(job.object_id))
+            else:
+                self.purge_user(job, job.object_id)
+        except Exception as exc:
+            job.status = PurgeJob.FAILED
+            job.error = repr(exc)
+            job.attempts += 1
+            job.save(update_fields=["status", "error", "attempts", "updated_at"])
+            raise
+        job.status = PurgeJob.DONE
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "finished_at", "updated_at"])
+        self.progress(f"{job} : {job.progress}")
+
+    def purge_project(self, job, project_id):
+        # Les enfants d'abord : la suppression finale par l'ORM n'a plus rien à collecter
+        self.delete(job, Comment, Comment.objects.filter(issue__project_id=project_id))
+        self.delete(job, Issue, Issue.objects.filter(project_id=project_id))
+        self.delete(job, Contributor, Contributor.objects.filter(project_id=project_id))
+        self.delete(
+            job, ArchivedIssue, ArchivedIssue.objects.filter(project_id=project_id)
+        )
+        Project.objects.filter(pk=project_id).delete()
+
+    def purge_user(self, job, user_id):
+        for project_id in Project.objects.filter(author_id=user_id).values_list(
+            "pk", flat=True
+        ):
+            self.purge_project(job, project_id)
+        # Avant la suppression des contributeurs : ils désignent les archives à relire
+        self.scrub_archives(job, user_id)
+        # Commentaires des autres sur ses issues : retirés avec l'issue par les clients
+        self.delete(job, Comment, Comment.objects.filter(issue__author_id=user_id))
+        # Contenu laissé dans les projets des autres : tracé pour la synchronisation
+        self.delete(
+            job,
+            Comment,
+            Comment.objects.filter(author_id=user_id),
+            Tombstone.COMMENT,
+            "issue__project_id",
+        )
+        self.delete(
+            job, Issue, Issue.objects.filter(author_id=user_id), Tombstone.ISSUE, "project_id"
+        )
+        self.delete(
+            job,
+            ArchivedIssue,
+            ArchivedIssue.objects.filter(author_id=user_id),
+            Tombstone.ISSUE,
+            "project_id",
+        )
+        self.delete(
+            job,
+            Contributor,
+            Contributor.objects.filter(user_id=user_id),
+            Tombstone.CONTRIBUTOR,
+            "project_id",
+        )
+        self.unassign(job, user_id)
+        User.objects.filter(pk=user_id).delete()
+
+    def scrub_archives(self, job, user_id):
+        """
+        Retire l'utilisateur des archives des issues des autres : ses
+        commentaires, et l'assignation (comme `unassign`). Seules les archives
+        des projets dont il est contributeur sont relues, par tranches, chacune
+        réécrite dans sa propre transaction.
+        """
+        user_id = str(user_id)  # Identifiants sérialisés en texte dans les archives
+        archives = ArchivedIssue.objects.filter(
+            project_id__in=Contributor.objects.filter(user_id=user_id).values("project_id")
+        ).exclude(author_id=user_id).order_by("id")
+        renderer = FastJSONRenderer()
+        last = None
+        while True:
+            batch = archives if last is None else archives.filter(id__gt=last)
+            with transaction.atomic():
+                rows = list(batch.select_for_update()[: self.batch_size])
+                if not rows:
+                    return
+                scrubbed = 0
+                for archived in rows:
+                    content = archived.load()
+                    issue, comments = content["issue"], content["comments"]
+                    kept = [c for c in comments if str(c["author"]) != user_id]
+                    assigned = str(issue["assignee"]) == user_id
+                    if not assigned and len(kept) == len(comments):
+                        continue
+                    if assigned:
+                        issue["assignee"] = None
+                        issue.pop("assignee_username", None)
+                    content["comments"] = kept
+                    archived.payload = zlib.compress(renderer.render(content), 9)
+                    archived.comment_count = len(kept)
+                    archived.save(update_fields=["payload", "comment_count"])
+                    scrubbed += 1
+            last = rows[-1].pk
+            self.advance(job, "scrubbed_archives", scrubbed)
+
+    def delete(self, job, model, queryset, tombstone=None, project_lookup=None):
+        """
+        Supprime les lignes de `queryset` par tranches (DELETE SQL par clé
+        primaire), en traçant chaque ligne si `tombstone` est indiqué.
+        """
+        columns = ("pk", project_lookup) if tombstone else ("pk",)
+        queryset = queryset.order_by().values_list(*columns)
+        while True:
+            rows = list(queryset[: self.batch_size])
+            if not rows:
+                return
+            ids = [row[0] for row in rows]
+            with transaction.atomic():
+                if tombstone:
+                    Tombstone.objects.bulk_create(
+                        Tombstone(model=tombstone, object_id=pk_value, project_id=project_id)
+                        for pk_value, project_id in rows
+                    )
+                deleted = delete_by_pk(model, ids)
+            self.advance(job, model._meta.db_table, deleted)
+
+    def unassign(self, job, user_id):
+        """
+        Équivalent par tranches de `on_delete=SET_NULL` sur `Issue.assignee`.
+        """
+        queryset = Issue.objects.filter(assignee_id=user_id).order_by()
+        while True:
+            ids = list(queryset.values_list("pk", flat=True)[: self.batch_size])
+            if not ids:
+                return
+            updated = Issue.objects.filter(pk__in=ids).update(
+                assignee=None, updated_at=timezone.now(), version=F("version") + 1
+            )
+            self.advance(job, "unassigned_issues", updated)
+
+    def advance(self, job, label, count):
+        job.progress[label] = job.progress.get(label, 0) + count
+        job.save(update_fields=["progress", "updated_at"])
+        self.progress(f"{job} : {label} {job.progress[label]}")
+        if self.pause:
+            time.sleep(self.pause)
+
+
+def claim_next_job():
+    """
+    Réserve la prochaine tâche : en attente, en cours mais inactive depuis
+    `PURGE_STALE_SECONDS` (processus interrompu), ou en échec depuis
+    `PURGE_RETRY_SECONDS` avec moins de `PURGE_MAX_ATTEMPTS` échecs. Les
+    tranches déjà supprimées ne sont pas rejouées : la reprise est sans risque.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=getattr(settings, "PURGE_STALE_SECONDS", 600))
+    retry = now - timedelta(seconds=getattr(settings, "PURGE_RETRY_SECONDS", 300))
+    candidates = (
+        PurgeJob.objects.filter(status=PurgeJob.PENDING)
+        | PurgeJob.objects.filter(status=PurgeJob.RUNNING, updated_at__lt=stale)
+        | PurgeJob.objects.filter(
+            status=PurgeJob.FAILED,
+            updated_at__lt=retry,
+            attempts__lt=getattr(settings, "PURGE_MAX_ATTEMPTS", 5),
+        )
+    )
+    for job in candidates.order_by("created_at")[:10]:
+        # Mise à jour conditionnelle : un seul processus obtient la tâche
+        claimed = PurgeJob.objects.filter(
+            pk=job.pk, status=job.status, updated_at=job.updated_at
+        ).update(status=PurgeJob.RUNNING, updated_at=timezone.now())
+        if claimed:
+            job.refresh_from_db()
+            return job
+    return None
+
+
+def purge_expired_tombstones(batch_size=None):
+    """
+    Supprime les traces plus anciennes que `SYNC_TOMBSTONE_RETENTION_DAYS`
+    (les jetons de cet âge déclenchent de toute façon une synchronisation
+    complète). Retourne le nombre de traces supprimées.
+    """
+    batch_size = batch_size or getattr(settings, "PURGE_BATCH_SIZE", 500)
+    cutoff = timezone.now() - timedelta(
+        days=getattr(settings, "SYNC_TOMBSTONE_RETENTION_DAYS", 30)
+    )
+    expired = Tombstone.objects.filter(deleted_at__lt=cutoff).order_by()
+    total = 0
+    while True:
+        ids = list(expired.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return total
+        total += Tombstone.objects.filter(pk__in=ids).delete()[0]
@@ -0,0 +1,82 @@
+"""
+Champs de relation légers.
+
+`PrimaryKeyRelatedField` énumère tout son queryset pour proposer des choix :
+l'API navigable affiche une liste déroulante avec chaque utilisateur ou
+projet (tout la table à chaque formulaire), et la validation lit ensuite
+les objets un par un. `LightPrimaryKeyRelatedField` :
+- n'énumère jamais les choix (API navigable : simple champ texte, OPTIONS :
+  pas de liste) ;
+- valide les identifiants par une seule requête (`in_bulk`), y compris pour
+  une relation multiple (`many=True`).
+"""
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+TEXT_INPUT_STYLE = {"base_template": "input.html", "input_type": "text"}
+
+
+class LightPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    def __init__(self, **kwargs):
+        kwargs.setdefault("style", TEXT_INPUT_STYLE)
+        super().__init__(**kwargs)
+
+    def get_choices(self, cutoff=None):
+        return {}
+
+    def iter_options(self):
+        return iter(())
+
+    def to_internal_value(self, data):
+        return self.to_internal_values([data])[0]
+
+    def to_internal_values(self, values):
+        """
+        Objets désignés par `values`, dans le même ordre, en une seule requête.
+        """
+        queryset = self.get_queryset()
+        pk = queryset.model._meta.pk
+        pks = []
+        for value in values:
+            if self.pk_field is not None:
+                value = self.pk_field.to_internal_value(value)
+            if isinstance(value, (bool, dict, list)):
+                self.fail("incorrect_type", data_type=type(value).__name__)
+            try:
+                pks.append(pk.to_python(value))
+            except (DjangoValidationError, TypeError, ValueError):
+                self.fail("incorrect_type", data_type=type(value).__name__)
+        objects = queryset.in_bulk(pks)
+        for value in pks:
+            if value not in objects:
+                self.fail("does_not_exist", pk_value=value)
+        return [objects[value] for value in pks]
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return LightManyRelatedField(**list_kwargs)
+
+
+class LightManyRelatedField(serializers.ManyRelatedField):
+    def __init__(self, **kwargs):
+        kwargs.setdefault("style", TEXT_INPUT_STYLE)
+        super().__init__(**kwargs)
+
+    def get_choices(self, cutoff=None):
+        return {}
+
+    def iter_options(self):
+        return iter(())
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        data = list(data)
+        if not self.allow_empty and not data:
+            self.fail("empty")
+        return self.child_relation.to_internal_values(data)
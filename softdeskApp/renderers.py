@@ -0,0 +1,74 @@
+"""
+Rendu JSON rapide.
+- Utilise `orjson` s'il est installé (dépendance optionnelle), sinon le
+  module `json` de la bibliothèque standard via le `JSONRenderer` de DRF.
+- Sortie identique octet pour octet au `JSONRenderer` de DRF : JSON compact,
+  UTF-8, dates ISO 8601 en `Z`, UUID en chaîne, U+2028/U+2029 échappés.
+- `stream` produit une liste JSON par tranches, sans construire tout le corps
+  de la réponse en mémoire.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # Dépendance optionnelle
+    orjson = None
+
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+LINE_SEPARATOR = "\u2028".encode()
+PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    `JSONRenderer` utilisant orjson quand c'est possible.
+    - Les rendus indentés (API navigable, `; indent=4`) et les valeurs
+      qu'orjson ne sait pas encoder repassent par le rendu standard.
+    """
+
+    def __init__(self):
+        self.default = self.encoder_class().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if orjson is None or self.ensure_ascii or not self.compact or not self.strict:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return self.encode(data)
+        except (orjson.JSONEncodeError, ValueError):
+            return super().render(data, accepted_media_type, renderer_context)
+
+    def encode(self, data):
+        """
+        Encode une valeur en JSON compact (orjson, ou stdlib à défaut).
+        """
+        if orjson is None or self.ensure_ascii:
+            return super().render(data)
+        content = orjson.dumps(data, default=self.default, option=ORJSON_OPTIONS)
+        if LINE_SEPARATOR in content or PARAGRAPH_SEPARATOR in content:
+            content = content.replace(LINE_SEPARATOR, b"\\u2028").replace(
+                PARAGRAPH_SEPARATOR, b"\\u2029"
+            )
+        return content
+
+    def stream(self, chunks):
+        """
+        Génère une liste JSON à partir de tranches (listes) d'éléments.
+        La concaténation des morceaux est identique à `render(liste complète)`.
+        """
+        yield b"["
+        first = True
+        for chunk in chunks:
+            if not chunk:
+                continue
+            try:
+                body = self.encode(chunk)[1:-1]  # Sans les crochets
+            except (TypeError, ValueError):
+                body = super().render(chunk)[1:-1]
+            yield body if first else b"," + body
+            first = False
+        yield b"]"
@@ -0,0 +1,298 @@
+"""
+Générateur de jeux de données volumineux pour les tests de performance.
+- Déterministe : tout le contenu découle de la graine (`seed`).
+- Distributions asymétriques (loi de puissance) : quelques projets très
+  actifs, beaucoup de petits projets, quelques issues très commentées.
+- Insertion par `bulk_create` en tranches, une transaction par tranche.
+- Le mot de passe n'est haché qu'une fois et réutilisé pour tous les comptes.
+"""
+import random
+import time
+import uuid
+from bisect import bisect_right
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Project, Contributor, Issue, Comment, User
+
+DEFAULT_PASSWORD = "Seed-Passw0rd!"
+
+WORDS = (
+    "api", "bug", "build", "cache", "client", "crash", "deploy", "écran",
+    "erreur", "export", "formulaire", "import", "login", "mobile", "page",
+    "performance", "requête", "serveur", "session", "test", "token", "upload",
+)
+SENTENCES = (
+    "Le problème est reproductible sur la dernière version.",
+    "Je regarde ça aujourd'hui.",
+    "Corrigé dans la branche principale, à vérifier.",
+    "Impossible à reproduire de mon côté.",
+    "Ajout des logs pour mieux comprendre.",
+    "Même erreur sur Android et iOS.",
+    "La correction est en revue.",
+    "Peut-on prioriser ce ticket pour le prochain sprint ?",
+)
+
+
+def skewed_weights(rng, count, alpha=1.2):
+    """
+    Poids cumulés suivant une loi de Pareto (quelques éléments dominent).
+    """
+    return list(accumulate(rng.paretovariate(alpha) for _ in range(count)))
+
+
+def weighted_index(rng, cum_weights):
+    """
+    Tire un indice selon des poids cumulés en O(log n).
+    """
+    return bisect_right(cum_weights, rng.random() * cum_weights[-1])
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """
+    Désactive temporairement `auto_now` / `auto_now_add` pour insérer des dates
+    historiques réparties dans le passé.
+    """
+    saved = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+                saved.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+@contextmanager
+def fast_sqlite():
+    """
+    Sur SQLite, relâche la durabilité pendant le chargement (jeu de test jetable).
+    Sans effet dans une transaction déjà ouverte (tests).
+    """
+    if connection.vendor != "sqlite" or connection.in_atomic_block:
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA synchronous")
+        synchronous = cursor.fetchone()[0]
+        cursor.execute("PRAGMA journal_mode")
+        journal_mode = cursor.fetchone()[0]
+        cursor.execute("PRAGMA synchronous = OFF")
+        cursor.execute("PRAGMA journal_mode = MEMORY")
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA synchronous = {int(synchronous)}")
+            cursor.execute(f"PRAGMA journal_mode = {journal_mode}")
+
+
+class DatasetGenerator:
+    """
+    Génère utilisateurs, projets, contributeurs, issues et commentaires.
+    """
+
+    def __init__(
+        self,
+        seed=42,
+        batch_size=5000,
+        days=730,
+        prefix="seed",
+        password=DEFAULT_PASSWORD,
+        progress=None,
+    ):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.days = days
+        self.prefix = prefix
+        self.password = password
+        self.progress = progress or (lambda message: None)
+        self.now = timezone.now()
+
+    def timestamp(self, after=None):
+        """
+        Date aléatoire dans les `days` derniers jours (postérieure à `after`).
+        """
+        start = after or self.now - timedelta(days=self.days)
+        span = (self.now - start).total_seconds()
+        return start + timedelta(seconds=self.rng.random() * span)
+
+    def insert(self, label, model, objects, total, on_flush=None):
+        """
+        Insère les objets par tranches, une transaction par tranche.
+        - `on_flush(batch)` est appelé après chaque tranche (clés primaires
+          renseignées sur les moteurs qui les retournent).
+        """
+        started = time.perf_counter()
+        created = reported = 0
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                created += self.flush(model, batch, on_flush)
+                batch = []
+                if created % (self.batch_size * 20) == 0:
+                    self.report(label, created, total, started)
+                    reported = created
+        if batch:
+            created += self.flush(model, batch, on_flush)
+        # Dernière ligne, sauf si le dernier relevé périodique couvre déjà le total
+        if created != reported or not created:
+            self.report(label, created, total, started)
+        return created
+
+    def flush(self, model, batch, on_flush=None):
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+        if on_flush is not None:
+            on_flush(batch)
+        return len(batch)
+
+    def report(self, label, created, total, started):
+        elapsed = time.perf_counter() - started
+        rate = created / elapsed if elapsed else 0
+        self.progress(f"{label} : {created}/{total} ({rate:,.0f}/s)")
+
+    def run(self, users, projects, issues, comments, contributors=5):
+        """
+        Génère le jeu de données complet.
+        - `issues` et `comments` sont des totaux, répartis de façon asymétrique.
+        - `contributors` est la taille moyenne d'une équipe projet.
+        Retourne la liste des noms d'utilisateurs créés.
+        """
+        rng = self.rng
+        with fast_sqlite(), explicit_timestamps(User, Project, Contributor, Issue, Comment):
+            # 1. Utilisateurs (un seul hachage du mot de passe)
+            password = make_password(self.password)
+            user_ids = [uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(users)]
+            user_joined = [self.timestamp() for _ in range(users)]
+            usernames = [f"{self.prefix}{i}" for i in range(users)]
+            self.insert(
+                "Utilisateurs",
+                User,
+                (
+                    User(
+                        id=user_ids[i],
+                        username=usernames[i],
+                        password=password,
+                        age=rng.randint(15, 80),
+                        can_be_contacted=rng.random() < 0.3,
+                        can_data_be_shared=rng.random() < 0.2,
+                        created_at=user_joined[i],
+                        date_joined=user_joined[i],
+                    )
+                    for i in range(users)
+                ),
+                users,
+            )
+            user_activity = skewed_weights(rng, users)
+
+            # 2. Projets (auteurs très actifs surreprésentés)
+            types = [choice for choice, _ in Project.PROJECT_TYPES]
+            project_authors = [weighted_index(rng, user_activity) for _ in range(projects)]
+            project_created = [
+                self.timestamp(after=user_joined[a]) for a in project_authors
+            ]
+            project_list = [
+                Project(
+                    name=f"{self.prefix} projet {p}",
+                    description=f"Projet {' '.join(rng.sample(WORDS, 3))}",
+                    type=rng.choice(types),
+                    author_id=user_ids[project_authors[p]],
+                    created_at=project_created[p],
+                    updated_at=project_created[p],
+                )
+                for p in range(projects)
+            ]
+            self.insert("Projets", Project, project_list, projects)
+            project_ids = [project.pk for project in project_list]
+
+            # 3. Contributeurs : tailles d'équipe asymétriques, auteur inclus
+            members = []
+            total_members = 0
+            for p in range(projects):
+                size = min(users, max(1, round(contributors * rng.paretovariate(2.0) / 2)))
+                team = {project_authors[p]}
+                attempts = 0
+                while len(team) < size and attempts < size * 4:
+                    team.add(weighted_index(rng, user_activity))
+                    attempts += 1
+                members.append(sorted(team))
+                total_members += len(team)
+            self.insert(
+                "Contributeurs",
+                Contributor,
+                (
+                    Contributor(
+                        user_id=user_ids[u],
+                        project_id=project_ids[p],
+                        role=Contributor.AUTHOR if u == project_authors[p] else Contributor.CONTRIBUTOR,
+                        created_at=project_created[p],
+                        updated_at=project_created[p],
+                    )
+                    for p in range(projects)
+                    for u in members[p]
+                ),
+                total_members,
+            )
+
+            # 4. Issues : réparties selon l'activité des projets
+            project_activity = skewed_weights(rng, projects)
+            issue_projects = [weighted_index(rng, project_activity) for _ in range(issues)]
+            issue_created = []
+            statuses = [Issue.TODO, Issue.IN_PROGRESS, Issue.FINISHED]
+            priorities = [Issue.LOW, Issue.MEDIUM, Issue.HIGH]
+            tags = [Issue.BUG, Issue.FEATURE, Issue.TASK]
+
+            def issue_objects():
+                for i, p in enumerate(issue_projects):
+                    team = members[p]
+                    created_at = self.timestamp(after=project_created[p])
+                    issue_created.append(created_at)
+                    yield Issue(
+                        title=f"{rng.choice(WORDS).capitalize()} : {' '.join(rng.sample(WORDS, 4))}",
+                        description=" ".join(rng.choices(SENTENCES, k=rng.randint(1, 6))),
+                        priority=rng.choice(priorities),
+                        tag=rng.choice(tags),
+                        status=rng.choices(statuses, (2, 1, 4))[0],
+                        assignee_id=user_ids[rng.choice(team)] if rng.random() < 0.7 else None,
+                        project_id=project_ids[p],
+                        author_id=user_ids[rng.choice(team)],
+                        created_at=created_at,
+                        updated_at=created_at,
+                    )
+
+            issue_ids = []
+
+            def keep_pk(batch):
+                issue_ids.extend(obj.pk for obj in batch)
+
+            self.insert("Issues", Issue, issue_objects(), issues, on_flush=keep_pk)
+
+            # 5. Commentaires : quelques issues concentrent les discussions
+            if issue_ids and comments:
+                issue_activity = skewed_weights(rng, len(issue_ids), alpha=1.5)
+
+                def comment_objects():
+                    for _ in range(comments):
+                        i = weighted_index(rng, issue_activity)
+                        comment = Comment(
+                            content=rng.choice(SENTENCES),
+                            issue_id=issue_ids[i],
+                            author_id=user_ids[rng.choice(members[issue_projects[i]])],
+                            created_at=self.timestamp(after=issue_created[i]),
+                        )
+                        comment.updated_at = comment.created_at
+                        yield comment
+
+                self.insert("Commentaires", Comment, comment_objects(), comments)
+        return usernames
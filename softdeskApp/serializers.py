@@ -1,8 +1,37 @@
 from django.contrib.auth.password_validation import validate_password
+from django.contrib.auth.validators import UnicodeUsernameValidator
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from .identity import identity_map, is_member, load_issue, load_project
 from .models import Project, Contributor, Issue, Comment, User
+from .relations import LightPrimaryKeyRelatedField
+
+
+class TextPreviewMixin:
+    """
+    Aperçu des champs texte longs dans les listes.
+    - Quand le contexte désigne le modèle du sérialiseur (`text_preview`,
+      voir `FastListMixin`), chaque champ de `preview_fields` est remplacé,
+      à la même place, par `<champ>_preview` (début du texte) et
+      `<champ>_truncated`, annotés en SQL sur le queryset de la liste.
+    - Les objets imbriqués (`?include=`) gardent leur texte complet.
+    """
+
+    preview_fields = ()
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.context.get("text_preview") is not self.Meta.model:
+            return fields
+        previewed = {}
+        for name, field in fields.items():
+            if name in self.preview_fields:
+                previewed[f"{name}_preview"] = serializers.CharField(read_only=True)
+                previewed[f"{name}_truncated"] = serializers.BooleanField(read_only=True)
+            else:
+                previewed[name] = field
+        return previewed
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -26,6 +55,8 @@ class UserSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             "password": {"write_only": True},  # Le mot de passe ne sera pas retourné
             "created_at": {"read_only": True},  # Empêche la modification
+            # Unicité vérifiée une seule fois, par validate_username
+            "username": {"validators": [UnicodeUsernameValidator()]},
         }
 
     def validate_username(self, value):
@@ -86,8 +117,9 @@ class ContributorSerializer(serializers.ModelSerializer):
     - Vérifie que l'utilisateur n'est pas déjà un contributeur du projet.
     """
 
-    user = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
-    project = serializers.PrimaryKeyRelatedField(queryset=Project.objects.all())
+    # Identifiants validés en une requête, sans énumérer les tables (voir relations.py)
+    user = LightPrimaryKeyRelatedField(queryset=User.objects.all())
+    project = LightPrimaryKeyRelatedField(queryset=Project.objects.all())
 
     class Meta:
         model = Contributor
@@ -116,7 +148,7 @@ class ContributorSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(TextPreviewMixin, serializers.ModelSerializer):
     """
     Sérialiseur pour le modèle Project.
     - Gère la création, la mise à jour et la validation des projets.
@@ -130,6 +162,9 @@ class ProjectSerializer(serializers.ModelSerializer):
         source="contributor_set", many=True, read_only=True
     )  # Utiliser le related_name
 
+    serializer_related_field = LightPrimaryKeyRelatedField
+    preview_fields = ("description",)  # Aperçu dans les listes
+
     class Meta:
         model = Project
         fields = [
@@ -140,8 +175,9 @@ class ProjectSerializer(serializers.ModelSerializer):
             "author",
             "contributors",
             "created_at",
+            "version",
         ]
-        read_only_fields = ["author", "created_at", "contributors"]
+        read_only_fields = ["author", "created_at", "contributors", "version"]
 
     def validate_name(self, value):
         """
@@ -182,15 +218,14 @@ class ProjectSerializer(serializers.ModelSerializer):
         # Créer le projet
         project = Project.objects.create(**validated_data)
 
-        # Ajouter l'auteur comme contributeur (s'il n'existe pas déjà)
-        Contributor.objects.get_or_create(
-            user=user, project=project, defaults={"role": Contributor.AUTHOR}
-        )
+        # Ajouter l'auteur comme contributeur (le projet vient d'être créé)
+        Contributor.objects.create(user=user, project=project, role=Contributor.AUTHOR)
+        identity_map(self.context["request"]).memberships[(project.pk, user.pk)] = True
 
         return project
 
 
-class IssueSerializer(serializers.ModelSerializer):
+class IssueSerializer(TextPreviewMixin, serializers.ModelSerializer):
     """
     Sérialiseur pour le modèle Issue.
     - Gère la création, la mise à jour et la validation des issues.
@@ -206,6 +241,9 @@ class IssueSerializer(serializers.ModelSerializer):
     project_name = serializers.CharField(source="project.name", read_only=True)
     author_username = serializers.CharField(source="author.username", read_only=True)
 
+    serializer_related_field = LightPrimaryKeyRelatedField
+    preview_fields = ("description",)  # Aperçu dans les listes
+
     class Meta:
         model = Issue
         fields = [
@@ -222,6 +260,7 @@ class IssueSerializer(serializers.ModelSerializer):
             "author",
             "author_username",
             "created_at",
+            "version",
         ]
         read_only_fields = [
             "author",
@@ -229,6 +268,7 @@ class IssueSerializer(serializers.ModelSerializer):
             "assignee_username",
             "project_name",
             "author_username",
+            "version",
         ]
 
     def validate_assignee(self, value):
@@ -237,10 +277,8 @@ class IssueSerializer(serializers.ModelSerializer):
         """
         if value:
             project = self.context.get("project")
-            if (
-                project
-                and not Contributor.objects.filter(user=value, project=project).exists()
-            ):
+            project_id = project.pk if project else getattr(self.instance, "project_id", None)
+            if project_id and not is_member(self.context["request"], project_id, value.pk):
                 raise serializers.ValidationError(
                     "L'assignee doit être un contributeur du projet."
                 )
@@ -250,13 +288,13 @@ class IssueSerializer(serializers.ModelSerializer):
         """
         Valide que le projet existe.
         """
-        if not Project.objects.filter(id=value.id).exists():
+        if load_project(self.context["request"], value.id) is None:
             raise serializers.ValidationError("Le projet spécifié n'existe pas.")
         return value
 
 
 # Serializer pour le modèle Comment
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TextPreviewMixin, serializers.ModelSerializer):
     """
     Sérialiseur pour le modèle Comment.
     - Gère la création, la mise à jour et la validation des commentaires.
@@ -266,6 +304,9 @@ class CommentSerializer(serializers.ModelSerializer):
     author_username = serializers.CharField(source="author.username", read_only=True)
     issue_title = serializers.CharField(source="issue.title", read_only=True)
 
+    serializer_related_field = LightPrimaryKeyRelatedField
+    preview_fields = ("content",)  # Aperçu dans les listes
+
     class Meta:
         model = Comment
         fields = [
@@ -289,14 +330,13 @@ class CommentSerializer(serializers.ModelSerializer):
         """
         Valide que l'issue existe et que l'utilisateur est un contributeur du projet.
         """
-        if not Issue.objects.filter(id=value.id).exists():
+        request = self.context["request"]
+        issue = load_issue(request, value.id)
+        if issue is None:
             raise serializers.ValidationError("L'issue spécifiée n'existe pas.")
 
         # Vérifier que l'utilisateur est un contributeur du projet associé à l'issue
-        project = value.project
-        if not Contributor.objects.filter(
-            user=self.context["request"].user, project=project
-        ).exists():
+        if not is_member(request, issue.project_id):
             raise serializers.ValidationError(
                 "Vous n'êtes pas un contributeur du projet associé à cette issue."
             )
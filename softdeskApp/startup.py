@@ -0,0 +1,114 @@
+"""
+Préchauffage d'un worker avant qu'il ne reçoive du trafic.
+
+Django et DRF préparent beaucoup de choses à la première requête : import
+des vues et compilation des expressions régulières des routes, construction
+des champs des sérialiseurs (et des caches `_meta` des modèles), chargement
+des validateurs de mot de passe, des hacheurs et du backend JWT, connexion à
+la base. Sans préchauffage, la première requête de chaque worker paie tout
+cela. `warm_up()` exécute ces étapes au démarrage (voir
+SoftDeskSupport/wsgi.py, `WARMUP_ON_STARTUP`) et retourne leur durée.
+
+La commande `profile_startup` mesure l'effet : imports par module, durée du
+démarrage et de la première requête, avec et sans préchauffage.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.contrib.auth import password_validation
+from django.contrib.auth.hashers import get_hashers
+from django.db import connections
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.state import token_backend
+
+logger = logging.getLogger("softdeskApp.startup")
+
+
+def walk_patterns(resolver):
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            yield from walk_patterns(pattern)
+        elif isinstance(pattern, URLPattern):
+            yield pattern
+
+
+def compile_urls():
+    """
+    Importe les URLconf (et donc les vues) et compile l'expression de chaque route.
+    """
+    resolver = get_resolver()
+    for pattern in walk_patterns(resolver):
+        pattern.pattern.regex
+    resolver.reverse_dict  # Index utilisé par reverse()
+
+
+def build_serializers():
+    """
+    Construit les champs des sérialiseurs de chaque vue routée.
+    """
+    classes = set()
+    for pattern in walk_patterns(get_resolver()):
+        view = getattr(pattern.callback, "cls", None)
+        for name in ("serializer_class", "fast_serializer_class"):
+            if getattr(view, name, None) is not None:
+                classes.add(getattr(view, name))
+    for serializer_class in classes:
+        serializer = serializer_class()
+        getattr(serializer, "fields", None)
+
+
+def load_authentication():
+    """
+    Charge les validateurs de mot de passe, les hacheurs et le backend JWT.
+    """
+    password_validation.get_default_password_validators()
+    get_hashers()
+    try:
+        token_backend.decode("warm.up.token")
+    except TokenBackendError:
+        pass
+
+
+def connect_databases():
+    """
+    Ouvre une connexion par base puis la referme aussitôt, même avec des
+    connexions persistantes (`CONN_MAX_AGE`) : restent l'import du pilote et
+    la détection des fonctionnalités, et aucune connexion n'est partagée
+    avec des processus créés ensuite (`gunicorn --preload`). Chaque worker
+    se reconnecte à sa première requête.
+    """
+    for connection in connections.all():
+        connection.ensure_connection()
+        if not connection.in_atomic_block:
+            connection.close()
+
+
+STEPS = {
+    "urls": compile_urls,
+    "serializers": build_serializers,
+    "authentication": load_authentication,
+    "databases": connect_databases,
+}
+
+
+def warm_up():
+    """
+    Exécute les étapes de préchauffage et retourne leur durée (secondes).
+    """
+    timings = {}
+    for name, step in STEPS.items():
+        start = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - start
+    logger.info(
+        "Préchauffage : %s",
+        ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in timings.items()),
+    )
+    return timings
+
+
+def warm_up_on_startup():
+    if getattr(settings, "WARMUP_ON_STARTUP", True):
+        warm_up()
@@ -0,0 +1,153 @@
+"""
+Synchronisation différentielle d'un projet (clients hors ligne).
+
+`GET /api/projects/<id>/sync?token=...` renvoie ce qui a changé dans le
+projet depuis le jeton : objets créés, modifiés (`updated_at`) et supprimés
+(`Tombstone`), puis un nouveau jeton. Sans jeton, ou avec un jeton plus
+ancien que la rétention des traces, tout le projet est renvoyé (`reset`).
+- Le jeton est signé (`django.core.signing`) et lié à un projet.
+- Il est daté de `SYNC_OVERLAP_SECONDS` avant la requête : une transaction
+  encore en cours à ce moment-là n'est pas perdue, au prix de quelques
+  objets renvoyés deux fois (à appliquer comme des mises à jour).
+"""
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .fast_serializers import (
+    FastCommentSerializer,
+    FastContributorSerializer,
+    FastIssueSerializer,
+)
+from .models import Comment, Contributor, Issue, Project, Tombstone
+
+TOKEN_SALT = "softdeskApp.sync"
+SECTIONS = ("projects", "contributors", "issues", "comments")
+SECTION_BY_MODEL = {
+    Tombstone.PROJECT: "projects",
+    Tombstone.CONTRIBUTOR: "contributors",
+    Tombstone.ISSUE: "issues",
+    Tombstone.COMMENT: "comments",
+}
+
+
+def make_token(project_id, since):
+    return signing.dumps({"p": project_id, "t": since.isoformat()}, salt=TOKEN_SALT)
+
+
+def read_token(token, project_id):
+    """
+    Retourne la date du jeton, ou None pour une synchronisation complète
+    (pas de jeton, ou jeton antérieur à la rétention des traces).
+    """
+    if not token:
+        return None
+    try:
+        payload = signing.loads(token, salt=TOKEN_SALT)
+        since = datetime.fromisoformat(payload["t"])
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        raise ValidationError({"token": "Jeton de synchronisation invalide."})
+    if payload.get("p") != project_id:
+        raise ValidationError({"token": "Ce jeton concerne un autre projet."})
+    retention = timedelta(days=getattr(settings, "SYNC_TOMBSTONE_RETENTION_DAYS", 30))
+    if since < timezone.now() - retention:
+        return None
+    return since
+
+
+def next_token(project_id):
+    overlap = timedelta(seconds=getattr(settings, "SYNC_OVERLAP_SECONDS", 5))
+    return make_token(project_id, timezone.now() - overlap)
+
+
+def empty_changes():
+    return {section: {"created": [], "updated": [], "deleted": []} for section in SECTIONS}
+
+
+def split_rows(serializer, queryset, since, section):
+    """
+    Répartit les lignes modifiées entre `created` et `updated` selon `created_at`.
+    """
+    if since is not None:
+        queryset = queryset.filter(updated_at__gt=since)
+    rows = queryset.order_by("id").values_list(*serializer.lookups, "created_at")
+    for row in rows:
+        kind = "created" if since is None or row[-1] > since else "updated"
+        section[kind].append(serializer.to_representation(row))
+
+
+def project_changes(project, project_data, token):
+    """
+    Changements d'un projet depuis `token`. `project_data` est la
+    représentation du projet (`ProjectSerializer`).
+    """
+    token_value = next_token(project.pk)  # Daté avant les lectures
+    since = read_token(token, project.pk)
+    changes = empty_changes()
+
+    if since is None or project.updated_at > since:
+        kind = "created" if since is None or project.created_at > since else "updated"
+        changes["projects"][kind].append(project_data)
+    split_rows(
+        FastContributorSerializer(),
+        Contributor.objects.filter(project=project),
+        since,
+        changes["contributors"],
+    )
+    split_rows(
+        FastIssueSerializer(),
+        Issue.objects.filter(project=project),
+        since,
+        changes["issues"],
+    )
+    split_rows(
+        FastCommentSerializer(),
+        Comment.objects.filter(issue__project=project),
+        since,
+        changes["comments"],
+    )
+    if since is not None:
+        tombstones = Tombstone.objects.filter(
+            project_id=project.pk, deleted_at__gt=since
+        ).order_by("id")
+        for model, object_id in tombstones.values_list("model", "object_id"):
+            changes[SECTION_BY_MODEL[model]]["deleted"].append(object_id)
+    return {"token": token_value, "reset": since is None, **changes}
+
+
+def deleted_project_changes(project_id, token):
+    """
+    Réponse pour un projet supprimé depuis `token`, ou None s'il n'existe pas
+    de trace (projet inconnu ou jamais synchronisé).
+    """
+    since = read_token(token, project_id)
+    if since is None:
+        return None
+    deleted = Tombstone.objects.filter(
+        model=Tombstone.PROJECT, object_id=project_id, deleted_at__gt=since
+    ).exists()
+    if not deleted:
+        return None
+    changes = empty_changes()
+    changes["projects"]["deleted"].append(project_id)
+    return {"token": None, "reset": False, **changes}
+
+
+def record_deletion(instance):
+    """
+    Enregistre la trace de suppression d'un projet, contributeur, issue ou
+    commentaire (à appeler juste avant `instance.delete()`).
+    """
+    if isinstance(instance, Project):
+        model, project_id = Tombstone.PROJECT, instance.pk
+    elif isinstance(instance, Contributor):
+        model, project_id = Tombstone.CONTRIBUTOR, instance.project_id
+    elif isinstance(instance, Issue):
+        model, project_id = Tombstone.ISSUE, instance.project_id
+    else:
+        model, project_id = Tombstone.COMMENT, instance.issue.project_id
+    Tombstone.objects.create(model=model, object_id=instance.pk, project_id=project_id)
+
@@ -1,3 +1,1830 @@
-from django.test import TestCase
+import gzip
+import io
+import os
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.hashers import make_password
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection, models, router, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import db_routers, metrics
+from .compression import GzipCodec, negotiate, parse_accept_encoding
+from .concurrency import save_if_unchanged
+from .management.commands.profile_startup import parse_imports
+from .middleware import CompressionMiddleware, ReplicaRoutingMiddleware, client_identity
+from .archive import Archiver
+from .authentication import token_cache, token_key
+from .idempotency import purge_expired_keys
+from .models import (
+    ArchivedIssue,
+    Comment,
+    Contributor,
+    IdempotencyKey,
+    Issue,
+    Project,
+    PurgeJob,
+    Tombstone,
+    User,
+)
+from .pagination import count_cache
+from .purge import Purger, claim_next_job
+from .relations import LightPrimaryKeyRelatedField
+from .renderers import FastJSONRenderer
+from .seeding import DatasetGenerator
+from .startup import STEPS, connect_databases, warm_up
+from .sync import make_token
+from .throttling import CacheBucketStore, LocalBucketStore, local_store, queue_time
+from .views import ContributorViewSet
+
+PASSWORD = "Sup3r-Secret!"
+
+# Limitation de débit désactivée, sauf pour les tests qui la concernent : les
+# clients de test partagent une adresse IP, donc un même seau `anon`
+_throttle_off = override_settings(THROTTLE_ENABLED=False)
+
+
+def setUpModule():
+    _throttle_off.enable()
+
+
+def tearDownModule():
+    _throttle_off.disable()
+
+
+def build_fixtures(projects, contributors, issues, comments):
+    """
+    Crée un jeu de données réaliste et retourne l'utilisateur principal.
+    - `projects` projets écrits par l'utilisateur principal.
+    - `contributors` contributeurs supplémentaires par projet.
+    - `issues` issues par projet, `comments` commentaires par issue.
+    """
+    password = make_password(PASSWORD)  # Hachage unique, réutilisé
+    owner = User.objects.create(username="owner", password=password, age=30)
+    members = User.objects.bulk_create(
+        User(username=f"member{i}", password=password, age=20 + i % 40)
+        for i in range(contributors)
+    )
+    project_list = Project.objects.bulk_create(
+        Project(
+            name=f"Projet {p}",
+            description=f"Description du projet {p}",
+            type=Project.BACKEND,
+            author=owner,
+        )
+        for p in range(projects)
+    )
+    Contributor.objects.bulk_create(
+        [Contributor(user=owner, project=p, role=Contributor.AUTHOR) for p in project_list]
+        + [Contributor(user=m, project=p) for p in project_list for m in members]
+    )
+    issue_list = Issue.objects.bulk_create(
+        Issue(
+            title=f"Issue {p.pk}-{i}",
+            description="Description de l'issue",
+            project=p,
+            author=owner,
+            assignee=members[i % len(members)] if members and i % 2 else None,
+        )
+        for p in project_list
+        for i in range(issues)
+    )
+    Comment.objects.bulk_create(
+        Comment(content=f"Commentaire {c}", issue=issue, author=members[c % len(members)])
+        for issue in issue_list
+        for c in range(comments)
+    )
+    return owner
+
+
+@override_settings(REPLICA_DATABASES=["replica"], REPLICA_STICKY_SECONDS=10)
+class ReplicaRoutingTests(TestCase):
+    """
+    Routage des lectures vers le réplica et lecture de ses propres écritures.
+    Les décisions du routeur sont relevées sans ouvrir de connexion au réplica.
+    """
+
+    def setUp(self):
+        replica = mock.patch.dict(
+            settings.DATABASES, {"replica": {"ENGINE": "django.db.backends.sqlite3"}}
+        )
+        replica.start()
+        self.addCleanup(replica.stop)
+        caches["default"].clear()
+        self.factory = RequestFactory(HTTP_AUTHORIZATION="Bearer client")
+
+    def route(self, request, write=False):
+        decisions = {}
+
+        def view(request):
+            decisions["read"] = router.db_for_read(Issue)
+            if write:
+                decisions["write"] = router.db_for_write(Issue)
+                decisions["read_after_write"] = router.db_for_read(Issue)
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(view)(request)
+        return decisions
+
+    def test_safe_requests_read_from_replica(self):
+        self.assertEqual(self.route(self.factory.get("/api/projects")), {"read": "replica"})
+        self.assertEqual(router.db_for_read(Issue), "default")  # Hors requête
+
+    def test_writes_go_to_primary_and_pin_the_client(self):
+        decisions = self.route(self.factory.post("/api/projects"), write=True)
+        self.assertEqual(
+            decisions, {"read": "default", "write": "default", "read_after_write": "default"}
+        )
+        # Requête suivante du même client : relue sur le primaire
+        self.assertEqual(self.route(self.factory.get("/api/projects")), {"read": "default"})
+        other = RequestFactory(HTTP_AUTHORIZATION="Bearer other").get("/api/projects")
+        self.assertEqual(self.route(other), {"read": "replica"})
+
+    def test_write_during_safe_request_pins_rest_of_request(self):
+        decisions = self.route(self.factory.get("/api/projects"), write=True)
+        self.assertEqual(decisions["read_after_write"], "default")
+        self.assertEqual(self.route(self.factory.get("/api/projects")), {"read": "default"})
+
+    @override_settings(
+        REPLICA_CACHE_ALIAS="shared",
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "shared": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "replica-pins",
+            },
+        },
+    )
+    def test_pin_stored_in_configured_cache(self):
+        request = self.factory.post("/api/projects")
+        self.route(request, write=True)
+        key = db_routers.pin_key(client_identity(request))
+        self.assertTrue(caches["shared"].get(key))
+        self.assertIsNone(caches["default"].get(key))
+
+
+class MetricsTests(TestCase):
+    """
+    Mesures par vue de `MetricsMiddleware` et export Prometheus sur `/api/metrics`.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = build_fixtures(projects=2, contributors=1, issues=1, comments=0)
+
+    def setUp(self):
+        metrics.reset_metrics()
+        self.addCleanup(metrics.reset_metrics)
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def series(self, metric):
+        return {labels: rest for labels, *rest in metric.samples()}
+
+    def test_histogram_buckets(self):
+        histogram = metrics.Histogram("h", "doc", (1, 5), ("view",))
+        for value in (0, 1, 3, 7):
+            histogram.observe(value, "v")
+        self.assertEqual(list(histogram.samples()), [(("v",), [2, 3, 4], 4, 11)])
+
+    def test_request_recorded_with_query_count(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get("/api/projects")
+        labels = ("project-list", "GET")
+        _, total, queries = self.series(metrics.DB_QUERIES)[labels]
+        self.assertEqual((total, queries), (1, len(context)))
+        self.assertEqual(self.series(metrics.REQUEST_LATENCY)[labels][1], 1)
+        self.assertEqual(
+            dict(metrics.REQUESTS.samples()), {("project-list", "GET", "200"): 1}
+        )
+
+    @override_settings(METRICS_QUERY_BUDGET=0, METRICS_LATENCY_BUDGET_MS=0)
+    def test_budget_alerts(self):
+        with self.assertLogs("softdeskApp.metrics", "WARNING") as logs:
+            self.client.get("/api/projects")
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(
+            dict(metrics.OVER_BUDGET.samples()),
+            {("project-list", "latency"): 1, ("project-list", "queries"): 1},
+        )
+
+    @override_settings(METRICS_RESPONSE_HEADERS=True)
+    def test_response_headers(self):
+        response = self.client.get("/api/projects")
+        self.assertTrue(int(response["X-Query-Count"]) > 0)
+        self.assertIn("total;dur=", response["Server-Timing"])
+
+    def test_prometheus_output(self):
+        self.client.get("/api/projects")
+        response = self.client.get("/api/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode()
+        self.assertIn("# TYPE softdesk_db_queries histogram", body)
+        self.assertIn(
+            'softdesk_requests_total{view="project-list",method="GET",status="200"} 1',
+            body,
+        )
+        self.assertIn(
+            'softdesk_request_duration_seconds_count{view="project-list",method="GET"} 1',
+            body,
+        )
+        self.assertIn(
+            'softdesk_request_duration_seconds_bucket{view="project-list",method="GET",'
+            'le="+Inf"} 1',
+            body,
+        )
+
+    def test_ip_allowlist(self):
+        response = self.client.get("/api/metrics", REMOTE_ADDR="203.0.113.7")
+        self.assertEqual(response.status_code, 403)
+        with override_settings(METRICS_ALLOWED_IPS=None):
+            response = self.client.get("/api/metrics", REMOTE_ADDR="203.0.113.7")
+        self.assertEqual(response.status_code, 200)
+
+
+class QueryBudgetMixin:
+    """
+    Assertions sur le nombre de requêtes SQL, affichant le SQL fautif en cas d'échec.
+    """
+
+    @contextmanager
+    def assertQueryBudget(self, budget):
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        if len(context) > budget:
+            queries = "\n".join(
+                f"  {number}. {query['sql']}"
+                for number, query in enumerate(context.captured_queries, start=1)
+            )
+            self.fail(
+                f"{len(context)} requêtes SQL exécutées, budget de {budget} :\n{queries}"
+            )
+
+
+class EndpointQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """
+    Budget de requêtes SQL fixe pour chaque route, quel que soit le volume.
+    Les sous-classes font varier la taille du jeu de données : un N+1 fait
+    échouer la plus grande.
+    """
+
+    PROJECTS = 2
+    CONTRIBUTORS = 2
+    ISSUES = 2
+    COMMENTS = 2
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = build_fixtures(
+            cls.PROJECTS, cls.CONTRIBUTORS, cls.ISSUES, cls.COMMENTS
+        )
+        cls.project = Project.objects.filter(author=cls.owner).first()
+        cls.issue = Issue.objects.filter(project=cls.project).first()
+        cls.comment = Comment.objects.filter(issue=cls.issue).first()
+        cls.member = User.objects.exclude(pk=cls.owner.pk).first()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.owner)}"
+        )
+
+    def get(self, url, budget):
+        with self.assertQueryBudget(budget):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def post(self, url, data, budget):
+        with self.assertQueryBudget(budget):
+            response = self.client.post(url, data, format="json")
+        self.assertIn(response.status_code, (200, 201), response.content)
+        return response
+
+    # Authentification et utilisateurs
+    def test_register(self):
+        self.client.credentials()
+        self.post(
+            "/api/register/",
+            {"username": "nouveau", "password": PASSWORD, "age": 25},
+            budget=3,
+        )
+
+    def test_token_obtain(self):
+        self.client.credentials()
+        self.post("/api/token/", {"username": "owner", "password": PASSWORD}, budget=1)
+
+    def test_user_list(self):
+        self.get("/api/users", budget=2)
+
+    def test_user_retrieve(self):
+        self.get(f"/api/users/{self.member.pk}", budget=2)
+
+    # Projets
+    def test_project_list(self):
+        response = self.get("/api/projects", budget=3)
+        self.assertEqual(len(response.json()), self.PROJECTS)
+
+    def test_project_retrieve(self):
+        self.get(f"/api/projects/{self.project.pk}", budget=4)
+
+    def test_project_contributors(self):
+        response = self.get(f"/api/projects/{self.project.pk}/contributors", budget=4)
+        self.assertEqual(len(response.json()), self.CONTRIBUTORS + 1)
+
+    def test_project_create(self):
+        self.post(
+            "/api/projects",
+            {"name": "Nouveau projet", "description": "Description", "type": "ios"},
+            budget=5,
+        )
+
+    # Issues
+    def test_issue_list(self):
+        self.get(f"/api/projects/{self.project.pk}/issues", budget=2)
+
+    def test_issue_retrieve(self):
+        self.get(f"/api/projects/{self.project.pk}/issues/{self.issue.pk}", budget=3)
+
+    def test_issue_retrieve_with_comments_and_project(self):
+        response = self.get(
+            f"/api/projects/{self.project.pk}/issues/{self.issue.pk}"
+            "?include=comments,project",
+            budget=6,
+        )
+        self.assertEqual(len(response.json()["comments"]), self.COMMENTS)
+
+    def test_issue_list_with_comments(self):
+        self.get(f"/api/projects/{self.project.pk}/issues?include=comments", budget=3)
+
+    def test_project_retrieve_with_issues_and_comments(self):
+        self.get(f"/api/projects/{self.project.pk}?include=issues.comments", budget=6)
+
+    def test_issue_create(self):
+        self.post(
+            f"/api/projects/{self.project.pk}/issues",
+            {"title": "Nouvelle issue", "assignee": str(self.member.pk)},
+            budget=5,
+        )
+
+    # Commentaires
+    def test_comment_list(self):
+        self.get(f"/api/issues/{self.issue.pk}/comments", budget=2)
+
+    def test_comment_retrieve(self):
+        self.get(f"/api/issues/{self.issue.pk}/comments/{self.comment.pk}", budget=3)
+
+    def test_comment_create(self):
+        self.post(
+            f"/api/issues/{self.issue.pk}/comments",
+            {"content": "Nouveau commentaire"},
+            budget=4,
+        )
+
+
+class LargeDatasetQueryBudgetTests(EndpointQueryBudgetTests):
+    """
+    Mêmes budgets sur un jeu de données dix fois plus grand.
+    """
+
+    PROJECTS = 20
+    CONTRIBUTORS = 10
+    ISSUES = 20
+    COMMENTS = 5
+
+
+class DatasetGeneratorTests(TestCase):
+    """
+    Générateur de jeux de données de `seed_softdesk`.
+    """
+
+    def test_generates_requested_volumes(self):
+        usernames = DatasetGenerator(seed=1, batch_size=100).run(
+            users=30, projects=10, issues=200, comments=1000, contributors=4
+        )
+        self.assertEqual(len(usernames), 30)
+        self.assertEqual(User.objects.count(), 30)
+        self.assertEqual(Project.objects.count(), 10)
+        self.assertEqual(Issue.objects.count(), 200)
+        self.assertEqual(Comment.objects.count(), 1000)
+        # Chaque projet a son auteur comme contributeur
+        self.assertEqual(
+            Contributor.objects.filter(role=Contributor.AUTHOR).count(), 10
+        )
+
+    def test_comment_authors_are_project_members(self):
+        DatasetGenerator(seed=2, batch_size=100).run(
+            users=20, projects=5, issues=50, comments=300
+        )
+        outsiders = Comment.objects.exclude(
+            author__contributor__project=models.F("issue__project")
+        )
+        self.assertFalse(outsiders.exists())
+
+    def test_same_seed_same_content(self):
+        def snapshot():
+            with transaction.atomic():
+                DatasetGenerator(seed=3).run(users=10, projects=4, issues=30, comments=60)
+                issues = list(Issue.objects.values_list("title", "status", "assignee_id"))
+                transaction.set_rollback(True)
+            return issues
+
+        self.assertEqual(snapshot(), snapshot())
+
+    def test_final_progress_line_not_repeated(self):
+        lines = []
+        generator = DatasetGenerator(seed=4, batch_size=5, progress=lines.append)
+        generator.insert("Projets", Project, [], 0)
+        self.assertEqual(lines, ["Projets : 0/0 (0/s)"])
+        user = User.objects.create(username="seed-owner", age=30)
+        lines.clear()
+        # 100 lignes = 5 × 20 : le relevé périodique couvre déjà le total
+        generator.insert(
+            "Projets",
+            Project,
+            (Project(name=f"p{i}", type=Project.BACKEND, author=user) for i in range(100)),
+            100,
+        )
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].startswith("Projets : 100/100"))
+
+
+class IncludeExpansionTests(TestCase):
+    """
+    Expansion `?include=` : contenu, limites par niveau et validation.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = build_fixtures(projects=1, contributors=2, issues=3, comments=4)
+        cls.project = Project.objects.get()
+        cls.issue = cls.project.issues.order_by("id").first()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.url = f"/api/projects/{self.project.pk}/issues/{self.issue.pk}"
+
+    def test_included_objects_match_their_routes(self):
+        data = self.client.get(self.url, {"include": "comments,project"}).json()
+        comments = [
+            comment
+            for comment in self.client.get(
+                f"/api/issues/{self.issue.pk}/comments", {"full": 1}
+            ).json()
+            if comment["issue"] == self.issue.pk
+        ]
+        project = self.client.get(f"/api/projects/{self.project.pk}").json()
+        self.assertEqual(data["comments"], comments)
+        self.assertFalse(data["comments_has_more"])
+        self.assertEqual(data["project"], project)
+
+    @override_settings(INCLUDE_LIMITS=(2, 1))
+    def test_limits_per_level(self):
+        data = self.client.get(
+            f"/api/projects/{self.project.pk}", {"include": "issues.comments"}
+        ).json()
+        self.assertTrue(data["issues_has_more"])
+        self.assertEqual(len(data["issues"]), 2)
+        for issue in data["issues"]:
+            self.assertEqual(len(issue["comments"]), 1)
+            self.assertTrue(issue["comments_has_more"])
+
+    def test_invalid_include(self):
+        for include in ("unknown", "comments.issue", "project.issues.comments"):
+            response = self.client.get(self.url, {"include": include})
+            self.assertEqual(response.status_code, 400, include)
+
+    @override_settings(INCLUDE_MAX_PARENTS=2)
+    def test_expanded_parents_bounded_on_lists(self):
+        url = f"/api/projects/{self.project.pk}/issues"
+        # Trois issues : la liste non paginée dépasse la borne
+        response = self.client.get(url, {"include": "comments"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("include", response.json())
+        response = self.client.get(url, {"include": "comments", "page_size": 3})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("page_size", response.json())
+        response = self.client.get(url, {"include": "comments", "page_size": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 2)
+        # Sans expansion, la liste n'est pas concernée
+        self.assertEqual(len(self.client.get(url).json()), 3)
+
+    @override_settings(INCLUDE_MAX_PARENTS=3)
+    def test_unpaginated_list_within_bound(self):
+        data = self.client.get(
+            f"/api/projects/{self.project.pk}/issues", {"include": "comments"}
+        ).json()
+        self.assertEqual(len(data), 3)
+        self.assertTrue(all("comments" in issue for issue in data))
+
+
+class BatchEndpointTests(QueryBudgetMixin, TestCase):
+    """
+    Route `/api/batch` : réponses identiques aux appels séparés, une seule
+    authentification, appartenance partagée et transaction unique.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = build_fixtures(projects=2, contributors=2, issues=3, comments=2)
+        cls.project = Project.objects.order_by("id").first()
+        cls.issues = list(cls.project.issues.order_by("id"))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.owner)}"
+        )
+
+    def batch(self, *requests, **options):
+        return self.client.post(
+            "/api/batch", {"requests": list(requests), **options}, format="json"
+        )
+
+    def test_responses_match_direct_calls(self):
+        paths = [
+            "/api/projects",
+            f"/api/projects/{self.project.pk}/issues/{self.issues[0].pk}?include=comments",
+            f"/api/projects/{self.project.pk}/contributors",
+        ]
+        response = self.batch(*({"method": "GET", "path": path} for path in paths))
+        self.assertEqual(response.status_code, 200)
+        for path, item in zip(paths, response.json()["responses"]):
+            self.assertEqual(item["status"], 200)
+            self.assertEqual(item["body"], self.client.get(path).json())
+
+    def test_authentication_and_membership_shared(self):
+        requests = [
+            {"path": f"/api/projects/{self.project.pk}/issues/{issue.pk}"}
+            for issue in self.issues
+        ]
+        # Utilisateur, une issue par sous-requête, appartenance, SAVEPOINT/RELEASE
+        with self.assertQueryBudget(len(self.issues) + 4) as context:
+            response = self.batch(*requests)
+        self.assertEqual(response.status_code, 200)
+        user_queries = [
+            q for q in context.captured_queries if 'FROM "softdeskApp_user"' in q["sql"]
+        ]
+        membership_queries = [
+            q for q in context.captured_queries
+            if 'FROM "softdeskApp_contributor"' in q["sql"]
+        ]
+        self.assertEqual((len(user_queries), len(membership_queries)), (1, 1))
+
+    def test_failure_rolls_back_whole_batch(self):
+        url = f"/api/projects/{self.project.pk}/issues"
+        count = Issue.objects.count()
+        response = self.batch(
+            {"method": "POST", "path": url, "body": {"title": "Valide"}},
+            {"method": "POST", "path": url, "body": {}},
+            {"method": "GET", "path": url},
+        )
+        data = response.json()
+        self.assertFalse(data["committed"])
+        self.assertEqual([item["status"] for item in data["responses"]], [201, 400, 424])
+        self.assertEqual(Issue.objects.count(), count)
+
+    def test_invalid_batches(self):
+        post = {"method": "POST", "path": f"/api/projects/{self.project.pk}/issues"}
+        self.assertEqual(self.batch(post, read_only=True).status_code, 400)
+        with override_settings(BATCH_MAX_REQUESTS=2):
+            self.assertEqual(self.batch(*[{"path": "/api/projects"}] * 3).status_code, 400)
+        responses = self.batch(
+            {"path": "/api/batch"}, {"path": "/admin/"}, read_only=True
+        ).json()
+        self.assertEqual([r["status"] for r in responses["responses"]], [400, 404])
+
+    def test_plain_text_sub_response(self):
+        item = self.batch({"path": "/api/metrics"}, read_only=True).json()["responses"][0]
+        self.assertEqual(item["status"], 200)
+        self.assertTrue(item["headers"]["Content-Type"].startswith("text/plain"))
+        self.assertIsInstance(item["body"], str)
+
+    def test_authentication_required(self):
+        self.client.credentials()
+        self.assertEqual(self.batch({"path": "/api/projects"}).status_code, 401)
+
+
+@override_settings(SYNC_OVERLAP_SECONDS=0)
+class DeltaSyncTests(QueryBudgetMixin, TestCase):
+    """
+    Synchronisation différentielle : la réponse ne contient que les changements.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = build_fixtures(projects=2, contributors=2, issues=5, comments=3)
+        # Données anciennes : rien n'a changé depuis une heure
+        past = timezone.now() - timedelta(hours=1)
+        for model in (Project, Contributor, Issue, Comment):
+            model.objects.update(created_at=past, updated_at=past)
+        cls.project = Project.objects.order_by("id").first()
+        cls.url = f"/api/projects/{cls.project.pk}/sync"
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def sync(self, token=None, status_code=200):
+        response = self.client.get(self.url, {"token": token} if token else {})
+        self.assertEqual(response.status_code, status_code, response.content)
+        return response.json()
+
+    def test_full_sync_without_token(self):
+        data = self.sync()
+        self.assertTrue(data["reset"])
+        self.assertEqual(len(data["projects"]["created"]), 1)
+        contributors = self.client.get(f"/api/projects/{self.project.pk}/contributors")
+        self.assertEqual(data["contributors"]["created"], contributors.json())
+        self.assertEqual(len(data["issues"]["created"]), 5)
+        self.assertEqual(len(data["comments"]["created"]), 15)
+
+    def test_only_changes_since_token(self):
+        token = self.sync()["token"]
+        issues = list(self.project.issues.order_by("id"))
+        issues[0].title = "Titre modifié"
+        issues[0].save()
+        Comment.objects.create(content="Nouveau", issue=issues[1], author=self.owner)
+        self.client.delete(f"/api/projects/{self.project.pk}/issues/{issues[2].pk}")
+
+        with self.assertQueryBudget(8):
+            data = self.sync(token)
+        self.assertFalse(data["reset"])
+        self.assertEqual([i["title"] for i in data["issues"]["updated"]], ["Titre modifié"])
+        self.assertEqual(data["issues"]["deleted"], [issues[2].pk])
+        self.assertEqual([c["content"] for c in data["comments"]["created"]], ["Nouveau"])
+        self.assertEqual(data["projects"], {"created": [], "updated": [], "deleted": []})
+        self.assertEqual(self.sync(data["token"])["issues"]["updated"], [])
+
+    def test_deleted_project(self):
+        token = self.sync()["token"]
+        response = self.client.delete(f"/api/projects/{self.project.pk}")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.sync(token)["projects"]["deleted"], [self.project.pk])
+        self.sync(status_code=404)
+
+    def test_user_deletion_leaves_tombstones(self):
+        member = User.objects.filter(username="member0").get()
+        self.client.force_authenticate(member)
+        self.client.delete(f"/api/users/{member.pk}")
+        Purger().run(claim_next_job())
+        self.assertEqual(
+            Tombstone.objects.filter(model=Tombstone.CONTRIBUTOR).count(), 2
+        )
+        self.assertTrue(Tombstone.objects.filter(model=Tombstone.COMMENT).exists())
+
+    def test_invalid_tokens(self):
+        self.sync("falsifié", status_code=400)
+        other = Project.objects.exclude(pk=self.project.pk).first()
+        self.sync(make_token(other.pk, timezone.now()), status_code=400)
+        old = make_token(self.project.pk, timezone.now() - timedelta(days=365))
+        self.assertTrue(self.sync(old)["reset"])
+
+
+class SoftDeletePurgeTests(QueryBudgetMixin, TestCase):
+    """
+    Suppression logique immédiate puis purge par tranches en arrière-plan.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = build_fixtures(projects=2, contributors=2, issues=5, comments=3)
+        cls.project = Project.objects.order_by("id").first()
+        cls.member = User.objects.get(username="member0")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def test_project_hidden_then_purged_in_batches(self):
+        with self.assertQueryBudget(10):
+            response = self.client.delete(f"/api/projects/{self.project.pk}")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(len(self.client.get("/api/projects").json()), 1)
+        url = f"/api/projects/{self.project.pk}/issues"
+        listed = [issue["project"] for issue in self.client.get(url).json()]
+        self.assertNotIn(self.project.pk, listed)
+        self.assertEqual(self.client.post(url, {"title": "Issue"}).status_code, 404)
+        self.assertEqual(Issue.objects.filter(project=self.project).count(), 5)
+
+        job = claim_next_job()
+        self.assertIsNone(claim_next_job())  # Déjà réservée
+        Purger(batch_size=4).run(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, PurgeJob.DONE)
+        self.assertEqual(
+            job.progress,
+            {"softdeskApp_comment": 15, "softdeskApp_issue": 5, "softdeskApp_contributor": 3},
+        )
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+        self.assertEqual(Issue.objects.count(), 5)  # L'autre projet est intact
+
+    def test_user_deactivated_then_purged(self):
+        Issue.objects.update(assignee=self.member)
+        token = AccessToken.for_user(self.member)
+        self.client.force_authenticate(self.member)
+        self.assertEqual(self.client.delete(f"/api/users/{self.member.pk}").status_code, 204)
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(client.get("/api/projects").status_code, 401)
+        self.assertNotIn(
+            str(self.member.pk), [u["id"] for u in self.client.get("/api/users").json()]
+        )
+
+        out = io.StringIO()
+        call_command("purge_deleted", batch_size=3, stdout=out)
+        self.assertIn("1 purge(s)", out.getvalue())
+        self.assertFalse(User.objects.filter(pk=self.member.pk).exists())
+        self.assertFalse(Issue.objects.filter(assignee__isnull=False).exists())
+        self.assertFalse(Comment.objects.filter(author_id=self.member.pk).exists())
+        self.assertEqual(Tombstone.objects.filter(model=Tombstone.CONTRIBUTOR).count(), 2)
+
+    def test_contributors_of_deleted_project_hidden(self):
+        # Vue non routée : appelée directement
+        self.client.delete(f"/api/projects/{self.project.pk}")
+        request = APIRequestFactory().get("/")
+        force_authenticate(request, self.owner)
+        response = ContributorViewSet.as_view({"get": "list"})(request)
+        listed = {contributor["project"] for contributor in response.data}
+        self.assertEqual(listed, {Project.objects.order_by("id").last().pk})
+
+    @override_settings(PURGE_RETRY_SECONDS=0, PURGE_MAX_ATTEMPTS=2)
+    def test_failed_job_retried_a_bounded_number_of_times(self):
+        self.client.delete(f"/api/projects/{self.project.pk}")
+        with mock.patch.object(Purger, "purge_project", side_effect=RuntimeError("panne")):
+            for attempt in (1, 2):
+                job = claim_next_job()
+                with self.assertRaises(RuntimeError):
+                    Purger().run(job)
+                self.assertEqual((job.status, job.attempts), (PurgeJob.FAILED, attempt))
+            self.assertIsNone(claim_next_job())  # Abandonnée après PURGE_MAX_ATTEMPTS
+        with override_settings(PURGE_MAX_ATTEMPTS=3):
+            out = io.StringIO()
+            call_command("purge_deleted", stdout=out, stderr=io.StringIO())
+        self.assertIn("1 purge(s)", out.getvalue())
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+
+    def test_stale_running_job_is_resumed(self):
+        self.client.delete(f"/api/projects/{self.project.pk}")
+        job = claim_next_job()
+        PurgeJob.objects.filter(pk=job.pk).update(
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(claim_next_job().pk, job.pk)
+
+
+class ArchiveTests(TestCase):
+    """
+    Archivage des issues terminées et inactives, et lecture par les routes existantes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = build_fixtures(projects=1, contributors=2, issues=4, comments=3)
+        cls.project = Project.objects.get()
+        cls.issues = list(cls.project.issues.order_by("id"))
+        old = timezone.now() - timedelta(days=365)
+        cls.old_ids = [issue.pk for issue in cls.issues[:3]]
+        Issue.objects.filter(pk__in=cls.old_ids).update(
+            status=Issue.FINISHED, updated_at=old
+        )
+        Comment.objects.filter(issue_id__in=cls.old_ids).update(updated_at=old)
+        # Commentaire récent : l'issue reste dans les tables chaudes
+        Comment.objects.filter(issue_id=cls.old_ids[2]).update(updated_at=timezone.now())
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.issues_url = f"/api/projects/{self.project.pk}/issues"
+
+    def test_archived_issue_served_by_existing_routes(self):
+        issue_id = self.old_ids[0]
+        url = f"{self.issues_url}/{issue_id}"
+        before = self.client.get(url, {"include": "comments"}).json()
+        comments = self.client.get(f"/api/issues/{issue_id}/comments", {"full": 1}).json()
+        previews = self.client.get(f"/api/issues/{issue_id}/comments").json()
+        listed = self.client.get(self.issues_url).json()
+
+        out = io.StringIO()
+        call_command("archive_issues", stdout=out)
+        self.assertIn("2 issue(s) et 6 commentaire(s)", out.getvalue())
+        self.assertEqual(Issue.objects.count(), 2)
+        self.assertEqual(Comment.objects.count(), 6)
+
+        self.assertEqual(
+            self.client.get(url, {"include": "comments"}).json(),
+            {**before, "archived": True},
+        )
+        self.assertEqual(
+            self.client.get(f"/api/issues/{issue_id}/comments", {"full": 1}).json(),
+            comments,
+        )
+        self.assertEqual(
+            self.client.get(f"/api/issues/{issue_id}/comments").json(), previews
+        )
+        comment = comments[1]
+        self.assertEqual(
+            self.client.get(f"/api/issues/{issue_id}/comments/{comment['id']}").json(),
+            comment,
+        )
+        self.assertEqual(len(self.client.get(self.issues_url).json()), 2)
+        with_archived = self.client.get(self.issues_url, {"archived": "1"}).json()
+        self.assertEqual(
+            sorted(issue["id"] for issue in with_archived),
+            sorted(issue["id"] for issue in listed),
+        )
+        self.assertEqual(self.client.patch(url, {"title": "x"}).status_code, 404)
+
+    def test_archives_hidden_from_outsiders_and_purged(self):
+        Archiver().run()
+        outsider = User.objects.create(username="outsider", age=30)
+        self.client.force_authenticate(outsider)
+        self.assertEqual(
+            self.client.get(f"{self.issues_url}/{self.old_ids[0]}").status_code, 404
+        )
+        self.client.force_authenticate(self.owner)
+        self.client.delete(f"/api/projects/{self.project.pk}")
+        Purger().run(claim_next_job())
+        self.assertFalse(ArchivedIssue.objects.exists())
+
+    def test_archived_issues_reported_to_sync_clients(self):
+        token = make_token(self.project.pk, timezone.now() - timedelta(minutes=1))
+        Archiver().run()
+        data = self.client.get(
+            f"/api/projects/{self.project.pk}/sync", {"token": token}
+        ).json()
+        self.assertEqual(sorted(data["issues"]["deleted"]), self.old_ids[:2])
+
+    def test_archives_never_streamed(self):
+        Archiver().run()
+        response = self.client.get(self.issues_url, {"archived": "1", "stream": "1"})
+        self.assertEqual(response.status_code, 400)
+        url = f"/api/issues/{self.old_ids[0]}/comments"
+        self.assertEqual(
+            self.client.get(url, {"stream": "1"}).json(), self.client.get(url).json()
+        )
+        self.assertEqual(len(self.client.get(url).json()), 3)
+
+    def test_purged_user_scrubbed_from_archives(self):
+        member = User.objects.get(username="member0")
+        Issue.objects.filter(pk__in=self.old_ids).update(assignee=member)
+        Archiver().run()
+        self.client.force_authenticate(member)
+        self.assertEqual(self.client.delete(f"/api/users/{member.pk}").status_code, 204)
+        call_command("purge_deleted", stdout=io.StringIO())
+
+        self.assertEqual(ArchivedIssue.objects.count(), 2)
+        for archived in ArchivedIssue.objects.all():
+            raw = zlib.decompress(archived.payload).decode()
+            self.assertNotIn("member0", raw)
+            content = archived.load()
+            self.assertIsNone(content["issue"]["assignee"])
+            self.assertNotIn(str(member.pk), [c["author"] for c in content["comments"]])
+            self.assertEqual(archived.comment_count, len(content["comments"]))
+        self.client.force_authenticate(self.owner)
+        comments = self.client.get(f"/api/issues/{self.old_ids[0]}/comments").json()
+        self.assertEqual(len(comments), 1)
+
+    def test_non_numeric_issue_id_is_not_found(self):
+        self.assertEqual(self.client.get(f"{self.issues_url}/abc").status_code, 404)
+
+    def test_paginated_lists(self):
+        Archiver().run()
+        response = self.client.get(self.issues_url, {"archived": "1", "page_size": 10})
+        self.assertEqual(response.status_code, 400)
+        url = f"/api/issues/{self.old_ids[0]}/comments"
+        data = self.client.get(url, {"page_size": 2}).json()
+        self.assertEqual((data["count"], len(data["results"])), (3, 2))
+        self.assertEqual(
+            self.client.get(url, {"page_size": 2, "page": 2}).json()["results"],
+            self.client.get(url).json()[2:],
+        )
+
+    def test_live_issue_without_comments_skips_archives(self):
+        Archiver().run()
+        issue = self.issues[3]
+        issue.comments.all().delete()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f"/api/issues/{issue.pk}/comments")
+        self.assertEqual(response.json(), [])
+        self.assertFalse(
+            [q for q in context.captured_queries if "archivedissue" in q["sql"].lower()]
+        )
+
+
+class OptimisticConcurrencyTests(TestCase):
+    """
+    Modifications conditionnelles (`If-Match`) des projets et des issues.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = build_fixtures(projects=1, contributors=1, issues=2, comments=0)
+        cls.project = Project.objects.get()
+        cls.issue = cls.project.issues.order_by("id").first()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.url = f"/api/projects/{self.project.pk}/issues/{self.issue.pk}"
+
+    def test_if_match_update_is_a_single_conditional_update(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response["ETag"], '"1"')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                self.url, {"status": Issue.IN_PROGRESS}, HTTP_IF_MATCH='"1"'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["ETag"], '"2"')
+        self.assertEqual(response.json()["version"], 2)
+        writes = [q["sql"] for q in queries if not q["sql"].startswith("SELECT")]
+        self.assertEqual(len(writes), 1)
+        self.assertIn('"version" = 1', writes[0])
+        self.assertNotIn("FOR UPDATE", " ".join(q["sql"] for q in queries))
+
+        # Version périmée : la modification concurrente n'est pas écrasée
+        response = self.client.patch(self.url, {"status": Issue.FINISHED}, HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, 412)
+        self.issue.refresh_from_db()
+        self.assertEqual((self.issue.status, self.issue.version), (Issue.IN_PROGRESS, 2))
+        # ETag affaibli par la compression : même version
+        response = self.client.patch(
+            self.url, {"status": Issue.FINISHED}, HTTP_IF_MATCH='W/"2"'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_write_between_read_and_update_is_detected(self):
+        stale = Issue.objects.get(pk=self.issue.pk)
+        Issue.objects.filter(pk=self.issue.pk).update(version=5)
+        self.assertFalse(save_if_unchanged(stale, {"title": "Perdu"}))
+        self.assertNotEqual(Issue.objects.get(pk=self.issue.pk).title, "Perdu")
+
+    def test_project_update_and_required_if_match(self):
+        url = f"/api/projects/{self.project.pk}"
+        response = self.client.patch(url, {"description": "Nouvelle"}, HTTP_IF_MATCH='"2"')
+        self.assertEqual(response.status_code, 412)
+        response = self.client.patch(url, {"description": "Nouvelle"}, HTTP_IF_MATCH="*")
+        self.assertEqual(response.json()["version"], 2)
+        with override_settings(CONCURRENCY_REQUIRE_IF_MATCH=True):
+            response = self.client.patch(url, {"description": "Autre"})
+        self.assertEqual(response.status_code, 428)
+
+
+class IssueTransitionTests(QueryBudgetMixin, TestCase):
+    """
+    Actions `status` et `assign` : une seule écriture, droits dans le WHERE.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = build_fixtures(projects=1, contributors=2, issues=1, comments=0)
+        cls.project = Project.objects.get()
+        cls.issue = cls.project.issues.get()
+        cls.member = User.objects.get(username="member0")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.url = f"/api/projects/{self.project.pk}/issues/{self.issue.pk}"
+
+    def test_status_change_is_one_update(self):
+        with self.assertQueryBudget(1):
+            response = self.client.post(
+                f"{self.url}/status", {"status": Issue.FINISHED}, HTTP_IF_MATCH='"1"'
+            )
+        self.assertEqual(
+            response.json(), {"id": self.issue.pk, "status": Issue.FINISHED, "version": 2}
+        )
+        self.assertEqual(response["ETag"], '"2"')
+        self.assertEqual(self.client.get(self.url).json()["status"], Issue.FINISHED)
+
+        response = self.client.post(
+            f"{self.url}/status", {"status": Issue.TODO}, HTTP_IF_MATCH='"1"'
+        )
+        self.assertEqual(response.status_code, 412)
+        response = self.client.post(f"{self.url}/status", {"status": "Done"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_assign_checks_membership_with_one_exists(self):
+        with self.assertQueryBudget(3):  # EXISTS, UPDATE, relecture de la version
+            response = self.client.post(f"{self.url}/assign", {"assignee": str(self.member.pk)})
+        self.assertEqual(response.json()["version"], 2)
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.assignee_id, self.member.pk)
+
+        outsider = User.objects.create(username="outsider", age=30)
+        response = self.client.post(f"{self.url}/assign", {"assignee": str(outsider.pk)})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(
+            f"{self.url}/assign", {"assignee": None}, format="json"
+        )
+        self.assertEqual(response.json()["assignee"], None)
+
+    def test_permissions(self):
+        self.client.force_authenticate(self.member)
+        response = self.client.post(f"{self.url}/status", {"status": Issue.FINISHED})
+        self.assertEqual(response.status_code, 403)
+        self.client.force_authenticate(User.objects.create(username="outsider", age=30))
+        response = self.client.post(f"{self.url}/status", {"status": Issue.FINISHED})
+        self.assertEqual(response.status_code, 404)
+        self.issue.refresh_from_db()
+        self.assertEqual((self.issue.status, self.issue.version), (Issue.TODO, 1))
+
+    def test_body_must_be_an_object(self):
+        for action in ("status", "assign"):
+            response = self.client.post(f"{self.url}/{action}", [1, 2], format="json")
+            self.assertEqual(response.status_code, 400)
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.version, 1)
+
+    def test_non_numeric_issue_id_is_not_found(self):
+        base = f"/api/projects/{self.project.pk}/issues/abc"
+        response = self.client.post(f"{base}/status", {"status": Issue.FINISHED})
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post(f"{base}/assign", {"assignee": str(self.member.pk)})
+        self.assertEqual(response.status_code, 404)
+
+
+class CountingPaginationTests(TestCase):
+    """
+    Pagination sur demande et modes de calcul du total.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = build_fixtures(projects=2, contributors=3, issues=5, comments=2)
+        cls.project = Project.objects.order_by("id").first()
+
+    def setUp(self):
+        count_cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.url = f"/api/projects/{self.project.pk}/issues"
+
+    def count_queries(self, params):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(self.url, params).json()
+        return data, [q["sql"] for q in queries if "COUNT(" in q["sql"]]
+
+    def test_pagination_is_opt_in(self):
+        self.assertIsInstance(self.client.get(self.url).json(), list)
+        data = self.client.get(self.url, {"page_size": 2, "page": 3}).json()
+        self.assertEqual(data["count"], 5)
+        self.assertIsNone(data["next"])
+        self.assertIn("page=2", data["previous"])
+        self.assertEqual(len(data["results"]), 1)
+        self.assertEqual(
+            self.client.get(self.url, {"page_size": 2, "page": 4}).status_code, 404
+        )
+        self.assertEqual(self.client.get(self.url, {"page_size": 2, "count": "x"}).status_code, 400)
+
+    def test_cached_count_avoids_distinct_count(self):
+        data, counts = self.count_queries({"page_size": 2})
+        self.assertEqual(data["count"], 5)
+        self.assertEqual(len(counts), 1)
+        self.assertNotIn("DISTINCT", counts[0])
+        data, counts = self.count_queries({"page_size": 2, "page": 2})
+        self.assertEqual((data["count"], counts), (5, []))
+
+        self.client.post(self.url, {"title": "Nouvelle"})
+        data, _ = self.count_queries({"page_size": 2})
+        self.assertEqual(data["count"], 6)
+        data, counts = self.count_queries({"page_size": 2, "count": "exact"})
+        self.assertEqual(data["count"], 6)
+        self.assertIn("DISTINCT", counts[0])
+
+        url = f"/api/issues/{self.project.issues.first().pk}/comments"
+        self.assertEqual(self.client.get(url, {"page_size": 1}).json()["count"], 2)
+
+    @override_settings(PAGINATION_COUNT_LIMIT=3)
+    def test_estimate_and_none(self):
+        data, _ = self.count_queries({"page_size": 2, "count": "estimate"})
+        self.assertEqual((data["count"], data["count_exact"]), (3, False))
+        self.assertIsNotNone(data["next"])
+        data, counts = self.count_queries({"page_size": 2, "count": "none", "page": 2})
+        self.assertEqual(counts, [])
+        self.assertNotIn("count", data)
+        self.assertIsNotNone(data["next"])
+        self.assertEqual(len(data["results"]), 2)
+
+    def test_outsider_sees_empty_page(self):
+        self.client.force_authenticate(User.objects.create(username="outsider", age=30))
+        data = self.client.get(self.url, {"page_size": 2}).json()
+        self.assertEqual((data["count"], data["results"]), (0, []))
+
+
+@override_settings(LIST_TEXT_PREVIEW_LENGTH=10)
+class TextPreviewTests(TestCase):
+    """
+    Aperçus des champs texte dans les listes, texte complet sur demande.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = build_fixtures(projects=1, contributors=1, issues=3, comments=1)
+        cls.project = Project.objects.get()
+        cls.issues = list(cls.project.issues.order_by("id"))
+        Issue.objects.filter(pk=cls.issues[0].pk).update(description="x" * 50)
+        Issue.objects.filter(pk=cls.issues[1].pk).update(description=None)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.url = f"/api/projects/{self.project.pk}/issues"
+
+    def test_list_returns_previews_computed_in_sql(self):
+        for fast in (True, False):
+            with override_settings(FAST_LIST_SERIALIZERS=fast), CaptureQueriesContext(
+                connection
+            ) as queries:
+                data = self.client.get(self.url).json()
+            self.assertEqual(len(queries), 1)  # Pas de chargement ligne à ligne
+            # Colonne complète absente de la sélection (seulement dans SUBSTR et LENGTH)
+            self.assertNotIn('"title", "softdeskApp_issue"."description"', queries[0]["sql"])
+            self.assertNotIn("description", data[0])
+            self.assertEqual(data[0]["description_preview"], "x" * 10)
+            self.assertTrue(data[0]["description_truncated"])
+            self.assertEqual(
+                (data[1]["description_preview"], data[1]["description_truncated"]),
+                (None, False),
+            )
+            self.assertEqual(data[2]["description_preview"], "Descriptio")
+
+    def test_full_text_on_retrieve_and_on_demand(self):
+        data = self.client.get(self.url, {"full": 1}).json()
+        self.assertEqual(data[0]["description"], "x" * 50)
+        data = self.client.get(f"{self.url}/{self.issues[0].pk}").json()
+        self.assertEqual(data["description"], "x" * 50)
+        comments = self.client.get(f"/api/issues/{self.issues[0].pk}/comments").json()
+        self.assertEqual(comments[0]["content_preview"], "Commentair")
+
+    def test_included_objects_keep_full_text(self):
+        data = self.client.get("/api/projects", {"include": "issues"}).json()
+        self.assertIn("description_preview", data[0])
+        self.assertEqual(data[0]["issues"][0]["description"], "x" * 50)
+
+
+class LightRelationFieldTests(TestCase):
+    """
+    Champs de relation : ni énumération des tables, ni lecture objet par objet.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = build_fixtures(projects=1, contributors=2, issues=1, comments=0)
+        cls.project = Project.objects.get()
+        User.objects.bulk_create(User(username=f"extra{i}", age=30) for i in range(30))
+
+    def test_browsable_api_form_does_not_list_users(self):
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(
+                f"/api/projects/{self.project.pk}/issues", HTTP_ACCEPT="text/html"
+            )
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        self.assertIn('name="assignee"', content)
+        self.assertNotIn(str(User.objects.get(username="extra0").pk), content)
+        for query in queries:
+            self.assertFalse(
+                'FROM "softdeskApp_user"' in query["sql"] and "WHERE" not in query["sql"],
+                query["sql"],
+            )
+
+    def test_ids_validated_in_one_query(self):
+        class MembersSerializer(serializers.Serializer):
+            users = LightPrimaryKeyRelatedField(queryset=User.objects.all(), many=True)
+
+        ids = [str(pk) for pk in User.objects.values_list("pk", flat=True)[:10]]
+        serializer = MembersSerializer(data={"users": ids})
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid())
+        self.assertEqual([str(user.pk) for user in serializer.validated_data["users"]], ids)
+
+        serializer = MembersSerializer(data={"users": [ids[0], str(uuid.uuid4()), "abc"]})
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("users", serializer.errors)
+
+
+class CreateQueryCountTests(TestCase):
+    """
+    Chaque ligne est lue au plus une fois par requête de création
+    (carte d'identité de la requête, voir softdeskApp/identity.py).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = build_fixtures(projects=1, contributors=2, issues=1, comments=0)
+        cls.project = Project.objects.get()
+        cls.issue = cls.project.issues.get()
+        cls.member = User.objects.get(username="member0")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def test_register(self):
+        data = {"username": "nouveau", "password": PASSWORD, "age": 30}
+        with self.assertNumQueries(2):  # Unicité du nom, INSERT
+            response = APIClient().post("/api/register/", data)
+        self.assertEqual(response.status_code, 200)
+
+    def test_project_create(self):
+        data = {"name": "Nouveau", "description": "Projet", "type": Project.BACKEND}
+        with self.assertNumQueries(4):  # Unicité du nom, 2 INSERT, contributeurs
+            response = self.client.post("/api/projects", data)
+        self.assertEqual(response.status_code, 201)
+
+    def test_issue_create(self):
+        url = f"/api/projects/{self.project.pk}/issues"
+        with self.assertNumQueries(2):  # Projet et appartenance, INSERT
+            self.assertEqual(self.client.post(url, {"title": "A"}).status_code, 201)
+        # + assigné (validation de l'identifiant, appartenance)
+        with self.assertNumQueries(4):
+            response = self.client.post(url, {"title": "B", "assignee": str(self.member.pk)})
+        self.assertEqual(response.json()["assignee_username"], "member0")
+
+    def test_issue_create_requires_membership(self):
+        self.client.force_authenticate(User.objects.create(username="outsider", age=30))
+        response = self.client.post(f"/api/projects/{self.project.pk}/issues", {"title": "A"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_comment_create(self):
+        url = f"/api/issues/{self.issue.pk}/comments"
+        with self.assertNumQueries(2):  # Issue et appartenance, INSERT
+            response = self.client.post(url, {"content": "Commentaire"})
+        self.assertEqual(response.json()["issue_title"], self.issue.title)
+
+    def test_batch_shares_loaded_rows(self):
+        url = f"/api/issues/{self.issue.pk}/comments"
+        body = {
+            "requests": [{"method": "POST", "path": url, "body": {"content": "C"}}] * 3
+            + [
+                {
+                    "method": "PATCH",
+                    "path": f"/api/projects/{self.project.pk}/issues/{self.issue.pk}",
+                    "body": {"title": "Renommée"},
+                },
+                {"method": "POST", "path": url, "body": {"content": "D"}},
+            ]
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post("/api/batch", body, format="json")
+        responses = response.json()["responses"]
+        self.assertEqual([r["status"] for r in responses], [201, 201, 201, 200, 201])
+        issue_reads = [
+            q
+            for q in queries
+            if q["sql"].startswith("SELECT") and 'FROM "softdeskApp_issue"' in q["sql"]
+        ]
+        self.assertEqual(len(issue_reads), 3)  # Commentaires, PATCH, relecture après écriture
+        self.assertEqual(responses[-1]["body"]["issue_title"], "Renommée")
+
+
+def revoke_all(token):
+    return True
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = build_fixtures(projects=1, contributors=0, issues=0, comments=0)
+
+    def setUp(self):
+        token_cache.clear()
+        self.token = str(AccessToken.for_user(self.owner))
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def count_decodes(self, requests):
+        with mock.patch.object(
+            TokenBackend, "decode", autospec=True, side_effect=TokenBackend.decode
+        ) as decode:
+            for _ in range(requests):
+                self.assertEqual(self.client.get("/api/projects").status_code, 200)
+        return decode.call_count
+
+    def test_token_verified_once_until_expiry(self):
+        self.assertEqual(self.count_decodes(3), 1)
+        token = token_cache.get(token_key(self.token))
+        self.assertEqual(token_cache._data[token_key(self.token)][1], token["exp"])
+        self.assertNotIn(self.token.encode(), token_cache._data)  # Empreinte seulement
+
+    @override_settings(JWT_CACHE_ENABLED=False)
+    def test_disabled(self):
+        self.assertEqual(self.count_decodes(2), 2)
+        self.assertEqual(len(token_cache), 0)
+
+    def test_invalid_token_not_cached(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token[:-2]}xx")
+        self.assertEqual(self.client.get("/api/projects").status_code, 401)
+        self.assertEqual(len(token_cache), 0)
+
+    def test_revocation_hooks_checked_on_cached_tokens(self):
+        self.count_decodes(1)
+        with override_settings(JWT_REVOCATION_HOOKS=["softdeskApp.tests.revoke_all"]):
+            self.assertEqual(self.client.get("/api/projects").status_code, 401)
+
+    def test_deleted_user_rejected(self):
+        self.count_decodes(1)
+        self.assertEqual(self.client.delete(f"/api/users/{self.owner.pk}").status_code, 204)
+        self.assertEqual(len(token_cache), 0)
+        self.assertEqual(self.client.get("/api/projects").status_code, 401)
+
+
+class ApiSettingsProfileTests(TestCase):
+    """
+    Pile de middlewares et rendus du profil SoftDeskSupport.settings_api.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = build_fixtures(projects=1, contributors=0, issues=0, comments=0)
+
+    def load_profile(self, **env):
+        """
+        Recharge le profil avec les seules options `env` : les variables
+        SOFTDESK_API_* de l'environnement du test sont ignorées.
+        """
+        import importlib
+
+        from SoftDeskSupport import settings_api
+
+        environ = {
+            key: value
+            for key, value in os.environ.items()
+            if not key.startswith("SOFTDESK_API_")
+        }
+        with mock.patch.dict(os.environ, {**environ, **env}, clear=True):
+            profile = importlib.reload(settings_api)
+        self.addCleanup(importlib.reload, settings_api)
+        return profile
+
+    def test_no_session_or_cookie_middleware(self):
+        profile = self.load_profile()
+        self.assertNotIn("django.contrib.sessions", profile.INSTALLED_APPS)
+        self.assertNotIn("django.contrib.messages", profile.INSTALLED_APPS)
+        with override_settings(
+            MIDDLEWARE=profile.MIDDLEWARE, REST_FRAMEWORK=profile.REST_FRAMEWORK
+        ):
+            response = self.client.post(
+                "/api/token/", {"username": "owner", "password": PASSWORD}
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(response.cookies)
+            response = self.client.post(
+                "/api/projects",
+                {"name": "Profil", "description": "API seule", "type": Project.BACKEND},
+                HTTP_AUTHORIZATION=f"Bearer {response.json()['access']}",
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn("X-Frame-Options", response)
+        self.assertNotIn("Cookie", response.get("Vary", ""))
+
+    def test_json_renderer_only(self):
+        # Les vues lisent leurs rendus à l'import : vérifié sur le profil lui-même
+        profile = self.load_profile()
+        self.assertEqual(
+            profile.REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"],
+            ["softdeskApp.renderers.FastJSONRenderer"],
+        )
+
+    def test_admin_and_browsable_options(self):
+        profile = self.load_profile(SOFTDESK_API_ADMIN="1", SOFTDESK_API_BROWSABLE="1")
+        middleware = profile.MIDDLEWARE
+        self.assertEqual(len(middleware), len(set(middleware)))
+        self.assertLess(
+            middleware.index("django.middleware.security.SecurityMiddleware"),
+            middleware.index("django.contrib.sessions.middleware.SessionMiddleware"),
+        )
+        for required in (
+            "django.middleware.common.CommonMiddleware",
+            "django.middleware.csrf.CsrfViewMiddleware",
+            "django.contrib.auth.middleware.AuthenticationMiddleware",
+            "django.contrib.messages.middleware.MessageMiddleware",
+            "softdeskApp.middleware.LoadSheddingMiddleware",
+        ):
+            self.assertIn(required, middleware)
+        self.assertIn("django.contrib.admin", profile.INSTALLED_APPS)
+        self.assertIn("django.contrib.staticfiles", profile.INSTALLED_APPS)
+        self.assertIn(
+            "rest_framework.renderers.BrowsableAPIRenderer",
+            profile.REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"],
+        )
+
+
+class StartupWarmUpTests(TestCase):
+    def test_warm_up_runs_every_step(self):
+        with self.assertLogs("softdeskApp.startup", "INFO"):
+            timings = warm_up()
+        self.assertEqual(list(timings), list(STEPS))
+        with self.assertNumQueries(0):  # Routes et sérialiseurs prêts
+            response = self.client.get("/api/projects")
+        self.assertEqual(response.status_code, 401)
+
+    def test_persistent_connections_closed_after_warm_up(self):
+        database = mock.Mock(in_atomic_block=False, settings_dict={"CONN_MAX_AGE": 600})
+        with mock.patch("softdeskApp.startup.connections.all", return_value=[database]):
+            connect_databases()
+        database.ensure_connection.assert_called_once_with()
+        database.close.assert_called_once_with()
+
+    def test_parse_imports_by_phase(self):
+        stderr = "\n".join(
+            [
+                "import time: self [us] | cumulative | imported package",
+                "import time:       120 |        300 | django",
+                "-- phase first_request",
+                "import time:        80 |         80 |   softdeskApp.views",
+            ]
+        )
+        self.assertEqual(
+            parse_imports(stderr),
+            {"boot": [("django", 120, 300)], "first_request": [("softdeskApp.views", 80, 80)]},
+        )
+
+
+@override_settings(
+    THROTTLE_ENABLED=True, THROTTLE_BUCKETS={"user": (1, 10), "anon": (1, 20)}
+)
+class TokenBucketThrottleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = build_fixtures(projects=1, contributors=0, issues=0, comments=0)
+
+    def setUp(self):
+        local_store.clear()
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.owner)}"
+        )
+
+    def test_route_cost_per_user(self):
+        self.assertEqual(self.client.get("/api/projects").status_code, 200)  # Coût 5
+        self.assertEqual(self.client.get("/api/projects").status_code, 200)
+        with self.assertNumQueries(0):  # Refus avant l'authentification DRF
+            response = self.client.get("/api/projects")
+        self.assertEqual(response.status_code, 429)
+        self.assertIn(response["Retry-After"], ("4", "5"))
+
+        other = APIClient()
+        user = User.objects.create(username="other", age=30)
+        other.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        self.assertEqual(other.get("/api/projects").status_code, 200)
+
+    def test_invalid_token_uses_ip_bucket(self):
+        client = APIClient(REMOTE_ADDR="10.0.0.3")
+        for attempt in range(20):  # Un jeton différent à chaque essai
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer faux.{attempt}.jeton")
+            self.assertEqual(client.get("/api/users").status_code, 401)
+        self.assertEqual(client.get("/api/users").status_code, 429)
+
+    def test_batch_charged_for_every_sub_request(self):
+        batch = {"requests": [{"path": "/api/projects"}] * 2}  # 2 x 5 jetons
+        response = self.client.post("/api/batch", batch, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get("/api/users").status_code, 429)
+
+    def test_anonymous_per_ip(self):
+        data = {"username": "nouveau", "password": PASSWORD, "age": 30}
+        client = APIClient(REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(client.post("/api/register/", data).status_code, 200)  # Coût 20
+        self.assertEqual(client.post("/api/register/", data).status_code, 429)
+        other = APIClient(REMOTE_ADDR="10.0.0.2")
+        response = other.post("/api/register/", {**data, "username": "autre"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_bucket_refill(self):
+        for store in (LocalBucketStore(), CacheBucketStore(caches["default"])):
+            key = f"test:{type(store).__name__}"
+            self.assertEqual(store.take(key, 2, 10, 8, now=100.0), (True, 0))
+            self.assertEqual(store.take(key, 2, 10, 5, now=100.0), (False, 1.5))
+            self.assertEqual(store.take(key, 2, 10, 5, now=101.5), (True, 0))
+
+    @override_settings(THROTTLE_ENABLED=False)
+    def test_disabled(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get("/api/projects").status_code, 200)
+
+
+class LoadSheddingTests(TestCase):
+    def test_queue_time_formats(self):
+        now = 1700000010.0
+        for header in ("t=1700000000", "1700000000000", "t=1700000000000000"):
+            self.assertEqual(queue_time(header, now), 10.0)
+        self.assertIsNone(queue_time("invalide", now))
+        self.assertEqual(queue_time(f"t={now + 1}", now), 0.0)  # Horloges décalées
+
+    def test_sheds_requests_queued_too_long(self):
+        response = self.client.get(
+            "/api/projects", HTTP_X_REQUEST_START=f"t={time.time() - 5:.3f}"
+        )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+        response = self.client.get(
+            "/api/projects", HTTP_X_REQUEST_START=f"t={time.time():.3f}"
+        )
+        self.assertEqual(response.status_code, 401)  # Traitée normalement
+
+
+class IdempotencyKeyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = build_fixtures(projects=2, contributors=1, issues=1, comments=0)
+        cls.project, cls.other_project = Project.objects.order_by("id")
+        cls.issue = cls.project.issues.get()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.url = f"/api/issues/{self.issue.pk}/comments"
+
+    def post(self, url, data, key="cle-1", client=None):
+        return (client or self.client).post(url, data, HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_stored_response(self):
+        first = self.post(self.url, {"content": "Une fois"})
+        self.assertEqual(first.status_code, 201)
+        with self.assertNumQueries(1):  # Lecture de la clé, sans validation ni écriture
+            retry = self.post(self.url, {"content": "Une fois"})
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(self.issue.comments.count(), 1)
+
+    def test_key_reused_for_another_request(self):
+        self.post(self.url, {"content": "A"})
+        self.assertEqual(self.post(self.url, {"content": "B"}).status_code, 422)
+        issues = f"/api/projects/{self.project.pk}/issues"
+        self.assertEqual(self.post(issues, {"title": "A"}, key="cle-2").status_code, 201)
+        other = f"/api/projects/{self.other_project.pk}/issues"
+        self.assertEqual(self.post(other, {"title": "A"}, key="cle-2").status_code, 422)
+        self.assertEqual(self.issue.comments.count(), 1)
+
+    def test_keys_are_per_user(self):
+        member = APIClient()
+        member.force_authenticate(User.objects.get(username="member0"))
+        self.post(self.url, {"content": "A"})
+        response = self.post(self.url, {"content": "A"}, client=member)
+        self.assertNotIn("Idempotent-Replayed", response)
+        self.assertEqual(self.issue.comments.count(), 2)
+
+    def test_failed_requests_are_not_stored(self):
+        self.assertEqual(self.post(self.url, {"content": ""}).status_code, 400)
+        self.assertEqual(self.post(self.url, {"content": "A"}).status_code, 201)
+
+    def test_expired_keys(self):
+        self.post(self.url, {"content": "A"})
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        response = self.post(self.url, {"content": "A"})
+        self.assertNotIn("Idempotent-Replayed", response)
+        self.assertEqual(self.issue.comments.count(), 2)
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(purge_expired_keys(batch_size=1), 1)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+
+class MyWorkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = build_fixtures(projects=3, contributors=1, issues=4, comments=0)
+        cls.member = User.objects.get(username="member0")
+        cls.project, cls.other_project, cls.left_project = Project.objects.order_by("id")
+        # Issue créée par le membre et assignée à lui : une seule fois dans la liste
+        cls.own_issue = Issue.objects.create(
+            title="Issue du membre",
+            project=cls.project,
+            author=cls.member,
+            assignee=cls.member,
+            status=Issue.IN_PROGRESS,
+        )
+        Contributor.objects.filter(user=cls.member, project=cls.left_project).delete()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.member)
+
+    def get_ids(self, url="/api/me/issues", **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return [issue["id"] for issue in response.json()["results"]], response.json()
+
+    def expected(self, **filters):
+        issues = Issue.objects.filter(
+            models.Q(assignee=self.member) | models.Q(author=self.member),
+            project__in=[self.project, self.other_project],
+            **filters,
+        )
+        return list(issues.order_by("-created_at", "-id").values_list("id", flat=True))
+
+    def test_assigned_and_authored_across_projects(self):
+        ids, data = self.get_ids()
+        self.assertEqual(ids, self.expected())
+        self.assertEqual(len(ids), 5)  # 2 issues assignées par projet + la sienne
+        self.assertIsNone(data["next"])
+
+    def test_role_and_status_filters(self):
+        self.assertEqual(self.get_ids(role="authored")[0], [self.own_issue.pk])
+        self.assertEqual(
+            self.get_ids(role="assigned")[0], self.expected(assignee=self.member)
+        )
+        self.assertEqual(
+            self.get_ids(status=Issue.IN_PROGRESS)[0], [self.own_issue.pk]
+        )
+        self.assertEqual(self.client.get("/api/me/issues?role=x").status_code, 400)
+        self.assertEqual(self.client.get("/api/me/issues?status=x").status_code, 400)
+
+    def test_keyset_pagination(self):
+        ids, url = [], "/api/me/issues?page_size=2"
+        while url:
+            with self.assertNumQueries(2):  # Une lecture bornée par rôle
+                page, data = self.get_ids(url)
+            self.assertLessEqual(len(page), 2)
+            ids += page
+            url = data["next"]
+        self.assertEqual(ids, self.expected())
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/api/me/issues", {"cursor": "abc"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_deleted_project_is_excluded(self):
+        Project.objects.filter(pk=self.other_project.pk).update(deleted_at=timezone.now())
+        self.assertEqual(self.get_ids()[0], self.expected(project=self.project))
+
+
+class FastListSerializerTests(TestCase):
+    """
+    Les listes rapides produisent exactement le même JSON que les sérialiseurs DRF.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = build_fixtures(projects=3, contributors=3, issues=4, comments=2)
+        # Valeurs nulles : description de projet et d'issue, assignee
+        Project.objects.filter(pk=Project.objects.first().pk).update(description=None)
+        Issue.objects.filter(pk=Issue.objects.first().pk).update(description=None)
+        cls.project = Project.objects.first()
+        cls.issue = Issue.objects.filter(project=cls.project).first()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def assertSameJSON(self, url):
+        fast = self.client.get(url)
+        with override_settings(FAST_LIST_SERIALIZERS=False):
+            standard = self.client.get(url)
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, standard.content)
+        return fast.json()
+
+    def test_project_list(self):
+        data = self.assertSameJSON("/api/projects")
+        self.assertEqual(len(data), 3)
+        self.assertEqual(len(data[0]["contributors"]), 4)
+
+    def test_issue_list(self):
+        data = self.assertSameJSON(f"/api/projects/{self.project.pk}/issues")
+        self.assertIn(None, [issue["assignee"] for issue in data])
+
+    def test_comment_list(self):
+        self.assertSameJSON(f"/api/issues/{self.issue.pk}/comments")
+
+
+class FastJSONRendererTests(TestCase):
+    """
+    Le rendu rapide est identique au `JSONRenderer` de DRF.
+    """
+
+    data = {
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "utc": datetime(2025, 3, 11, 22, 20, 5, 123456, tzinfo=dt_timezone.utc),
+        "paris": datetime(2025, 3, 11, 22, 20, tzinfo=dt_timezone(timedelta(hours=1))),
+        "texte": "Accentué ☃ \u2028 \u2029 \"guillemets\"",
+        "lazy": gettext_lazy("Traduction"),
+        "liste": [1, 2.5, None, True, {"imbriqué": []}],
+        3: "clé entière",
+    }
+
+    def test_same_bytes_as_drf(self):
+        self.assertEqual(
+            FastJSONRenderer().render(self.data), JSONRenderer().render(self.data)
+        )
+
+    def test_indented_rendering_falls_back(self):
+        media_type = "application/json; indent=4"
+        self.assertEqual(
+            FastJSONRenderer().render(self.data, media_type),
+            JSONRenderer().render(self.data, media_type),
+        )
+
+    def test_stream_matches_full_render(self):
+        items = [{"n": n, "texte": "é"} for n in range(10)]
+        chunks = [items[:3], [], items[3:9], items[9:]]
+        self.assertEqual(
+            b"".join(FastJSONRenderer().stream(chunks)), JSONRenderer().render(items)
+        )
+        self.assertEqual(b"".join(FastJSONRenderer().stream([])), b"[]")
+
+    def test_streamed_list_endpoint(self):
+        owner = build_fixtures(projects=2, contributors=2, issues=5, comments=1)
+        client = APIClient()
+        client.force_authenticate(owner)
+        url = f"/api/projects/{Project.objects.first().pk}/issues"
+        with override_settings(STREAM_CHUNK_SIZE=3):
+            streamed = client.get(url, {"stream": "1"})
+        self.assertTrue(streamed.streaming)
+        self.assertEqual(b"".join(streamed.streaming_content), client.get(url).content)
+
+
+class CompressionTests(TestCase):
+    """
+    Négociation, seuil de taille et cache des corps compressés.
+    """
+
+    body = b'[{"title":"Issue","status":"To Do"}' + b',{"n":1}' * 500 + b"]"
+
+    def middleware(self, content, **headers):
+        def get_response(request):
+            return HttpResponse(content, content_type="application/json", **headers)
+
+        return CompressionMiddleware(get_response)
+
+    def test_negotiation(self):
+        codecs = [GzipCodec(6)]
+        self.assertEqual(negotiate("gzip, deflate", codecs).name, "gzip")
+        self.assertEqual(negotiate("*;q=0.5", codecs).name, "gzip")
+        self.assertIsNone(negotiate("gzip;q=0, br", codecs))
+        self.assertIsNone(negotiate("", codecs))
+        # Espaces optionnels autour de `;` et `=` (RFC 9110)
+        self.assertIsNone(negotiate("gzip ; q = 0", codecs))
+        self.assertEqual(
+            parse_accept_encoding("gzip;q = 0.5, br ;Q=0.8, zstd; level=1"),
+            {"gzip": 0.5, "br": 0.8, "zstd": 1.0},
+        )
+
+    def test_large_response_is_compressed(self):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+        response = self.middleware(self.body)(request)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+        self.assertEqual(gzip.decompress(response.content), self.body)
+
+    def test_small_or_unaccepted_response_untouched(self):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(self.middleware(b"[]")(request).has_header("Content-Encoding"))
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="identity")
+        response = self.middleware(self.body)(request)
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response.content, self.body)
+
+    def test_compressed_body_is_reused(self):
+        middleware = self.middleware(self.body)
+        for _ in range(3):
+            middleware(RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip"))
+        self.assertEqual((middleware.cache.misses, middleware.cache.hits), (1, 2))
+
+    def test_local_cache_bounded_in_bytes(self):
+        bodies = [self.body + b" " * i for i in range(20)]
+        compressed = len(GzipCodec(6).compress(self.body))
+        with override_settings(COMPRESSION_CACHE_BYTES=compressed * 5):
+            middleware = CompressionMiddleware(None)
+        for body in bodies:
+            middleware.compress(middleware.codecs[-1], body)
+        self.assertLessEqual(middleware.cache.nbytes, compressed * 5)
+        self.assertLess(len(middleware.cache), len(bodies))
+
+    def test_streamed_list_is_compressed(self):
+        owner = build_fixtures(projects=1, contributors=2, issues=30, comments=0)
+        client = APIClient()
+        client.force_authenticate(owner)
+        url = f"/api/projects/{Project.objects.first().pk}/issues"
+        with override_settings(STREAM_CHUNK_SIZE=7):
+            response = client.get(url, {"stream": "1"}, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        body = gzip.decompress(b"".join(response.streaming_content))
+        self.assertEqual(body, client.get(url).content)
@@ -0,0 +1,180 @@
+"""
+Limitation de débit par seaux à jetons, et délestage.
+
+Chaque client (utilisateur d'un JWT valide, ou adresse IP à défaut) dispose
+d'un seau de `capacité` jetons qui se remplit de `débit` jetons par seconde
+(`THROTTLE_BUCKETS`, par portée `user` ou `anon`). Une requête consomme le
+coût de sa route (`THROTTLE_COSTS`, par nom de route, 1 par défaut) : une
+liste de projets ou une inscription (hachage du mot de passe) coûte plus
+qu'une lecture simple, et un lot (`/api/batch`) la somme des coûts de ses
+sous-requêtes. Seau vide : 429 avec `Retry-After`.
+
+La décision est prise par `ThrottleMiddleware`, avant la vue : une requête
+refusée ne paie ni l'authentification DRF (lecture de l'utilisateur en
+base) ni le reste de la vue. Le jeton n'est que vérifié (signature, en
+cache, voir softdeskApp/authentication.py). Chaque décision est en O(1),
+sans accès à la base :
+- `LocalBucketStore` : seaux en mémoire du processus (LRU borné, sûr entre
+  threads) ;
+- `CacheBucketStore` : seaux dans un cache Django partagé entre workers
+  (`THROTTLE_CACHE_ALIAS`), une lecture et une écriture par décision, sans
+  verrou entre processus (limite approximative sous forte concurrence).
+
+`queue_time()` sert au délestage (voir `LoadSheddingMiddleware`) : temps
+passé par la requête dans la file d'attente du proxy (`X-Request-Start`).
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import caches
+from django.urls import Resolver404, resolve
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from .authentication import CachedJWTAuthentication
+
+DEFAULT_BUCKETS = {"user": (20, 200), "anon": (5, 100)}
+
+
+class LocalBucketStore:
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()  # clé -> (jetons, horodatage)
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, capacity, cost, now):
+        """
+        Consomme `cost` jetons si possible. Retourne (autorisé, secondes
+        avant d'avoir assez de jetons).
+        """
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens, wait = refill(tokens, updated, rate, capacity, cost, now)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)  # Seau inactif le plus ancien
+        return wait == 0, wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore:
+    def __init__(self, cache):
+        self.cache = cache
+
+    def take(self, key, rate, capacity, cost, now):
+        tokens, updated = self.cache.get(key) or (capacity, now)
+        tokens, wait = refill(tokens, updated, rate, capacity, cost, now)
+        # Au-delà, le seau serait de nouveau plein : inutile de le garder
+        self.cache.set(key, (tokens, now), timeout=int(capacity / rate) + 1)
+        return wait == 0, wait
+
+    def clear(self):
+        pass  # Entrées expirées par le cache
+
+
+def refill(tokens, updated, rate, capacity, cost, now):
+    """
+    Remplit le seau depuis `updated` puis retire `cost` jetons s'il en
+    contient assez. Retourne (jetons restants, attente en secondes).
+    """
+    tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+    if tokens >= cost:
+        return tokens - cost, 0
+    return tokens, (cost - tokens) / rate
+
+
+local_store = LocalBucketStore()
+
+
+def get_store():
+    alias = getattr(settings, "THROTTLE_CACHE_ALIAS", None)
+    if alias is None:
+        return local_store
+    return CacheBucketStore(caches[alias])
+
+
+def route_cost(match):
+    costs = getattr(settings, "THROTTLE_COSTS", {})
+    return costs.get(match.url_name, 1) if match is not None else 1
+
+
+def batch_cost(body):
+    """
+    Somme des coûts des sous-requêtes d'un lot (1 si le corps est illisible :
+    le lot sera refusé par la vue).
+    """
+    try:
+        entries = json.loads(body).get("requests")
+        limit = getattr(settings, "BATCH_MAX_REQUESTS", 20)
+        paths = [entry["path"] for entry in entries[:limit]]
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return 1
+    total = 0
+    for path in paths:
+        try:
+            total += route_cost(resolve(urlsplit(str(path)).path))
+        except Resolver404:
+            total += 1
+    return max(total, 1)
+
+
+def request_cost(request, match):
+    if match is not None and match.url_name == "batch":
+        return batch_cost(request.body)
+    return route_cost(match)
+
+
+def client_bucket(request):
+    """
+    (portée, identifiant) du seau : l'utilisateur d'un JWT valide, sinon
+    l'adresse IP (jeton absent, invalide ou expiré).
+    """
+    authentication = CachedJWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is not None:
+        try:
+            token = authentication.get_validated_token(raw_token)
+        except (InvalidToken, TokenError):
+            pass
+        else:
+            claim = api_settings.USER_ID_CLAIM
+            if claim in token.payload:
+                return "user", token.payload[claim]
+    return "anon", request.META.get("REMOTE_ADDR", "")
+
+
+def take(request, match):
+    """
+    Consomme le coût de la requête. Retourne (autorisée, secondes d'attente).
+    """
+    scope, ident = client_bucket(request)
+    rate, capacity = getattr(settings, "THROTTLE_BUCKETS", DEFAULT_BUCKETS)[scope]
+    cost = min(request_cost(request, match), capacity)  # Jamais refusée pour toujours
+    return get_store().take(f"throttle:{scope}:{ident}", rate, capacity, cost, time.time())
+
+
+def queue_time(header, now):
+    """
+    Secondes passées en file d'attente d'après `X-Request-Start`
+    (`t=<horodatage>` ou horodatage seul, en secondes, millisecondes ou
+    microsecondes), ou None si le header est absent ou illisible.
+    """
+    if not header:
+        return None
+    try:
+        start = float(header.strip().removeprefix("t="))
+    except ValueError:
+        return None
+    if start > 1e14:
+        start /= 1e6
+    elif start > 1e11:
+        start /= 1e3
+    return max(0.0, now - start)
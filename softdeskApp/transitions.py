@@ -0,0 +1,120 @@
+"""
+Transitions d'une issue en une seule requête d'écriture.
+
+Changer le statut ou l'assigné d'une issue par un PATCH charge l'issue,
+passe par `IssueSerializer` puis réécrit la ligne. Les actions
+`POST .../issues/<id>/status` et `POST .../issues/<id>/assign` :
+- valident la valeur (statut parmi `Issue.STATUS_CHOICES`, assigné
+  contributeur du projet vérifié par un seul EXISTS) ;
+- écrivent par un seul UPDATE, limité aux colonnes modifiées, dont la clause
+  WHERE porte aussi les droits (auteur de l'issue, projet non supprimé) et
+  la version de `If-Match` (voir softdeskApp/concurrency.py) ;
+- ne relisent l'issue qu'en cas d'échec, pour choisir la bonne erreur.
+"""
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+
+from .concurrency import ANY_VERSION, PreconditionFailed, if_match_versions
+from .identity import identity_map, is_member
+from .models import Issue, User
+from .permissions import is_contributor
+
+
+def parse_issue_id(pk):
+    """
+    Identifiant d'issue lu dans l'URL (`NotFound` s'il n'est pas un entier).
+    """
+    try:
+        return Issue._meta.pk.to_python(pk)
+    except DjangoValidationError:
+        raise NotFound()
+
+
+def check_object(data):
+    if not isinstance(data, dict):
+        raise ValidationError({"non_field_errors": "Un objet JSON est attendu."})
+
+
+def parse_status(data):
+    check_object(data)
+    value = data.get("status")
+    if value not in dict(Issue.STATUS_CHOICES):
+        choices = ", ".join(choice for choice, _ in Issue.STATUS_CHOICES)
+        raise ValidationError({"status": f"Le statut doit être l'un des suivants : {choices}."})
+    return value
+
+
+def parse_assignee(request, data, project_id):
+    """
+    Identifiant de l'assigné (None pour désassigner), contributeur du projet.
+    """
+    check_object(data)
+    if "assignee" not in data:
+        raise ValidationError({"assignee": "Ce champ est obligatoire."})
+    if data["assignee"] is None:
+        return None
+    try:
+        value = User._meta.pk.to_python(data["assignee"])
+    except DjangoValidationError:
+        raise ValidationError({"assignee": "Identifiant d'utilisateur invalide."})
+    if not is_member(request, project_id, value):
+        raise ValidationError({"assignee": "L'assignee doit être un contributeur du projet."})
+    return value
+
+
+def apply(request, project_id, issue_id, values):
+    """
+    Écrit `values` sur l'issue en un seul UPDATE et retourne la réponse
+    (`id`, champs modifiés, nouvelle version).
+    """
+    versions = if_match_versions(request)
+    queryset = Issue.objects.filter(
+        pk=issue_id,
+        project_id=project_id,
+        project__deleted_at__isnull=True,
+        author=request.user,
+    )
+    if versions not in (None, ANY_VERSION):
+        queryset = queryset.filter(version__in=versions)
+    updated = queryset.update(
+        **values, version=F("version") + 1, updated_at=timezone.now()
+    )
+    if not updated:
+        raise failure(request, project_id, issue_id, versions)
+    identity_map(request).discard(Issue, issue_id)
+
+    if versions not in (None, ANY_VERSION) and len(versions) == 1:
+        version = next(iter(versions)) + 1
+    else:  # Version écrite inconnue : relecture par clé primaire
+        version = Issue.objects.filter(pk=issue_id).values_list("version", flat=True).first()
+    return {"id": int(issue_id), **values_representation(values), "version": version}
+
+
+def values_representation(values):
+    return {
+        ("assignee" if name == "assignee_id" else name): value
+        for name, value in values.items()
+    }
+
+
+def failure(request, project_id, issue_id, versions):
+    """
+    Erreur à renvoyer quand l'UPDATE n'a modifié aucune ligne (chemin lent).
+    """
+    row = (
+        Issue.objects.filter(
+            pk=issue_id, project_id=project_id, project__deleted_at__isnull=True
+        )
+        .values_list("author_id", "version")
+        .first()
+    )
+    if row is None or not is_contributor(request, int(project_id)):
+        return NotFound()
+    author_id, version = row
+    if author_id != request.user.pk:
+        return PermissionDenied("Seul l'auteur de l'issue peut la modifier.")
+    if versions not in (None, ANY_VERSION) and version not in versions:
+        return PreconditionFailed()
+    return NotFound()  # Supprimée entre-temps
@@ -2,6 +2,10 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt import views as jwt_views
 
+from .batch import batch_view
+from .metrics import metrics_view
+from .my_work import my_issues_view
+
 # Importation des ViewSets pour les modèles
 from .views import (
     UserViewSet,
@@ -36,4 +40,10 @@ urlpatterns = [
     path(
         "token/refresh/", jwt_views.TokenRefreshView.as_view(), name="token_refresh"
     ),  # Rafraîchissement du token JWT
+    # Métriques par vue au format Prometheus
+    path("metrics", metrics_view, name="metrics"),
+    # Plusieurs appels à l'API en une seule requête (clients mobiles)
+    path("batch", batch_view, name="batch"),
+    # Issues assignées à l'utilisateur ou créées par lui, tous projets confondus
+    path("me/issues", my_issues_view, name="my-issues"),
 ] + router.urls  # Inclure les routes du routeur pour les projets et utilisateurs
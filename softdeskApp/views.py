@@ -1,12 +1,27 @@
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Prefetch, Q
+from django.http import Http404
 from rest_framework import viewsets, serializers
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.exceptions import PermissionDenied, NotFound, ValidationError
 
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
+from softdeskApp.authentication import forget_user
+from softdeskApp.concurrency import OptimisticConcurrencyMixin
+from softdeskApp.expansions import IncludeMixin
+from softdeskApp.fast_serializers import (
+    FastListMixin,
+    FastProjectSerializer,
+    FastIssueSerializer,
+    FastCommentSerializer,
+)
+from softdeskApp.idempotency import IdempotencyMixin
+from softdeskApp.identity import identity_map, is_member, load_issue, load_project
 from softdeskApp.models import Project, User, Contributor, Issue, Comment
-from softdeskApp.permissions import IsAuthorOrContributorOrReadOnly
+from softdeskApp.pagination import invalidate_count
+from softdeskApp.permissions import IsAuthorOrContributorOrReadOnly, is_contributor
+from softdeskApp import archive, purge, sync, transitions
 from softdeskApp.serializers import (
     ProjectSerializer,
     UserSerializer,
@@ -29,7 +44,7 @@ class UserViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-            return User.objects.all()
+        return User.objects.filter(deleted_at__isnull=True)
 
     def perform_update(self, serializer):
         """
@@ -43,10 +58,14 @@ class UserViewSet(viewsets.ModelViewSet):
     def perform_destroy(self, instance):
         """
         Seul l'utilisateur concerné ou un admin peut supprimer un compte.
+        - Le compte est désactivé immédiatement, ses données sont purgées en
+          arrière-plan (voir softdeskApp/purge.py).
         """
         if instance != self.request.user and not self.request.user.is_staff:
             raise PermissionDenied("Vous ne pouvez supprimer que votre propre compte.")
-        instance.delete()
+        purge.soft_delete_user(instance)
+        forget_user(instance.pk)
+        identity_map(self.request).clear()
 
 
 @api_view(["POST"])
@@ -56,7 +75,6 @@ class UserViewSet(viewsets.ModelViewSet):
 def register(request):
     if request.method == "POST":
         # Utilisation du serializer pour valider les données reçues dans la requête
-        print(request.data)
         serializer = UserSerializer(data=request.data)
 
         # Vérification de la validité des données
@@ -69,16 +87,21 @@ def register(request):
         return Response(serializer.errors)
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(
+    OptimisticConcurrencyMixin, IncludeMixin, FastListMixin, viewsets.ModelViewSet
+):
     """
     ViewSet pour gérer les projets.
     - L'auteur peut modifier ou supprimer le projet.
     - Les contributeurs peuvent lire les ressources du projet.
     - Les autres utilisateurs ne peuvent pas accéder aux ressources.
+    - `?include=issues` (ou `issues.comments`) ajoute les issues du projet.
+    - Modifications conditionnelles avec `If-Match` (voir softdeskApp/concurrency.py).
     """
 
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
+    fast_serializer_class = FastProjectSerializer
     permission_classes = [IsAuthenticated, IsAuthorOrContributorOrReadOnly]
 
     def get_queryset(self):
@@ -86,7 +109,15 @@ class ProjectViewSet(viewsets.ModelViewSet):
         Filtre les projets pour ne renvoyer que ceux où l'utilisateur est l'auteur ou un contributeur.
         """
         user = self.request.user
-        return Project.objects.filter(Q(author=user) | Q(contributors=user)).distinct()
+        return (
+            Project.objects.alive()
+            .filter(Q(author=user) | Q(contributors=user))
+            .distinct()
+            .select_related("author")
+            .prefetch_related(
+                Prefetch("contributor_set", queryset=Contributor.objects.order_by("id"))
+            )
+        )
 
     def perform_create(self, serializer):
         """
@@ -95,6 +126,14 @@ class ProjectViewSet(viewsets.ModelViewSet):
         user = self.request.user
         serializer.save(author=user)
 
+    def perform_destroy(self, instance):
+        """
+        Masque le projet immédiatement ; ses issues et commentaires sont
+        purgés en arrière-plan (voir softdeskApp/purge.py).
+        """
+        purge.soft_delete_project(instance)
+        identity_map(self.request).clear()
+
     @action(detail=True, methods=["get"])
     def contributors(self, request, pk=None):
         """
@@ -105,6 +144,22 @@ class ProjectViewSet(viewsets.ModelViewSet):
         serializer = ContributorSerializer(contributors, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=["get"])
+    def sync(self, request, pk=None):
+        """
+        Changements du projet depuis le jeton `?token=` (voir softdeskApp/sync.py).
+        """
+        token = request.query_params.get("token")
+        try:
+            project = self.get_object()
+        except Http404:
+            changes = sync.deleted_project_changes(int(pk), token) if pk.isdigit() else None
+            if changes is None:
+                raise
+            return Response(changes)
+        data = self.get_serializer(project).data
+        return Response(sync.project_changes(project, data, token))
+
 
 class ContributorViewSet(viewsets.ModelViewSet):
     """
@@ -121,7 +176,9 @@ class ContributorViewSet(viewsets.ModelViewSet):
         Un utilisateur peut voir uniquement les contributeurs des projets où il est impliqué.
         """
         user = self.request.user
-        return Contributor.objects.filter(project__contributors__user=user)
+        return Contributor.objects.filter(
+            project__contributors=user, project__deleted_at__isnull=True
+        )
 
     def perform_create(self, serializer):
         """
@@ -133,18 +190,37 @@ class ContributorViewSet(viewsets.ModelViewSet):
                 "Seul l'auteur du projet peut ajouter un contributeur."
             )
         serializer.save()
+        identity_map(self.request).forget_memberships(project.pk)
 
-
-class IssueViewSet(viewsets.ModelViewSet):
+    def perform_destroy(self, instance):
+        """
+        Supprime l'objet en laissant une trace pour la synchronisation.
+        """
+        with transaction.atomic():
+            sync.record_deletion(instance)
+            instance.delete()
+        identity_map(self.request).forget_memberships(instance.project_id)
+
+
+class IssueViewSet(
+    IdempotencyMixin,
+    OptimisticConcurrencyMixin,
+    IncludeMixin,
+    FastListMixin,
+    viewsets.ModelViewSet,
+):
     """
     ViewSet pour gérer les issues.
     - L'auteur peut modifier ou supprimer l'issue.
     - Les contributeurs peuvent lire les issues.
     - Les autres utilisateurs ne peuvent pas accéder aux issues.
+    - `?include=comments,project` ajoute les commentaires et le projet.
+    - Modifications conditionnelles avec `If-Match` (voir softdeskApp/concurrency.py).
     """
 
     queryset = Issue.objects.all()
     serializer_class = IssueSerializer
+    fast_serializer_class = FastIssueSerializer
     permission_classes = [IsAuthenticated, IsAuthorOrContributorOrReadOnly]
 
     def get_queryset(self):
@@ -152,36 +228,124 @@ class IssueViewSet(viewsets.ModelViewSet):
         Filtre les issues pour ne renvoyer que celles des projets où l'utilisateur est l'auteur ou un contributeur.
         """
         user = self.request.user
-        return Issue.objects.filter(
-            Q(project__author=user) | Q(project__contributors__user=user)
-        ).distinct()
+        return (
+            Issue.objects.filter(Q(project__author=user) | Q(project__contributors=user))
+            .filter(project_id=self.kwargs["project_id"], project__deleted_at__isnull=True)
+            .distinct()
+            .select_related("assignee", "project", "author")
+            .order_by("id")
+        )
+
+    def get_count_source(self):
+        """
+        Total paginé : les issues du projet, sans jointure sur les
+        contributeurs ni `.distinct()` (voir softdeskApp/pagination.py).
+        """
+        project_id = int(self.kwargs["project_id"])
+        if not is_contributor(self.request, project_id):
+            return None
+        return ("issues", project_id), Issue.objects.filter(
+            project_id=project_id, project__deleted_at__isnull=True
+        )
+
+    def list(self, request, *args, **kwargs):
+        """
+        `?archived=1` ajoute les issues archivées du projet (chemin lent),
+        sans pagination ni diffusion.
+        """
+        with_archived = request.query_params.get("archived") in ("1", "true")
+        if with_archived and self.paginator.get_page_size(request):
+            raise ValidationError(
+                {"archived": "Les issues archivées ne sont pas disponibles en pagination."}
+            )
+        if with_archived and self.should_stream(request):
+            raise ValidationError(
+                {"archived": "Les issues archivées ne sont pas disponibles en diffusion."}
+            )
+        response = super().list(request, *args, **kwargs)
+        if with_archived and isinstance(getattr(response, "data", None), list):
+            response.data.extend(
+                archive.project_issues(
+                    request, self.kwargs["project_id"], self.get_preview_length()
+                )
+            )
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Une issue absente des tables chaudes est cherchée dans les archives.
+        """
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            pk = str(kwargs["pk"])
+            archived = (
+                archive.find_archived_issue(request, int(pk), self.kwargs["project_id"])
+                if pk.isdigit()
+                else None
+            )
+            if archived is None:
+                raise
+            return Response(
+                archive.issue_representation(archived, self.get_include_tree())
+            )
 
     def perform_create(self, serializer):
         """
         Crée une issue et définit automatiquement l'auteur et le projet.
         - Vérifie que l'assignee est un contributeur du projet.
         """
-        project_id = self.kwargs.get("project_id")
-        try:
-            project = Project.objects.get(id=project_id)
-        except Project.DoesNotExist:
+        project = load_project(self.request, self.kwargs.get("project_id"))
+        if project is None:
             raise NotFound("Le projet spécifié n'existe pas.")
 
         user = self.request.user
 
+        # Appartenance lue avec le projet (voir softdeskApp/identity.py)
+        if not is_contributor(self.request, project.pk):
+            raise ValidationError("Vous n'êtes pas un contributeur de ce projet.")
+
         # Vérifier que l'assignee est un contributeur du projet
         assignee = serializer.validated_data.get("assignee")
-        if (
-            assignee
-            and not Contributor.objects.filter(user=assignee, project=project).exists()
-        ):
+        if assignee and not is_member(self.request, project.pk, assignee.pk):
             raise ValidationError("L'assignee doit être un contributeur du projet.")
 
         # Définir l'auteur et le projet
         serializer.save(author=user, project=project)
+        invalidate_count(("issues", project.pk))
+
+    def perform_destroy(self, instance):
+        """
+        Supprime l'objet en laissant une trace pour la synchronisation.
+        """
+        identity_map(self.request).discard(Issue, instance.pk)
+        with transaction.atomic():
+            sync.record_deletion(instance)
+            instance.delete()
+        invalidate_count(("issues", instance.project_id))
+
+    @action(detail=True, methods=["post"], url_path="status")
+    def change_status(self, request, project_id=None, pk=None):
+        """
+        Change le statut de l'issue en un seul UPDATE (voir softdeskApp/transitions.py).
+        """
+        issue_id = transitions.parse_issue_id(pk)
+        value = transitions.parse_status(request.data)
+        return Response(transitions.apply(request, project_id, issue_id, {"status": value}))
+
+    @action(detail=True, methods=["post"])
+    def assign(self, request, project_id=None, pk=None):
+        """
+        Change l'assigné de l'issue (`null` pour désassigner) en un seul UPDATE.
+        """
+        issue_id = transitions.parse_issue_id(pk)
+        value = transitions.parse_assignee(request, request.data, project_id)
+        return Response(
+            transitions.apply(request, project_id, issue_id, {"assignee_id": value})
+        )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(IdempotencyMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet pour gérer les commentaires.
     - L'auteur peut modifier ou supprimer le commentaire.
@@ -191,6 +355,7 @@ class CommentViewSet(viewsets.ModelViewSet):
 
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
+    fast_serializer_class = FastCommentSerializer
     permission_classes = [IsAuthenticated, IsAuthorOrContributorOrReadOnly]
 
     def get_queryset(self):
@@ -198,29 +363,107 @@ class CommentViewSet(viewsets.ModelViewSet):
         Filtre les commentaires pour ne renvoyer que ceux des issues des projets où l'utilisateur est l'auteur ou un contributeur.
         """
         user = self.request.user
-        return Comment.objects.filter(
-            Q(issue__project__author=user) | Q(issue__project__contributors__user=user)
-        ).distinct()
+        return (
+            Comment.objects.filter(
+                Q(issue__project__author=user) | Q(issue__project__contributors=user)
+            )
+            .filter(issue_id=self.kwargs["issue_id"], issue__project__deleted_at__isnull=True)
+            .distinct()
+            .select_related("author", "issue")
+            .order_by("id")
+        )
+
+    def get_count_source(self):
+        """
+        Total paginé : les commentaires de l'issue, sans `.distinct()`.
+        """
+        issue_id = int(self.kwargs["issue_id"])
+        issue = load_issue(self.request, issue_id)
+        if issue is None or not is_contributor(self.request, issue.project_id):
+            return None
+        return ("comments", issue_id), Comment.objects.filter(
+            issue_id=issue_id, issue__project__deleted_at__isnull=True
+        )
+
+    def list(self, request, *args, **kwargs):
+        """
+        Les commentaires d'une issue archivée sont lus dans l'archive (jamais
+        diffusés : une archive est décompressée en entier).
+        """
+        if self.should_stream(request) and not self.paginator.get_page_size(request):
+            # Liste diffusée : vide ou non, on ne le sait qu'à l'envoi
+            if load_issue(request, self.kwargs["issue_id"]) is not None:
+                return super().list(request, *args, **kwargs)
+            response = None
+        else:
+            try:
+                response = super().list(request, *args, **kwargs)
+            except NotFound as error:  # Page au-delà de la dernière
+                response = error
+            else:
+                data = getattr(response, "data", None)
+                if isinstance(data, dict):  # Réponse paginée
+                    data = data["results"]
+                if data != []:
+                    return response
+            # Liste vide : l'archive n'est lue que pour une issue absente des tables chaudes
+            if load_issue(request, self.kwargs["issue_id"]) is not None:
+                return response
+        archived = archive.find_archived_issue(request, self.kwargs["issue_id"])
+        if archived is None:
+            if response is None:
+                return super().list(request, *args, **kwargs)
+            if isinstance(response, NotFound):
+                raise response
+            return response
+        comments = [
+            archive.with_preview(
+                comment, CommentSerializer.preview_fields, self.get_preview_length()
+            )
+            for comment in archived.load()["comments"]
+        ]
+        page = self.paginator.paginate_list(comments, request)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(comments)
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            archived = archive.find_archived_issue(request, self.kwargs["issue_id"])
+            comments = archived.load()["comments"] if archived is not None else []
+            for comment in comments:
+                if str(comment["id"]) == kwargs["pk"]:
+                    return Response(comment)
+            raise
 
     def perform_create(self, serializer):
         """
         Crée un commentaire et définit automatiquement l'auteur et l'issue.
         - Vérifie que l'utilisateur est un contributeur du projet associé à l'issue.
         """
-        issue_id = self.kwargs.get("issue_id")
-        try:
-            issue = Issue.objects.get(id=issue_id)
-        except Issue.DoesNotExist:
+        issue = load_issue(self.request, self.kwargs.get("issue_id"))
+        if issue is None:
             raise NotFound("L'issue spécifiée n'existe pas.")
 
         user = self.request.user
 
         # Vérifier que l'utilisateur est un contributeur du projet associé à l'issue
-        project = issue.project
-        if not Contributor.objects.filter(user=user, project=project).exists():
+        if not is_contributor(self.request, issue.project_id):
             raise ValidationError(
                 "Vous n'êtes pas un contributeur du projet associé à cette issue."
             )
 
         # Définir l'auteur et l'issue
         serializer.save(author=user, issue=issue)
+        invalidate_count(("comments", issue.pk))
+
+    def perform_destroy(self, instance):
+        """
+        Supprime l'objet en laissant une trace pour la synchronisation.
+        """
+        with transaction.atomic():
+            sync.record_deletion(instance)
+            instance.delete()
+        invalidate_count(("comments", instance.issue_id))